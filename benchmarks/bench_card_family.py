@@ -0,0 +1,61 @@
+"""
+Compare card containment and subset reduction with and without the card family index.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_card_family [number of cards]
+"""
+import random
+import sys
+import time
+
+from estimage import data, utilities
+
+
+def make_forest(size, seed=0, roots_ratio=0.05, max_depth=6):
+    rng = random.Random(seed)
+    cards = []
+    depth_of = dict()
+    for i in range(size):
+        card = data.BaseCard(f"card-{i}")
+        candidates = cards[-200:]
+        if cards and rng.random() > roots_ratio:
+            parent = rng.choice(candidates)
+            if depth_of[parent.name] < max_depth:
+                parent.children.append(card)
+                card.parent = parent
+        depth_of[card.name] = depth_of[card.parent.name] + 1 if card.parent else 0
+        cards.append(card)
+    return cards
+
+
+def measure(label, function, * args):
+    start = time.perf_counter()
+    result = function(* args)
+    print(f"{label:<40} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def containment_queries(cards, pairs):
+    return sum(cards[a] in cards[b] for a, b in pairs)
+
+
+def main(size):
+    cards = make_forest(size)
+    rng = random.Random(1)
+    pairs = [(rng.randrange(size), rng.randrange(size)) for _ in range(100_000)]
+    print(f"Forest of {size} cards")
+
+    naive_hits = measure("containment, subtree walk", containment_queries, cards, pairs)
+    naive_reduced = measure("reduction, pairwise", utilities.reduce_subsets_from_sets, cards)
+
+    measure("index construction", data.CardFamilyIndex, cards)
+    indexed_hits = measure("containment, index", containment_queries, cards, pairs)
+    indexed_reduced = measure("reduction, index", data.reduce_subsets_of_cards, cards)
+
+    assert naive_hits == indexed_hits
+    assert naive_reduced == indexed_reduced
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,90 @@
+"""
+Compare memory taken by regular and slotted entities, with and without interned strings.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_entity_memory [number of cards] [number of events]
+"""
+import datetime
+import gc
+import sys
+import tracemalloc
+
+from estimage import data
+
+
+STATUSES = ("todo", "in_progress", "review", "done")
+PEOPLE = [f"person-{i}" for i in range(40)]
+TAGS = [f"tag-{i}" for i in range(100)]
+
+
+def _copy(string, intern):
+    # Loaders produce a fresh string object for every occurrence unless they intern it
+    ret = "".join(list(string))
+    if intern:
+        ret = sys.intern(ret)
+    return ret
+
+
+def make_cards(card_class, size, intern):
+    cards = []
+    for i in range(size):
+        card = card_class(_copy(f"card-{i}", intern))
+        card.title = f"Card number {i}"
+        card.status = _copy(STATUSES[i % len(STATUSES)], intern)
+        card.assignee = _copy(PEOPLE[i % len(PEOPLE)], intern)
+        card.collaborators = [_copy(PEOPLE[(i + 1) % len(PEOPLE)], intern)]
+        card.tags = {_copy(TAGS[i % len(TAGS)], intern), _copy(TAGS[i * 7 % len(TAGS)], intern)}
+        card.point_cost = i % 8
+        cards.append(card)
+    return cards
+
+
+def make_events(event_class, cards, size, intern):
+    start = datetime.datetime(2024, 1, 1)
+    events = []
+    for i in range(size):
+        event = event_class(_copy(cards[i % len(cards)].name, intern), _copy("state", intern), start)
+        event.value_before = _copy(STATUSES[i % len(STATUSES)], intern)
+        event.value_after = _copy(STATUSES[(i + 1) % len(STATUSES)], intern)
+        events.append(event)
+    return events
+
+
+def make_tasks(task_class, estimate_class, cards):
+    tasks = []
+    for card in cards:
+        task = task_class(card.name)
+        task.point_estimate = estimate_class.from_triple(card.point_cost + 1, card.point_cost, card.point_cost + 3)
+        tasks.append(task)
+    return tasks
+
+
+def measure(label, function, * args):
+    gc.collect()
+    tracemalloc.start()
+    result = function(* args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {current / 2 ** 20:8.1f} MiB")
+    return result
+
+
+def main(num_cards, num_events):
+    print(f"{num_cards} cards, {num_events} events")
+    variants = (
+        ("regular", data.BaseCard, data.Event, data.TaskModel, data.Estimate, False),
+        ("slotted", data.SlottedBaseCard, data.SlottedEvent, data.SlottedTaskModel, data.SlottedEstimate, False),
+        ("slotted, interned", data.SlottedBaseCard, data.SlottedEvent, data.SlottedTaskModel, data.SlottedEstimate, True),
+    )
+    for label, card_class, event_class, task_class, estimate_class, intern in variants:
+        cards = measure(f"cards, {label}", make_cards, card_class, num_cards, intern)
+        events = measure(f"events, {label}", make_events, event_class, cards, num_events, intern)
+        tasks = measure(f"tasks and estimates, {label}", make_tasks, task_class, estimate_class, cards)
+        del cards, events, tasks
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
@@ -0,0 +1,58 @@
+"""
+Compare decoding of stored events into Event objects and into columns of events.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_event_decoding [number of cards] [number of events]
+"""
+import datetime
+import gc
+import sys
+import time
+import tracemalloc
+
+from estimage.persistence.event import abstract
+
+
+START = datetime.datetime(2020, 1, 1)
+STATUSES = ("todo", "in_progress", "done")
+
+
+def make_raw_data(num_cards, num_events):
+    ret = dict()
+    for i in range(num_events):
+        card_index = i % num_cards
+        when = START + datetime.timedelta(days=i // num_cards, hours=i % 24)
+        if i % 2:
+            record = dict(
+                quantity="state", value_before=STATUSES[i % 3], value_after=STATUSES[(i + 1) % 3])
+        else:
+            record = dict(quantity="points", value_before=str(i % 8), value_after=str(i % 8 + 1))
+        record.update(time=when.isoformat(), task_name=f"card-{card_index}")
+        ret[f"{i // num_cards:04d}-card-{card_index}"] = record
+    return ret
+
+
+def measure(label, function, raw_data):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = function(raw_data)
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {elapsed:8.2f} s {current / 2 ** 20:8.1f} MiB")
+    return result
+
+
+def main(num_cards, num_events):
+    print(f"{num_cards} cards, {num_events} events")
+    raw_data = make_raw_data(num_cards, num_events)
+    measure("events", abstract.EventLoader._eventize_raw_event_data, raw_data)
+    measure("columns", abstract.EventLoader._columnize_raw_event_data, raw_data)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
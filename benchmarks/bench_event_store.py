@@ -0,0 +1,68 @@
+"""
+Measure loading of events from the binary columnar backend, and from TOML for comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_event_store [number of cards] [number of events] [number of events in TOML]
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+from estimage import data, persistence
+import estimage.persistence.event
+
+
+START = datetime.datetime(2020, 1, 1)
+STATUSES = ("todo", "in_progress", "done")
+
+
+def make_events_by_subject(num_cards, num_events):
+    ret = dict()
+    for i in range(num_events):
+        name = f"card-{i % num_cards}"
+        when = START + datetime.timedelta(days=i // num_cards, hours=i % 24)
+        if i % 2:
+            evt = data.Event(name, "state", when)
+            evt.value_before = STATUSES[i % 3]
+            evt.value_after = STATUSES[(i + 1) % 3]
+        else:
+            evt = data.Event(name, "points", when)
+            evt.value_before = float(i % 8)
+            evt.value_after = float(i % 8 + 1)
+        ret.setdefault(name, []).append(evt)
+    return ret
+
+
+def measure_load(backend, events_by_subject, directory):
+    filename = os.path.join(directory, persistence.stem_to_filename(data.Event, backend, "events"))
+    io = persistence.get_persistence(data.Event, backend, filename)
+    with io.get_saver() as saver:
+        saver.save_events_by_subject(events_by_subject)
+
+    started = time.perf_counter()
+    manager = data.EventManager()
+    manager.load(io)
+    loaded = time.perf_counter()
+    card_ids = data.SymbolTable(sorted(manager.get_referenced_task_names()))
+    manager.index_by(card_ids)
+    manager.get_chronological_event_columns_by_type_of(range(len(card_ids)))
+    columns = time.perf_counter()
+    num_events = sum(len(events) for events in events_by_subject.values())
+    print(f"{backend:<10} {num_events:>9} events {os.path.getsize(filename) / 2 ** 20:8.1f} MiB "
+          f"{loaded - started:8.2f} s to load {columns - loaded:8.2f} s to get columns")
+
+
+def main(num_cards, num_events, num_toml_events):
+    with tempfile.TemporaryDirectory() as directory:
+        measure_load("columnar", make_events_by_subject(num_cards, num_events), directory)
+        measure_load("toml", make_events_by_subject(num_cards, num_toml_events), directory)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 100_000)
@@ -0,0 +1,65 @@
+"""
+Measure time spent by imports of estimage.data and of creating the web app,
+and check that neither loads scipy submodules or matplotlib.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import_time
+
+Every measurement runs in a fresh interpreter with `python -X importtime`,
+and the benchmark fails if it exceeds its budget.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+
+# Budgets in seconds, generous enough to absorb noise of shared machines
+BUDGETS = {
+    "import estimage.data": 0.5,
+    "create_app()": 1.0,
+}
+DEFERRED_MODULES = ("scipy.stats", "scipy.optimize", "scipy.interpolate", "scipy.sparse", "matplotlib")
+
+SNIPPETS = {
+    "import estimage.data": "import estimage.data",
+    "create_app()": "from estimage import webapp; webapp.create_app()",
+}
+
+
+def measure(snippet, env):
+    check_deferred = f"import sys; assert not [m for m in {DEFERRED_MODULES!r} if m in sys.modules]"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{snippet}; {check_deferred}"],
+        env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        msg = f"'{snippet}' failed or loaded deferred modules:\n{completed.stderr[-2000:]}"
+        raise RuntimeError(msg)
+    # Lines of top-level imports look like "import time: self | cumulative | name"
+    total = 0
+    for line in completed.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and not fields[2].startswith("  ") and fields[1].strip().isdigit():
+            total += int(fields[1])
+    return total / 1e6
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ, DATA_DIR=data_dir, PYTHONPATH=os.getcwd())
+        env.pop("DATA_DIRS", None)
+        for label, snippet in SNIPPETS.items():
+            elapsed = measure(snippet, env)
+            budget = BUDGETS[label]
+            print(f"{label:<30} {elapsed:8.3f} s  (budget {budget:.1f} s)")
+            if elapsed > budget:
+                failures.append(label)
+    if failures:
+        print(f"Over budget: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
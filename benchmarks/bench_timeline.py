@@ -0,0 +1,99 @@
+"""
+Compare memory and speed of progress of cards that use dense and run-length encoded timelines,
+and dense timelines of compact types with ones that hold only float64 values.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_timeline [number of cards]
+"""
+import datetime
+import gc
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from estimage import data
+from estimage.history import progress, timeline
+
+
+START = datetime.datetime(2020, 1, 1)
+ONE_DAY = datetime.timedelta(days=1)
+PERIODS = (("1 year", 365), ("5 years", 5 * 365))
+STATUSES = ("todo", "in_progress", "done")
+
+
+class Float64Progress(progress.Progress):
+    TIMELINE_CLASS = timeline.Timeline
+    TIMELINE_DTYPES = {kind: np.dtype(np.float64) for kind in progress.Progress.TIMELINE_DTYPES}
+
+
+class DenseProgress(progress.Progress):
+    TIMELINE_CLASS = timeline.Timeline
+
+
+class RunLengthProgress(progress.Progress):
+    TIMELINE_CLASS = timeline.RunLengthTimeline
+
+
+def make_events(card_index, days):
+    events = []
+    first_day = card_index % (days // 2)
+    for i, (old, new) in enumerate(zip(STATUSES[:-1], STATUSES[1:])):
+        event = data.Event(f"card-{card_index}", "state", START + ONE_DAY * (first_day + 7 * i))
+        event.value_before = old
+        event.value_after = new
+        events.append(event)
+    event = data.Event(f"card-{card_index}", "points", START + ONE_DAY * first_day)
+    event.value_before = 0
+    event.value_after = card_index % 8 + 1
+    events.append(event)
+    return events
+
+
+def create_progresses(progress_class, events_of_cards, days):
+    end = START + ONE_DAY * (days - 1)
+    progresses = []
+    for events in events_of_cards:
+        prog = progress_class(start=START, end=end)
+        prog.process_events(events)
+        progresses.append(prog)
+    return progresses
+
+
+def query_progresses(progresses):
+    for prog in progresses:
+        prog.is_done()
+        prog.points_completed()
+        prog.get_plan_array()
+        prog.get_velocity_array()
+
+
+def measure(label, progress_class, events_of_cards, days):
+    gc.collect()
+    tracemalloc.start()
+    progresses = create_progresses(progress_class, events_of_cards, days)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    create_progresses(progress_class, events_of_cards, days)
+    created = time.perf_counter()
+    query_progresses(progresses)
+    queried = time.perf_counter()
+    print(f"{label:<24} {current / 2 ** 20:8.1f} MiB {created - started:8.2f} s to process events "
+          f"{queried - created:8.2f} s to query")
+
+
+def main(num_cards):
+    print(f"{num_cards} cards")
+    for period_label, days in PERIODS:
+        events_of_cards = [make_events(i, days) for i in range(num_cards)]
+        measure(f"{period_label}, float64", Float64Progress, events_of_cards, days)
+        measure(f"{period_label}, dense", DenseProgress, events_of_cards, days)
+        measure(f"{period_label}, run-length", RunLengthProgress, events_of_cards, days)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
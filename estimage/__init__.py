@@ -12,6 +12,8 @@ class PluginResolver:
         self.class_bases = collections.defaultdict(tuple)
         self.subclass_dict = dict()
         self.global_symbol_prefix = ""
+        # Applied extensions as (class name, plugin module name, exported symbol), in order
+        self.extensions = []
 
     @classmethod
     def class_is_extendable(cls, name):
@@ -37,6 +39,17 @@ class PluginResolver:
         for class_name in self.class_dict:
             self.resolve_class_extension(class_name, plugin, exposed_exports)
 
+    def apply_extensions(self, extensions, plugins):
+        """
+        Apply extensions that a resolver recorded when it resolved the plugins,
+        so exports of plugins don't have to be resolved again.
+        """
+        plugins_by_module_name = {plugin.__name__: plugin for plugin in plugins}
+        for class_name, plugin_name, plugin_local_symbol_name in extensions:
+            class_extension = getattr(plugins_by_module_name[plugin_name], plugin_local_symbol_name)
+            self._update_class_with_extension(class_name, class_extension)
+            self.extensions.append((class_name, plugin_name, plugin_local_symbol_name))
+
     def resolve_class_extension(self, class_name, plugin, exposed_exports):
         plugin_doesnt_export_current_symbol = class_name not in exposed_exports
         if plugin_doesnt_export_current_symbol:
@@ -50,6 +63,7 @@ class PluginResolver:
                     "which was not found")
             raise ValueError(msg)
         self._update_class_with_extension(class_name, class_extension)
+        self.extensions.append((class_name, plugin.__name__, plugin_local_symbol_name))
 
     # TODO: Refactor
     # What this should do:
@@ -74,6 +88,7 @@ class PluginResolver:
     def _update_class_io_with_extension(self, class_name, new_class, original_class, extension):
         self._update_class_saver_or_loader_with_extension(persistence.LOADERS, class_name, new_class, original_class, extension)
         self._update_class_saver_or_loader_with_extension(persistence.SAVERS, class_name, new_class, original_class, extension)
+        persistence.forget_io_classes()
 
     def _register_class_to_enable_caching(self, class_name, cls):
         globals()[class_name] = cls
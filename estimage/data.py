@@ -2,11 +2,12 @@ import math
 
 import numpy as np
 
-from .entities.card import BaseCard
+from .entities.card import BaseCard, SlottedBaseCard, CardFamilyIndex, reduce_subsets_of_cards
 from .entities.status import Statuses, Status
-from .entities.estimate import Estimate, EstimInput
-from .entities.task import TaskModel, MemoryTaskModel
+from .entities.estimate import Estimate, EstimInput, EstimateArray, SlottedEstimate, SlottedEstimInput
+from .entities.task import TaskModel, MemoryTaskModel, SlottedTaskModel
 from .entities.composition import Composition, MemoryComposition
 from .entities.pollster import Pollster
 from .entities.model import EstiModel
-from .entities.event import Event, EventManager
+from .entities.event import Event, SlottedEvent, EventColumns, EventManager
+from .entities.symbols import SymbolTable
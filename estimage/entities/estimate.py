@@ -1,14 +1,68 @@
 import dataclasses
+import functools
 import math
+import typing
 
 import numpy as np
+# scipy loads its submodules, e.g. sp.stats, only when they are accessed
 import scipy as sp
-import scipy.stats
 
 from .. import utilities
 from ..statops import func
 
 
+PERT_TABLE_CACHE_SIZE = 1024
+# Tables take space that depends on their resolution, so their caches are bounded by bytes, not by count
+PERT_TABLE_CACHE_BYTES = 32 * 2 ** 20
+PERT_SAMPLING_RESOLUTION = 4096
+
+
+@functools.lru_cache(maxsize=PERT_TABLE_CACHE_SIZE)
+def _get_frozen_beta(a, b, scale, loc):
+    return sp.stats.beta(a, b, scale=scale, loc=loc)
+
+
+def _get_pert_beta_parameters(optimistic, most_likely, pessimistic, gamma):
+    width = pessimistic - optimistic
+    a = 1 + gamma * (most_likely - optimistic) / width
+    b = 1 + gamma * (pessimistic - most_likely) / width
+    return a, b
+
+
+@utilities.lru_cache_of_arrays(max_bytes=PERT_TABLE_CACHE_BYTES)
+def _get_pert_table(optimistic, most_likely, pessimistic, gamma, lower_bound, upper_bound, num_samples):
+    dom = np.linspace(lower_bound, upper_bound, num_samples)
+    if pessimistic == optimistic:
+        values = np.zeros_like(dom)
+        values[np.argmin(np.abs(dom - most_likely))] = 1.0
+    else:
+        a, b = _get_pert_beta_parameters(optimistic, most_likely, pessimistic, gamma)
+        values = _get_frozen_beta(a, b, pessimistic - optimistic, optimistic).pdf(dom)
+    if len(dom) > 1:
+        utilities.norm_pdf(values, dom[1] - dom[0])
+    else:
+        values[0] = 1
+    dom.flags.writeable = False
+    values.flags.writeable = False
+    return dom, values
+
+
+@utilities.lru_cache_of_arrays(max_bytes=PERT_TABLE_CACHE_BYTES)
+def _get_pert_quantile_table(optimistic, most_likely, pessimistic, gamma, resolution):
+    a, b = _get_pert_beta_parameters(optimistic, most_likely, pessimistic, gamma)
+    probabilities = np.linspace(0, 1, resolution)
+    quantiles = _get_frozen_beta(a, b, pessimistic - optimistic, optimistic).ppf(probabilities)
+    probabilities.flags.writeable = False
+    quantiles.flags.writeable = False
+    return probabilities, quantiles
+
+
+def _get_sqrt_for(* values):
+    if any(isinstance(v, np.ndarray) for v in values):
+        return np.sqrt
+    return math.sqrt
+
+
 def calculate_o_p_ext(m, E, V, L=4):
     """Given data, calculate optimistic and pessimistic numbers
     Args:
@@ -16,8 +70,11 @@ def calculate_o_p_ext(m, E, V, L=4):
         E: Expected
         V: Variance
         L: PERT Lambda parameter
+
+    Arguments may also be numpy arrays, in which case arrays are returned.
     """
-    dis = math.sqrt(
+    sqrt = _get_sqrt_for(m, E, V, L)
+    dis = sqrt(
         L**2 * E**2
         - 2 * E * L**2 * m
         + L**2 * m**2
@@ -36,27 +93,30 @@ def calculate_o_p_m_ext(E, V, S, L=4):
         L: PERT Lambda parameter
 
     Refer to misc/pert_calculations.mc to see where this comes from
+
+    Arguments may also be numpy arrays, in which case arrays are returned.
     """
+    sqrt = _get_sqrt_for(E, V, S, L)
     S2 = S ** 2
     L2 = L ** 2
 
     l_element = (L ** 2 + 8 * L + 16) * S2
-    sqrt_element = math.sqrt(S * (L + 4) * math.sqrt(l_element + 16 * L + 48) * V + (l_element + 8 * L + 24) * V)
+    sqrt_element = sqrt(S * (L + 4) * sqrt(l_element + 16 * L + 48) * V + (l_element + 8 * L + 24) * V)
     l2l_element = 32 * L + 96
-    p = math.sqrt(2) * sqrt_element + 4 * E
+    p = sqrt(2) * sqrt_element + 4 * E
     p /= 4
 
     o = (
-            S * (math.sqrt(2) * L + 2 ** (5 / 2)) * math.sqrt(l_element + 16 * L + 48)
-            - S2 * (math.sqrt(2)*L ** 2 + 2 ** (7/2) * L + 2 ** (9/2))
+            S * (sqrt(2) * L + 2 ** (5 / 2)) * sqrt(l_element + 16 * L + 48)
+            - S2 * (sqrt(2)*L ** 2 + 2 ** (7/2) * L + 2 ** (9/2))
             - 2 ** (7/2) * L
             - 3 * 2 ** (7/2)
         ) * sqrt_element + l2l_element * E
     o /= 32 * L + 96
 
     m = (
-            (math.sqrt(2) * L + 2 ** (5 / 2)) * S * math.sqrt((L2 + 8 * L + 16) * S2 + 16 * L + 48)
-            - (math.sqrt(2) * L2 + 2 ** (7/2) * L + 2**(9/2)) * S2
+            (sqrt(2) * L + 2 ** (5 / 2)) * S * sqrt((L2 + 8 * L + 16) * S2 + 16 * L + 48)
+            - (sqrt(2) * L2 + 2 ** (7/2) * L + 2**(9/2)) * S2
         ) * sqrt_element - l2l_element * E * L
     m /= l2l_element * L
     m *= -1
@@ -69,8 +129,11 @@ def calculate_o_p(m, E, V):
         m: Most likely
         E: Expected
         V: Variance
+
+    Arguments may also be numpy arrays, in which case arrays are returned.
     """
-    dis = math.sqrt(
+    sqrt = _get_sqrt_for(m, E, V)
+    dis = sqrt(
         4 * E ** 2
         - 8 * E * m
         + 4 * m ** 2
@@ -101,7 +164,7 @@ class EstimInput:
         return math.sqrt(square_sum)
 
     def copy(self):
-        ret = EstimInput(self.most_likely)
+        ret = self.__class__(self.most_likely)
         ret.optimistic = self.optimistic
         ret.pessimistic = self.pessimistic
         return ret
@@ -118,10 +181,15 @@ class EstimInput:
         ret = cls(m)
         ret.optimistic = o
         ret.pessimistic = p
-        ret.GAMMA = gamma
+        if gamma != cls.GAMMA:
+            ret.GAMMA = gamma
         return ret
 
 
+# GAMMA stays a class attribute, only inputs with a non-default GAMMA get a __dict__
+SlottedEstimInput = utilities.create_slotted_copy(EstimInput, "SlottedEstimInput", ("__dict__",))
+
+
 @dataclasses.dataclass
 class Estimate:
     """
@@ -136,6 +204,7 @@ class Estimate:
 
     source: EstimInput
     GAMMA = 4
+    SOURCE_CLASS = EstimInput
 
     def __init__(self, expected, sigma):
         self.expected = expected
@@ -143,7 +212,7 @@ class Estimate:
 
         self.source = None
         if self.sigma == 0:
-            self.source = EstimInput(self.expected)
+            self.source = self.SOURCE_CLASS(self.expected)
 
     @classmethod
     def from_input(cls, inp: EstimInput):
@@ -170,8 +239,9 @@ class Estimate:
         sigma = math.sqrt(variance)
 
         ret = cls(expected, sigma)
-        ret.GAMMA = GAMMA
-        ret.source = EstimInput(most_likely)
+        if GAMMA != cls.GAMMA:
+            ret.GAMMA = GAMMA
+        ret.source = cls.SOURCE_CLASS(most_likely)
         ret.source.optimistic = optimistic
         ret.source.pessimistic = pessimistic
         return ret
@@ -194,12 +264,16 @@ class Estimate:
         result = self.compose_with(rhs)
         return result
 
+    def _get_table_key(self):
+        source = self.source
+        return (source.optimistic, source.most_likely, source.pessimistic, self.GAMMA)
+
     def get_pert_of_given_density(self, samples_per_unit=30):
         lower_bound = self.source.optimistic - 1
         upper_bound = self.source.pessimistic + 1
-        dom = np.linspace(lower_bound, upper_bound,
-                          round(samples_per_unit * (upper_bound - lower_bound)))
-        return self.get_pert(dom=dom)
+        num_samples = round(samples_per_unit * (upper_bound - lower_bound))
+        dom, values = _get_pert_table(* self._get_table_key(), lower_bound, upper_bound, num_samples)
+        return np.array([dom, values])
 
     def get_pert(self, num_samples=100, dom=None):
         if num_samples < 1:
@@ -209,10 +283,10 @@ class Estimate:
             raise ValueError(msg)
 
         if dom is None:
-            dom = np.linspace(
-                self.source.optimistic,
-                self.source.pessimistic,
-                num_samples)
+            dom, values = _get_pert_table(
+                * self._get_table_key(), self.source.optimistic, self.source.pessimistic, num_samples)
+            return np.array([dom, values])
+
         values = self._get_pert(dom)
         if len(dom) > 1:
             utilities.norm_pdf(values, dom[1] - dom[0])
@@ -289,9 +363,8 @@ class Estimate:
         return 1 + self.GAMMA * (self.source.pessimistic - self.source.most_likely) / self.width
 
     def _get_rv(self):
-        return sp.stats.beta(
-            self.pert_beta_a, self.pert_beta_b,
-            scale=self.width, loc=self.source.optimistic)
+        return _get_frozen_beta(
+            self.pert_beta_a, self.pert_beta_b, self.width, self.source.optimistic)
 
     def _get_pert(self, domain):
         if self.width == 0:
@@ -302,9 +375,21 @@ class Estimate:
         values = self._get_rv().pdf(domain)
         return values
 
+    def get_pert_quantiles(self, resolution=PERT_SAMPLING_RESOLUTION):
+        """
+        Return evenly spaced probabilities from 0 to 1 and respective quantiles of the PERT distribution
+        """
+        if self.width == 0:
+            return np.linspace(0, 1, resolution), np.full(resolution, float(self.source.most_likely))
+        return _get_pert_quantile_table(* self._get_table_key(), resolution)
+
     def pert_rvs(self, size):
+        """
+        Sample the PERT distribution by interpolating a table of its quantiles
+        """
         if self.width > 0:
-            ret = self._get_rv().rvs(size=size)
+            probabilities, quantiles = self.get_pert_quantiles()
+            ret = np.interp(np.random.random_sample(size), probabilities, quantiles)
         else:
             ret = np.ones(size) * self.source.most_likely
         return ret
@@ -325,3 +410,150 @@ class Estimate:
         if diff_of_expected == 0:
             return 0
         return diff_of_expected / sum_of_sigmas
+
+
+SlottedEstimate = utilities.create_slotted_copy(Estimate, "SlottedEstimate", ("__dict__",))
+SlottedEstimate.SOURCE_CLASS = SlottedEstimInput
+
+
+def _as_array(values):
+    return np.asarray(values, dtype=float)
+
+
+@dataclasses.dataclass
+class EstimateArray:
+    """
+    Estimates stored as arrays of their properties,
+    so that the math of :class:`Estimate` can be evaluated for many estimates at once.
+
+    The 3-point source of every estimate is always known.
+    """
+    optimistic: np.ndarray
+    most_likely: np.ndarray
+    pessimistic: np.ndarray
+    expected: np.ndarray
+    sigma: np.ndarray
+    gamma: np.ndarray
+
+    def __len__(self):
+        return len(self.expected)
+
+    @staticmethod
+    def triples_are_valid(most_likely, optimistic, pessimistic) -> np.ndarray:
+        most_likely, optimistic, pessimistic = _as_array(most_likely), _as_array(optimistic), _as_array(pessimistic)
+        return (optimistic <= most_likely) & (most_likely <= pessimistic)
+
+    @classmethod
+    def from_triple(cls, most_likely, optimistic, pessimistic, GAMMA=None):
+        most_likely, optimistic, pessimistic = _as_array(most_likely), _as_array(optimistic), _as_array(pessimistic)
+        if GAMMA is None:
+            GAMMA = Estimate.GAMMA
+        gamma = np.broadcast_to(_as_array(GAMMA), most_likely.shape).copy()
+
+        invalid_indices = np.flatnonzero(~ cls.triples_are_valid(most_likely, optimistic, pessimistic))
+        if len(invalid_indices):
+            i = invalid_indices[0]
+            msg = (
+                "The optimistic<=most likely<=pessimistic inequality "
+                f"is not met for {len(invalid_indices)} estimates, e.g. it is not true that "
+                f"{optimistic[i]:.4g} <= {most_likely[i]:.4g} <= {pessimistic[i]:.4g}"
+            )
+            raise ValueError(msg)
+        expected = (optimistic + pessimistic + gamma * most_likely) / (gamma + 2)
+
+        variance = (expected - optimistic) * (pessimistic - expected) / (gamma + 3)
+        variance[(variance < 0) & (variance > - 1e-10)] = 0
+        sigma = np.sqrt(variance)
+
+        return cls(optimistic, most_likely, pessimistic, expected, sigma, gamma)
+
+    @staticmethod
+    def _inputs_to_arrays(inputs: typing.Sequence[EstimInput]):
+        ret = np.array(
+            [(i.most_likely, i.optimistic, i.pessimistic, i.GAMMA) for i in inputs], dtype=float)
+        return ret.reshape(-1, 4).T
+
+    @classmethod
+    def inputs_are_valid(cls, inputs: typing.Sequence[EstimInput]) -> np.ndarray:
+        most_likely, optimistic, pessimistic, _ = cls._inputs_to_arrays(inputs)
+        return cls.triples_are_valid(most_likely, optimistic, pessimistic)
+
+    @classmethod
+    def from_inputs(cls, inputs: typing.Sequence[EstimInput]):
+        return cls.from_triple(* cls._inputs_to_arrays(inputs))
+
+    @classmethod
+    def from_estimates(cls, estimates: typing.Sequence[Estimate]):
+        return cls.from_inputs([e.source for e in estimates])
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._get_estimate(index)
+        return EstimateArray(
+            self.optimistic[index], self.most_likely[index], self.pessimistic[index],
+            self.expected[index], self.sigma[index], self.gamma[index])
+
+    def _get_estimate(self, index):
+        ret = Estimate(float(self.expected[index]), float(self.sigma[index]))
+        if self.gamma[index] != Estimate.GAMMA:
+            ret.GAMMA = float(self.gamma[index])
+        ret.source = EstimInput(float(self.most_likely[index]))
+        ret.source.optimistic = float(self.optimistic[index])
+        ret.source.pessimistic = float(self.pessimistic[index])
+        return ret
+
+    def to_estimates(self) -> typing.List[Estimate]:
+        return [self._get_estimate(i) for i in range(len(self))]
+
+    @property
+    def variance(self):
+        return self.sigma ** 2
+
+    @property
+    def width(self):
+        return self.pessimistic - self.optimistic
+
+    @property
+    def pert_beta_a(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 1 + self.gamma * (self.most_likely - self.optimistic) / self.width
+
+    @property
+    def pert_beta_b(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 1 + self.gamma * (self.pessimistic - self.most_likely) / self.width
+
+    @property
+    def skewness(self):
+        a = self.pert_beta_a
+        b = self.pert_beta_b
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = 2 * (b - a) * np.sqrt(a + b + 1)
+            ret /= (a + b + 2) * np.sqrt(a * b)
+        ret[self.sigma == 0] = 0
+        return ret
+
+    def compose_using_parameters(self, rhs: "EstimateArray"):
+        """
+        Compose estimates with respective estimates of the other array,
+        the same way as :meth:`Estimate.compose_using_parameters` does.
+        """
+        shifted = (self.sigma == 0) | (rhs.sigma == 0)
+        ret = EstimateArray(
+            self.optimistic + rhs.optimistic, self.most_likely + rhs.most_likely,
+            self.pessimistic + rhs.pessimistic,
+            self.expected + rhs.expected, self.sigma + rhs.sigma, self.gamma.copy())
+
+        composed = ~ shifted
+        if not composed.any():
+            return ret
+        lhs, rhs = self[composed], rhs[composed]
+        variance_sum = lhs.variance + rhs.variance
+        sum_of_3rd_moments = lhs.skewness * lhs.sigma ** 3 + rhs.skewness * rhs.sigma ** 3
+        skewness_sum = sum_of_3rd_moments / variance_sum ** 1.5
+        o, p, m = calculate_o_p_m_ext(lhs.expected + rhs.expected, variance_sum, skewness_sum, lhs.gamma)
+        composed_estimates = EstimateArray.from_triple(m, o, p, lhs.gamma)
+
+        for field in dataclasses.fields(self):
+            getattr(ret, field.name)[composed] = getattr(composed_estimates, field.name)
+        return ret
@@ -3,7 +3,11 @@ import datetime
 import typing
 import collections
 
+import numpy as np
+
 from . import card
+from .symbols import SymbolTable
+from .. import utilities
 
 
 @dataclasses.dataclass
@@ -45,21 +49,98 @@ class Event:
         return cls._consistent_sorted_events(events[1:])
 
 
+# Set EventLoader.EVENT_CLASS to load events that take less memory
+SlottedEvent = utilities.create_slotted_copy(Event, "SlottedEvent")
+
+
+def _value_or_none(value):
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+@dataclasses.dataclass
+class EventColumns:
+    """
+    Chronologically ordered events of one task and one quantity, stored as columns.
+
+    Times are datetime64 values. Values of numeric quantities are floats, missing values being NaN,
+    other values are objects, missing values being None.
+    Iteration yields instances of the event class, so columns can stand in for lists of events.
+    """
+    task_name: str
+    quantity: str
+    times: np.ndarray
+    values_before: np.ndarray
+    values_after: np.ndarray
+    event_class: type = Event
+
+    @classmethod
+    def from_events(cls, events: typing.Sequence[Event]) -> "EventColumns":
+        events = sorted(events, key=lambda e: e.time)
+        return cls(
+            events[0].task_name, events[0].quantity,
+            np.array([e.time for e in events], dtype="datetime64[us]"),
+            np.array([e.value_before for e in events], dtype=object),
+            np.array([e.value_after for e in events], dtype=object),
+            type(events[0]))
+
+    def __len__(self):
+        return len(self.times)
+
+    def __iter__(self):
+        times = self.times.astype("datetime64[us]").tolist()
+        for time, before, after in zip(times, self.values_before.tolist(), self.values_after.tolist()):
+            evt = self.event_class(self.task_name, self.quantity, time)
+            evt.value_before = _value_or_none(before)
+            evt.value_after = _value_or_none(after)
+            yield evt
+
+    def select(self, mask: np.ndarray) -> "EventColumns":
+        return dataclasses.replace(
+            self, times=self.times[mask],
+            values_before=self.values_before[mask], values_after=self.values_after[mask])
+
+    def get_last_value_after(self):
+        return _value_or_none(self.values_after[-1])
+
+
 class EventManager:
     _events: typing.Dict[str, typing.List[Event]]
+    # Loaded events, which are turned to Event objects only when they are needed as such
+    _columns: typing.Dict[str, typing.Dict[str, EventColumns]]
+    card_ids: typing.Optional[SymbolTable]
+    # Event columns by type of every task, indexed by IDs of tasks in card_ids
+    _columns_by_id: typing.Optional[typing.List[typing.Dict[str, EventColumns]]]
 
     def __init__(self):
         self._events = collections.defaultdict(list)
+        self._columns = dict()
+        self.card_ids = None
+        self._columns_by_id = None
+
+    def _materialize_events_of(self, task_name: str):
+        if (columns_by_type := self._columns.pop(task_name, None)) is None:
+            return
+        events = [evt for columns in columns_by_type.values() for evt in columns]
+        self._events[task_name] = sorted(events, key=lambda e: e.time)
+
+    def _materialize_all_events(self):
+        for task_name in list(self._columns):
+            self._materialize_events_of(task_name)
 
     def add_event(self, event: Event):
+        self._materialize_events_of(event.task_name)
         events = self._events[event.task_name]
         events.append(event)
         self._events[event.task_name] = sorted(events, key=lambda e: e.time)
+        self._columns_by_id = None
 
     def get_referenced_task_names(self):
-        return set(self._events.keys())
+        return set(self._events.keys()) | set(self._columns.keys())
 
     def get_chronological_task_events_by_type(self, task_name: str):
+        self._materialize_events_of(task_name)
         if task_name not in self._events:
             return dict()
 
@@ -70,15 +151,64 @@ class EventManager:
 
         return events_by_type
 
+    def get_chronological_task_event_columns_by_type(self, task_name: str):
+        if (ret := self._columns.get(task_name)) is not None:
+            return ret
+        events_by_type = self.get_chronological_task_events_by_type(task_name)
+        return {
+            quantity: EventColumns.from_events(events)
+            for quantity, events in events_by_type.items()}
+
+    def index_by(self, card_ids: SymbolTable):
+        """
+        Make events retrievable by IDs of their tasks in the card_ids symbol table.
+
+        Tasks of events that are not in the table yet are assigned their IDs once events are retrieved.
+        """
+        if card_ids is self.card_ids:
+            return
+        self.card_ids = card_ids
+        self._columns_by_id = None
+
+    def _get_columns_by_id(self):
+        if self._columns_by_id is not None:
+            return self._columns_by_id
+        task_names = list(self.get_referenced_task_names())
+        self.card_ids.extend(task_names)
+        ret = [None] * len(self.card_ids)
+        for task_name, task_id in zip(task_names, self.card_ids.ids_of(task_names)):
+            ret[task_id] = self.get_chronological_task_event_columns_by_type(task_name)
+        self._columns_by_id = ret
+        return ret
+
+    def get_chronological_event_columns_by_type_of(self, task_ids: typing.Iterable[int]):
+        """
+        Return event columns of tasks of IDs in the table that the manager is indexed by, in their order.
+        """
+        if self.card_ids is None:
+            raise RuntimeError("Events are not indexed by any symbol table.")
+        columns_by_id = self._get_columns_by_id()
+        ret = []
+        for task_id in task_ids:
+            # Tasks that got their IDs after events were indexed have no events
+            columns_by_type = columns_by_id[task_id] if task_id < len(columns_by_id) else None
+            ret.append(columns_by_type or dict())
+        return ret
+
     def save(self, io_cls):
+        self._materialize_all_events()
         with io_cls.get_saver() as saver:
             saver.save_events_by_subject(self._events)
 
     def load(self, io_cls):
         with io_cls.get_loader() as loader:
-            self._events = loader.load_events_by_subject()
+            self._columns = loader.load_event_columns_by_subject()
+        self._events = collections.defaultdict(list)
+        self._columns_by_id = None
 
     def erase(self, io_cls):
         self._events.clear()
+        self._columns.clear()
+        self._columns_by_id = None
         with io_cls.get_saver() as saver:
             saver.forget_all()
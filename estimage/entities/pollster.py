@@ -1,6 +1,9 @@
 import typing
 
-from .estimate import Estimate, EstimInput
+import numpy as np
+
+from .estimate import Estimate, EstimInput, EstimateArray
+from .symbols import SymbolTable
 from .task import TaskModel
 
 
@@ -52,6 +55,22 @@ class Pollster:
                     ret[name] = self._ask_points(loader, self._namespace, name)
         return ret
 
+    def provide_expected_points_by_id(
+            self, card_ids: SymbolTable, names: typing.Iterable[str]) -> np.ndarray:
+        """
+        Return expected points of estimates of the names, indexed by their IDs in the symbol table.
+
+        Entries of other names of the table, and of names without a valid estimate, are NaN.
+        """
+        ret = np.full(len(card_ids), np.nan)
+        known_estimates = self.provide_info_about(names)
+        estimate_sources = list(known_estimates.values())
+        valid = EstimateArray.inputs_are_valid(estimate_sources)
+        valid_ids = card_ids.ids_of(known_estimates.keys())[valid]
+        estimates = EstimateArray.from_inputs([s for s, is_valid in zip(estimate_sources, valid) if is_valid])
+        ret[valid_ids] = estimates.expected
+        return ret
+
     def supply_valid_estimations_to_tasks(self, tasks: typing.List[TaskModel]):
         tasks_by_name = {t.name: t for t in tasks}
         known_estimates = self.provide_info_about(tasks_by_name.keys())
@@ -64,11 +83,13 @@ class Pollster:
 
     def supply_known_estimates_to_tasks_and_get_failed_task_names(
             self, known_estimates, tasks_by_name):
-        defective_tasks = set()
-        for task_name, estimate_source in known_estimates.items():
-            try:
-                estimate = Estimate.from_input(estimate_source)
-                tasks_by_name[task_name].point_estimate = estimate
-            except ValueError:
-                defective_tasks.add(task_name)
+        task_names = list(known_estimates.keys())
+        estimate_sources = list(known_estimates.values())
+        valid = EstimateArray.inputs_are_valid(estimate_sources)
+
+        defective_tasks = {name for name, is_valid in zip(task_names, valid) if not is_valid}
+        valid_names = [name for name, is_valid in zip(task_names, valid) if is_valid]
+        estimates = EstimateArray.from_inputs([s for s, is_valid in zip(estimate_sources, valid) if is_valid])
+        for task_name, estimate in zip(valid_names, estimates.to_estimates()):
+            tasks_by_name[task_name].point_estimate = estimate
         return defective_tasks
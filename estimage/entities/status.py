@@ -1,4 +1,7 @@
 import dataclasses
+import sys
+
+import numpy as np
 
 from .. import PluginResolver
 
@@ -36,6 +39,59 @@ class Status:
 IRRELEVANT_STATUS = Status.create("irrelevant", relevant=False)
 
 
+class StatusList(list):
+    """
+    List of statuses that keeps track of the index of every status name.
+
+    The index is updated by mutating methods, so subclasses of Statuses
+    can extend or modify the list in place.
+    """
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.version = 0
+        self._reindex()
+
+    def _reindex(self):
+        self.indices_by_name = dict()
+        for idx, status in enumerate(self):
+            self.indices_by_name.setdefault(status.name, idx)
+        self.version += 1
+
+    def append(self, status):
+        super().append(status)
+        self.indices_by_name.setdefault(status.name, len(self) - 1)
+        self.version += 1
+
+    def extend(self, statuses):
+        first_new_index = len(self)
+        super().extend(statuses)
+        for idx in range(first_new_index, len(self)):
+            self.indices_by_name.setdefault(self[idx].name, idx)
+        self.version += 1
+
+    def __iadd__(self, statuses):
+        self.extend(statuses)
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+
+def _reindexing_list_method(name):
+    original_method = getattr(list, name)
+
+    def method(self, * args, ** kwargs):
+        ret = original_method(self, * args, ** kwargs)
+        self._reindex()
+        return ret
+    method.__name__ = name
+    return method
+
+
+for _method_name in ("insert", "pop", "remove", "clear", "sort", "reverse", "__setitem__", "__delitem__"):
+    setattr(StatusList, _method_name, _reindexing_list_method(_method_name))
+
+
 @PluginResolver.class_is_extendable("Statuses")
 class Statuses:
     def __init__(self):
@@ -46,6 +102,16 @@ class Statuses:
             Status.create("done", wip=False, started=True, done=True),
         ]
 
+    @property
+    def statuses(self):
+        return self._statuses
+
+    @statuses.setter
+    def statuses(self, statuses):
+        self._statuses = StatusList(statuses)
+        self._property_luts = dict()
+        self._property_luts_version = self._statuses.version
+
     def get(self, name):
         idx = self.int(name)
         if idx is None:
@@ -54,11 +120,11 @@ class Statuses:
         return self.statuses[idx]
 
     def int(self, name):
-        for idx, status in enumerate(self.statuses):
-            if status.name == name:
-                return idx
-        msg = f"Status '{name}' not known."
-        raise ValueError(msg)
+        idx = self.statuses.indices_by_name.get(name)
+        if idx is None:
+            msg = f"Status '{name}' not known."
+            raise ValueError(msg)
+        return idx
 
     def _statuses_have_property(self, statuses, name, value):
         ret = []
@@ -73,6 +139,22 @@ class Statuses:
             ret = self._statuses_have_property(ret, prop_name, value)
         return ret
 
+    def get_property_lut(self, ** kwargs) -> np.ndarray:
+        """
+        Return a boolean array indexed by status codes,
+        that is true for codes of statuses that have all the specified properties.
+        """
+        if self._property_luts_version != self.statuses.version:
+            self._property_luts.clear()
+            self._property_luts_version = self.statuses.version
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._property_luts:
+            lut = np.zeros(len(self.statuses), dtype=bool)
+            lut[self.get_ints(self.that_have_properties(** kwargs))] = True
+            lut.flags.writeable = False
+            self._property_luts[key] = lut
+        return self._property_luts[key]
+
     def get_ints(self, statuses):
         names = [s.name for s in statuses]
         ints = [self.int(n) for n in names]
@@ -95,6 +177,6 @@ def get_canonical_status(name_or_index):
     except IndexError:
         return "irrelevant"
     except ValueError:
-        return name_or_index
+        return sys.intern(name_or_index)
 
 
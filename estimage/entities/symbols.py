@@ -0,0 +1,69 @@
+import collections.abc
+import threading
+import typing
+
+import numpy as np
+
+
+class SymbolTable(collections.abc.Mapping):
+    """
+    Assigns dense integer IDs to names, in the order in which names are encountered.
+
+    The table is a mapping of names to IDs, and IDs can index rows or columns of arrays,
+    so structures that share a table are aligned without further lookups.
+    IDs are never reassigned, so they stay valid while the table grows,
+    and threads can share a table.
+    """
+    def __init__(self, names: typing.Iterable[str]=()):
+        self._ids = dict()
+        self.names = []
+        self._assignment_lock = threading.Lock()
+        self.extend(names)
+
+    def __getstate__(self):
+        return dict(_ids=self._ids, names=self.names)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._assignment_lock = threading.Lock()
+
+    def id_of(self, name: str) -> int:
+        """
+        Return the ID of the name, assigning a new one if the name is not known yet.
+        """
+        if (ret := self._ids.get(name)) is None:
+            with self._assignment_lock:
+                if (ret := self._ids.get(name)) is None:
+                    ret = len(self.names)
+                    self.names.append(name)
+                    self._ids[name] = ret
+        return ret
+
+    def extend(self, names: typing.Iterable[str]):
+        for name in names:
+            self.id_of(name)
+
+    def ids_of(self, names: typing.Iterable[str]) -> np.ndarray:
+        """
+        Return the array of IDs of names, which have to be known.
+        """
+        try:
+            return np.fromiter((self._ids[name] for name in names), dtype=np.intp)
+        except KeyError as exc:
+            msg = f"Unknown name {exc}"
+            raise KeyError(msg) from exc
+
+    def name_of(self, symbol_id: int) -> str:
+        return self.names[symbol_id]
+
+    def __getitem__(self, name: str) -> int:
+        return self._ids[name]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._ids
@@ -1,6 +1,7 @@
 import dataclasses
 
 from .estimate import Estimate
+from .. import utilities
 
 
 # decorator to skip getters
@@ -72,6 +73,9 @@ class TaskModel:
         raise NotImplementedError()
 
 
+SlottedTaskModel = utilities.create_slotted_copy(TaskModel, "SlottedTaskModel")
+
+
 class MemoryTaskModel(TaskModel):
     RESULTS = dict()
 
@@ -4,7 +4,7 @@ import numpy as np
 
 from ..entities import card
 
-from .timeline import Timeline
+from .timeline import Timeline, RunLengthTimeline
 from .progress import Progress
 from .aggregation import Aggregation, Summary
 
@@ -1,4 +1,5 @@
 import datetime
+import math
 import typing
 import collections
 import dataclasses
@@ -6,7 +7,6 @@ import dataclasses
 import numpy as np
 
 from .. import data
-from .. import utilities
 from ..entities import card, status
 
 from . import progress
@@ -69,11 +69,18 @@ def convert_card_to_representation(
         source: card.BaseCard,
         start: datetime.datetime, end: datetime.datetime,
         statuses: status.Statuses) -> progress.Progress:
+    return _convert_card_with_span_to_representation(source, source.work_span, start, end, statuses)
+
+
+def _convert_card_with_span_to_representation(
+        source: card.BaseCard, work_span,
+        start: datetime.datetime, end: datetime.datetime,
+        statuses: status.Statuses) -> progress.Progress:
     repre = progress.Progress(start, end, statuses)
     repre.task_name = source.name
     repre.points_timeline.set_value_at(end, source.point_cost)
     repre.set_status_at(end, source.status)
-    if work_span := source.work_span:
+    if work_span:
         work_span = produce_meaningful_span(work_span, start, end)
         if work_span[1] < work_span[0]:
             msg = f"Inconsistent work span in {source.name}"
@@ -112,43 +119,92 @@ def propagate_span_from_parent(current_card, start, end):
         propagate_span_to_children(current_card.parent.work_span, current_card, start, end)
 
 
+def get_effective_work_span(current_card):
+    """
+    Return the work span of the topmost ancestor of the card that has one,
+    or the span of the card itself if none of its ancestors has one.
+    """
+    ret = current_card.work_span
+    while current_card := current_card.parent:
+        ret = current_card.work_span or ret
+    return ret
+
+
+def get_leaves_with_effective_work_spans(
+        source: card.BaseCard) -> typing.List[typing.Tuple[card.BaseCard, typing.Any]]:
+    ret = []
+
+    to_visit = [(source, get_effective_work_span(source))]
+    while to_visit:
+        current_card, work_span = to_visit.pop()
+        if not current_card.children:
+            ret.append((current_card, work_span))
+            continue
+        to_visit.extend(
+            (child, work_span or child.work_span) for child in reversed(current_card.children))
+    return ret
+
+
 def convert_card_to_representations_of_leaves(
         source: card.BaseCard,
         start: datetime.datetime, end: datetime.datetime,
         statuses: status.Statuses) -> typing.List[progress.Progress]:
-    ret = []
+    return [
+        _convert_card_with_span_to_representation(leaf, work_span, start, end, statuses)
+        for leaf, work_span in get_leaves_with_effective_work_spans(source)]
 
-    propagate_span_from_parent(source, start, end)
-    if source.children:
-        for d in source.children:
-            ret.extend(convert_card_to_representations_of_leaves(d, start, end, statuses))
-            recursively_propagate_span_to_children(source, start, end)
-    else:
-        ret = [convert_card_to_representation(source, start, end, statuses)]
-    return ret
 
+def produce_tiered_aggregations(all_cards, all_events, start, end, statuses=None, card_ids=None):
+    """
+    Produce an aggregation of cards of every tier up to the highest one.
 
-def produce_tiered_aggregations(all_cards, all_events, start, end):
+    The same leaf cards tend to appear in multiple tiers,
+    so tiers share representations of leaves,
+    and events of every leaf are replayed only once.
+    """
     cards_by_tiers = collections.defaultdict(list)
     for t in all_cards.values():
         cards_by_tiers[t.tier].append(t)
 
+    all_leaves = Aggregation(statuses, card_ids)
+    repres_by_id = dict()
     aggregations = []
     for tier in range(max(cards_by_tiers.keys()) + 1):
-        card_tree = utilities.reduce_subsets_from_sets(cards_by_tiers[tier])
-        a = Aggregation.from_cards(card_tree, start, end)
-        a.process_event_manager(all_events)
+        card_tree = data.reduce_subsets_of_cards(cards_by_tiers[tier])
+        a = Aggregation(all_leaves.statuses, all_leaves.card_ids)
+        for source in card_tree:
+            for leaf, work_span in get_leaves_with_effective_work_spans(source):
+                leaf_id = all_leaves.card_ids.id_of(leaf.name)
+                if leaf_id not in repres_by_id:
+                    repre = _convert_card_with_span_to_representation(
+                        leaf, work_span, start, end, all_leaves.statuses)
+                    all_leaves.add_repre(repre)
+                    repres_by_id[leaf_id] = repre
+                a.add_repre(repres_by_id[leaf_id])
         aggregations.append(a)
+    all_leaves.process_event_manager(all_events)
     return aggregations
 
 
 class Aggregation:
+    """
+    Progress of a set of cards.
+
+    Cards are identified by their IDs in card_ids, which can be shared with other structures,
+    s.a. the event manager that supplies events of cards.
+    """
     repres: typing.List[progress.Progress]
+    card_ids: data.SymbolTable
+    # Positions of progress representations in repres by IDs of their cards
+    _positions_by_card_id: typing.Dict[int, int]
 
-    def __init__(self, statuses=None):
+    def __init__(self, statuses=None, card_ids=None):
         self.repres = []
         self.statuses = statuses
-        self._card_names = set()
+        self.card_ids = card_ids
+        if self.card_ids is None:
+            self.card_ids = data.SymbolTable()
+        self._positions_by_card_id = dict()
         if not self.statuses:
             self.statuses = status.Statuses()
 
@@ -156,15 +212,15 @@ class Aggregation:
     def from_card(
             cls, source: card.BaseCard,
             start: datetime.datetime, end: datetime.datetime,
-            statuses: status.Statuses=None) -> "Aggregation":
-        return cls.from_cards([source], start, end, statuses)
+            statuses: status.Statuses=None, card_ids: data.SymbolTable=None) -> "Aggregation":
+        return cls.from_cards([source], start, end, statuses, card_ids)
 
     @classmethod
     def from_cards(
             cls, sources: card.BaseCard,
             start: datetime.datetime, end: datetime.datetime,
-            statuses: status.Statuses=None) -> "Aggregation":
-        ret = cls(statuses)
+            statuses: status.Statuses=None, card_ids: data.SymbolTable=None) -> "Aggregation":
+        ret = cls(statuses, card_ids)
         known_cards = set()
         for s in sources:
             for r in convert_card_to_representations_of_leaves(s, start, end, ret.statuses):
@@ -172,10 +228,10 @@ class Aggregation:
         return ret
 
     def process_events(self, events: typing.Iterable[data.Event]):
-        events_by_taskname = collections.defaultdict(lambda: collections.defaultdict(list))
+        manager = data.EventManager()
         for evt in events:
-            events_by_taskname[evt.task_name][evt.quantity].append(evt)
-        self.process_events_by_taskname_and_type(events_by_taskname)
+            manager.add_event(evt)
+        self.process_event_manager(manager)
 
     def get_velocity_array(self):
         if not self.repres:
@@ -185,6 +241,37 @@ class Aggregation:
             ret += r.get_velocity_array()
         return ret
 
+    def _get_cutoff_index(self, cutoff_date):
+        if cutoff_date is None:
+            return self.days - 1
+        days_until_cutoff = math.ceil((cutoff_date - self.start) / progress.ONE_DAY)
+        return min(max(days_until_cutoff, 0), self.days - 1)
+
+    def get_rolling_velocity_array(self, cutoff_date: datetime.datetime=None):
+        """
+        Return the array of points completed since the start of the period
+        divided by the number of days that have elapsed, evaluated for every day
+        up to the cutoff date. Days after the cutoff are zero.
+
+        Work completed on the first day of the period is considered to have been done before.
+        """
+        if not self.repres:
+            return np.array([])
+        completion_indices = []
+        completed_points = []
+        for r in self.repres:
+            index_of_completion = r.get_index_of_completion()
+            if not index_of_completion:
+                continue
+            completion_indices.append(index_of_completion)
+            completed_points.append(r.points_completed())
+
+        points_completed_on_day = np.zeros(self.days)
+        np.add.at(points_completed_on_day, np.array(completion_indices, dtype=int), completed_points)
+        ret = np.cumsum(points_completed_on_day) / (np.arange(self.days) + 1)
+        ret[self._get_cutoff_index(cutoff_date) + 1:] = 0
+        return ret
+
     def get_plan_array(self):
         if not self.repres:
             return np.array([])
@@ -200,28 +287,17 @@ class Aggregation:
         array = self.get_velocity_array()
         return data.Estimate(array.mean(), array.std())
 
-    def process_events_by_taskname_and_type(
-                self, events_by_taskname: typing.Mapping[str, data.Event]):
-        for r in self.repres:
-            task_name = r.task_name
-            if task_name not in events_by_taskname:
-                continue
-            try:
-                r.process_events_by_type(events_by_taskname[task_name])
-            except ValueError as exc:
-                msg = f"Error with an event of card '{task_name}': {exc}"
-                raise ValueError(msg) from exc
-
     def add_repre(self, repre):
         card_name = repre.task_name
         if (self.end and self.end != repre.end) or (self.start and self.start != repre.start):
             msg = f"Incompatible timespan of progress of '{card_name}' {repre.start}--{repre.end}"
             raise ValueError(msg)
-        if card_name in self._card_names:
+        card_id = self.card_ids.id_of(card_name)
+        if card_id in self._positions_by_card_id:
             msg = f"Attempted repeated insertion of progress of '{card_name}'"
             raise ValueError(msg)
+        self._positions_by_card_id[card_id] = len(self.repres)
         self.repres.append(repre)
-        self._card_names.add(card_name)
 
     def statuses_on(self, when):
         states = set()
@@ -254,11 +330,16 @@ class Aggregation:
         return (self.end - self.start).days + 1
 
     def process_event_manager(self, manager: data.EventManager):
-        events_by_taskname = dict()
-        for repre in self.repres:
-            name = repre.task_name
-            events_by_taskname[name] = manager.get_chronological_task_events_by_type(name)
-        self.process_events_by_taskname_and_type(events_by_taskname)
+        manager.index_by(self.card_ids)
+        columns_of_repres = manager.get_chronological_event_columns_by_type_of(self._positions_by_card_id)
+        for r, columns_by_type in zip(self.repres, columns_of_repres):
+            if not columns_by_type:
+                continue
+            try:
+                r.process_event_columns_by_type(columns_by_type)
+            except ValueError as exc:
+                msg = f"Error with an event of card '{r.task_name}': {exc}"
+                raise ValueError(msg) from exc
 
 
 ZERO_ESTIMATE_FIELD = dataclasses.field(default_factory=lambda: data.Estimate.from_triple(0, 0, 0))
@@ -1,3 +1,4 @@
+import dataclasses
 import datetime
 import typing
 import collections
@@ -27,6 +28,18 @@ class Progress:
     relevancy_timeline: timeline.Timeline
     task_name: str
 
+    TIMELINE_CLASS: typing.Type[timeline.Timeline] = timeline.Timeline
+    # Narrowest types that hold values of respective timelines -
+    # statuses are indices of the statuses list.
+    # Points stay float64, as float32 would turn e.g. 0.3 into 0.30000001192092896.
+    TIMELINE_DTYPES: typing.Dict[str, np.dtype] = dict(
+        points=np.dtype(np.float64),
+        status=np.dtype(np.int8),
+        time=np.dtype(np.float64),
+        remainder=np.dtype(np.float64),
+        relevancy=np.dtype(bool),
+    )
+
     def __init__(self, start, end, statuses=None):
         self.start = start
         self.end = end
@@ -34,18 +47,24 @@ class Progress:
         self.statuses = statuses
         if self.statuses is None:
             self.statuses = status.Statuses()
-        self.points_timeline = timeline.Timeline(start, end)
-        self.status_timeline = timeline.Timeline(start, end)
-        self.status_timeline.recreate_with_value(self.statuses.int("irrelevant"), int)
-        self.time_timeline = timeline.Timeline(start, end)
+        self.points_timeline = self._create_timeline("points")
+        self.status_timeline = self._create_timeline("status")
+        self.status_timeline.recreate_with_value(self.statuses.int("irrelevant"))
+        self.time_timeline = self._create_timeline("time")
 
-        self.remainder_timeline = timeline.Timeline(start, end)
+        self.remainder_timeline = self._create_timeline("remainder")
         self.calculate_plan()
 
-        self.relevancy_timeline = timeline.Timeline(start, end)
+        self.relevancy_timeline = self._create_timeline("relevancy")
         self.relevancy_timeline.recreate_with_value(1)
         self.task_name = ""
 
+        self._status_masks = dict()
+        self._status_masks_key = None
+
+    def _create_timeline(self, kind):
+        return self.TIMELINE_CLASS(self.start, self.end, self.TIMELINE_DTYPES[kind])
+
     def calculate_plan(self, work_start=None, work_end=None):
         start = work_start or self.start
         end = work_end or self.end
@@ -62,24 +81,41 @@ class Progress:
     def get_points_at(self, when):
         if not self.relevancy_timeline.value_at(when):
             return 0
-        return self.points_timeline.value_at(when)
+        return float(self.points_timeline.value_at(when))
+
+    def _get_cached_status_mask(self, key, mask_factory):
+        current_key = (
+            self.status_timeline, self.status_timeline.version,
+            self.statuses, self.statuses.statuses.version)
+        if self._status_masks_key != current_key:
+            self._status_masks.clear()
+            self._status_masks_key = current_key
+        if key not in self._status_masks:
+            mask = mask_factory()
+            mask.flags.writeable = False
+            self._status_masks[key] = mask
+        return self._status_masks[key]
+
+    def _get_mask_of_statuses_with(self, ** properties):
+        def create_mask():
+            lut = self.statuses.get_property_lut(** properties)
+            return self.status_timeline.get_lut_values(lut)
+
+        key = ("properties",) + tuple(sorted(properties.items()))
+        return self._get_cached_status_mask(key, create_mask)
 
     def always_was_irrelevant(self):
-        relevant_statuses = self.statuses.that_have_properties(relevant=True, done=False)
-        codes = self.statuses.get_ints(relevant_statuses)
-        relevant_mask = self.status_timeline.get_value_mask(codes[0])
-        for code in codes[1:]:
-            relevant_mask |= self.status_timeline.get_value_mask(code)
-        if sum(relevant_mask):
+        relevant_mask = self._get_mask_of_statuses_with(relevant=True, done=False)
+        if relevant_mask.any():
             return False
         return True
 
     def get_last_point_value(self):
         nonzero_mask = np.logical_not(self.points_timeline.get_value_mask(0))
-        if sum(nonzero_mask) == 0:
+        if not nonzero_mask.any():
             return 0
         ret = self.points_timeline.get_masked_values(nonzero_mask)[-1]
-        return ret
+        return float(ret)
 
     def get_status_at(self, when):
         index = self.status_timeline.value_at(when)
@@ -94,12 +130,15 @@ class Progress:
         self.status_timeline.set_value_at(when, self.statuses.int(status))
 
     def status_is(self, status: str):
-        status_int = self.statuses.int(status)
-        return self.status_timeline.get_value_mask(status_int)
+        def create_mask():
+            status_int = self.statuses.int(status)
+            return self.status_timeline.get_value_mask(status_int)
+
+        return self._get_cached_status_mask(("name", status), create_mask)
 
     def points_of_status(self, status):
         mask = self.status_is(status)
-        return self.points_timeline.get_masked_values(mask)
+        return self.points_timeline.get_masked_values(mask).astype(float)
 
     def fill_history_from(self, when):
         init_event = data.Event("", "points", when)
@@ -123,16 +162,16 @@ class Progress:
             elif latest_at < self.end:
                 deadline_index = days_between(self.start, latest_at)
                 relevant_slice = slice(0, deadline_index + 1)
-        done_mask = self.status_timeline.get_value_mask(self.statuses.int("done"))[relevant_slice]
-        task_done = done_mask.sum() > 0
+        done_mask = self.status_is("done")[relevant_slice]
+        task_done = done_mask.any()
         return task_done
 
     def points_completed(self, before=None):
         if not self.is_done(before):
             return 0
-        done_mask = self.status_timeline.get_value_mask(self.statuses.int("done"))
+        done_mask = self.status_is("done")
         task_points = self.points_timeline.get_masked_values(done_mask)[-1]
-        return task_points
+        return float(task_points)
 
     @property
     def average_daily_velocity(self):
@@ -140,12 +179,16 @@ class Progress:
         time_taken = in_progress_mask.sum() or 1
         return self.points_completed() / time_taken
 
+    def get_index_of_completion(self):
+        done_mask = self.status_is("done")
+        if not done_mask.any():
+            return None
+        return int(np.argmax(done_mask))
+
     def get_day_of_completion(self):
-        done_mask = self.status_timeline.get_value_mask(self.statuses.int("done"))
-        if done_mask.sum() == 0:
+        days_from_start_to_completion = self.get_index_of_completion()
+        if days_from_start_to_completion is None:
             return None
-        indices = np.arange(len(done_mask))
-        days_from_start_to_completion = indices[done_mask][0]
         return self.start + ONE_DAY * days_from_start_to_completion
 
     def get_plan_array(self):
@@ -155,16 +198,11 @@ class Progress:
         return self.remainder_timeline.get_array() * points_multiplier
 
     def _get_value_mask_of_in_progress(self):
-        relevant_statuses = self.statuses.that_have_properties(relevant=True, wip=True)
-        codes = self.statuses.get_ints(relevant_statuses)
-        relevant_mask = self.status_timeline.get_value_mask(codes[0])
-        for code in codes[1:]:
-            relevant_mask |= self.status_timeline.get_value_mask(code)
-        return relevant_mask
+        return self._get_mask_of_statuses_with(relevant=True, wip=True)
 
     def get_velocity_array(self):
         if not self.is_done():
-            return self.status_timeline.get_value_mask(self.statuses.int("done")).astype(float)
+            return self.status_is("done").astype(float)
         velocity_array = self._get_value_mask_of_in_progress().astype(float)
         if velocity_array.sum() == 0:
             index_of_completion = days_between(self.start, self.get_day_of_completion())
@@ -191,14 +229,17 @@ class Progress:
         ret.value_after = self.statuses.int(status_event.value_after)
         return ret
 
-    def process_events_by_type(self, events_by_type: typing.Mapping[str, typing.List[data.Event]]):
-        TYPES_TO_TIMELINE = {
+    def _get_timelines_by_event_type(self):
+        return {
             "time": self.time_timeline,
             "points": self.points_timeline,
             "state": self.status_timeline,
             "project": self.relevancy_timeline,
         }
 
+    def process_events_by_type(self, events_by_type: typing.Mapping[str, typing.List[data.Event]]):
+        TYPES_TO_TIMELINE = self._get_timelines_by_event_type()
+
         int_status_events = list()
         for status_event in events_by_type.get("state", frozenset()):
             int_evt = self._create_int_status_event(status_event)
@@ -209,3 +250,25 @@ class Progress:
             events = events_by_type.get(event_type, [])
             events = self._extract_time_relevant_events(events)
             tline.process_events(events)
+
+    def _create_int_status_columns(self, columns: data.EventColumns):
+        values = set(columns.values_before.tolist()) | set(columns.values_after.tolist())
+        ints = {value: self.statuses.int(value) for value in values}
+        return dataclasses.replace(
+            columns,
+            values_before=np.array([ints[v] for v in columns.values_before.tolist()], dtype=int),
+            values_after=np.array([ints[v] for v in columns.values_after.tolist()], dtype=int))
+
+    def process_event_columns_by_type(self, columns_by_type: typing.Mapping[str, data.EventColumns]):
+        """
+        Process events like process_events_by_type does, given columns of events instead of lists.
+        """
+        start = np.datetime64(self.start, "us")
+        end = np.datetime64(self.end, "us")
+        for event_type, tline in self._get_timelines_by_event_type().items():
+            if (columns := columns_by_type.get(event_type)) is None:
+                continue
+            if event_type == "state":
+                columns = self._create_int_status_columns(columns)
+            columns = columns.select((start <= columns.times) & (columns.times <= end))
+            tline.process_event_columns(columns)
@@ -1,3 +1,4 @@
+import bisect
 import datetime
 import typing
 
@@ -10,19 +11,40 @@ class Timeline:
     _data: np.array
     start: datetime.datetime
     end: datetime.datetime
+    # Incremented on every modification, so derived data can be cached
+    version: int
 
-    def __init__(self, start: datetime.datetime, end: datetime.datetime):
+    def __init__(self, start: datetime.datetime, end: datetime.datetime, dtype=float):
         self.start = start
         self.end = end
         period = end - start
-        self._data = np.zeros(period.days + 1)
+        self._data = np.zeros(period.days + 1, dtype=dtype)
+        self.version = 0
 
     def _localize_date(self, date: datetime.datetime) -> int:
         return (date - self.start).days
 
-    def recreate_with_value(self, value, dtype=float):
+    def _localize_times(self, times: np.ndarray) -> np.ndarray:
+        return (times - np.datetime64(self.start, "us")) // np.timedelta64(1, "D")
+
+    def _get_event_indices(self, columns: data.EventColumns) -> np.ndarray:
+        indices = self._localize_times(columns.times)
+        if ((indices < 0) | (indices >= self.days)).any():
+            msg = "Event outside of the timeline"
+            raise ValueError(msg)
+        return indices
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    def recreate_with_value(self, value, dtype=None):
+        """
+        Set all days to the value, optionally changing the type of values.
+        """
         self._data = np.empty_like(self._data, dtype=dtype)
         self._data[:] = value
+        self.version += 1
 
     def set_gradient_values(self,
                             start: datetime.datetime, start_value: float,
@@ -49,6 +71,7 @@ class Timeline:
         end_index = self._localize_date(end) + 1
         values = np.linspace(start_value, end_value, end_index - start_index)
         self._data[start_index:end_index] = values
+        self.version += 1
         self.set_value_at(start, start_value)
         self.set_value_at(end, end_value)
 
@@ -62,6 +85,7 @@ class Timeline:
     def process_events(self, events: typing.Iterable[data.Event]):
         if not events:
             return
+        self.version += 1
         events_from_oldest = sorted(events, key=lambda x: x.time)
         events_from_newest = events_from_oldest[::-1]
         newest_event = events_from_newest[0]
@@ -82,9 +106,27 @@ class Timeline:
             for i, e in zip(indices_from_oldest, events_from_oldest):
                 self._data[i] = e.value_before
 
+    def process_event_columns(self, columns: data.EventColumns):
+        """
+        Process chronologically ordered events like process_events does, without iterating over them.
+        """
+        if not len(columns):
+            return
+        self.version += 1
+        indices = self._get_event_indices(columns)
+        if (filler_value := columns.get_last_value_after()) is not None:
+            self._data[:] = filler_value
+        # Days before an event have the value before the earliest event that follows them
+        following_events = np.searchsorted(indices, np.arange(indices[-1]), side="right")
+        values_before = columns.values_before
+        if values_before.dtype == object:
+            values_before = np.array(values_before.tolist(), dtype=self._data.dtype)
+        self._data[:indices[-1]] = values_before[following_events]
+
     def set_value_at(self, time: datetime.datetime, value):
         index = self._localize_date(time)
         self._data[index] = value
+        self.version += 1
 
     def value_at(self, time: datetime.datetime):
         index = self._localize_date(time)
@@ -93,5 +135,187 @@ class Timeline:
     def get_value_mask(self, value) -> np.ndarray:
         return self._data == value
 
+    def get_lut_values(self, lut: np.ndarray) -> np.ndarray:
+        """
+        Map every value of the timeline through a lookup table indexed by values.
+        """
+        return lut[self._data.astype(int, copy=False)]
+
     def get_masked_values(self, mask) -> np.ndarray:
         return self._data[mask]
+
+
+class RunLengthTimeline(Timeline):
+    """
+    Timeline that stores segments of days instead of individual days.
+
+    Values of timelines are constant between events, except of linear segments of plans,
+    so a segment is given by the index of its first day, a value and a slope.
+    The value of a day is the segment value plus the slope times distance of the day from the segment origin,
+    which is the first day of the linear segment the segment has been split from.
+    Segments are expanded to values of individual days only when arrays of values are requested.
+    """
+    _starts: typing.List[int]
+    _values: typing.List[float]
+    _slopes: typing.List[float]
+    _origins: typing.List[int]
+
+    def __init__(self, start: datetime.datetime, end: datetime.datetime, dtype=float):
+        self.start = start
+        self.end = end
+        self._days = (end - start).days + 1
+        self.version = 0
+        self._lengths_version = None
+        self.recreate_with_value(0, dtype)
+
+    @property
+    def days(self) -> int:
+        return self._days
+
+    def _get_index(self, time: datetime.datetime) -> int:
+        index = self._localize_date(time)
+        # Out-of-range indices behave like indexing of an array of days
+        if not - self._days <= index < self._days:
+            msg = f"Index {index} is out of bounds of a timeline of {self._days} days"
+            raise IndexError(msg)
+        return index % self._days
+
+    def _get_segment_value(self, segment, index):
+        return self._values[segment] + self._slopes[segment] * (index - self._origins[segment])
+
+    def _is_constant(self, segment, value):
+        return self._slopes[segment] == 0 and self._values[segment] == value
+
+    def _assign(self, first, last, value, slope=0.0):
+        """
+        Replace values of days first..last - 1 by a segment.
+        """
+        # Values are converted like they are when assigned to float arrays
+        value = float(np.array(value, dtype=float))
+        first_segment = bisect.bisect_left(self._starts, first)
+        following_segment = bisect.bisect_left(self._starts, last)
+
+        starts = []
+        values = []
+        slopes = []
+        origins = []
+        if not (first_segment > 0 and slope == 0 and self._is_constant(first_segment - 1, value)):
+            starts.append(first)
+            values.append(value)
+            slopes.append(slope)
+            origins.append(first)
+
+        if last < self._days and (following_segment == len(self._starts) or self._starts[following_segment] != last):
+            # The segment that covers the last day continues after the assigned segment,
+            # keeping its origin, so its values don't accumulate rounding errors
+            segment = following_segment - 1
+            if not (slope == 0 and self._is_constant(segment, value)):
+                starts.append(last)
+                values.append(self._values[segment])
+                slopes.append(self._slopes[segment])
+                origins.append(self._origins[segment])
+        elif following_segment < len(self._starts) and slope == 0 and self._is_constant(following_segment, value):
+            following_segment += 1
+
+        self._starts[first_segment:following_segment] = starts
+        self._values[first_segment:following_segment] = values
+        self._slopes[first_segment:following_segment] = slopes
+        self._origins[first_segment:following_segment] = origins
+        self.version += 1
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    def recreate_with_value(self, value, dtype=None):
+        if dtype is not None:
+            self._dtype = np.dtype(dtype)
+        self._starts = [0]
+        self._values = [float(np.array(value, dtype=float))]
+        self._slopes = [0.0]
+        self._origins = [0]
+        self.version += 1
+
+    def _set_safe_gradient_values(self,
+                                  start: datetime.datetime, start_value: float,
+                                  end: datetime.datetime, end_value: float):
+        start_index = self._localize_date(start)
+        end_index = self._localize_date(end) + 1
+        steps = end_index - start_index - 1
+        slope = (end_value - start_value) / steps if steps > 0 else 0.0
+        self._assign(start_index, end_index, start_value, slope)
+        self.set_value_at(start, start_value)
+        self.set_value_at(end, end_value)
+
+    def _is_piecewise_constant(self):
+        return not any(self._slopes)
+
+    def _get_lengths(self):
+        if self._lengths_version != self.version:
+            self._lengths = np.diff(np.array(self._starts + [self._days]))
+            self._lengths_version = self.version
+        return self._lengths
+
+    def _expand(self, segment_values):
+        return np.repeat(segment_values, self._get_lengths())
+
+    def get_array(self) -> np.ndarray:
+        ret = self._expand(np.array(self._values))
+        if not self._is_piecewise_constant():
+            offsets = np.arange(self._days) - self._expand(self._origins)
+            ret += self._expand(self._slopes) * offsets
+        return ret.astype(self._dtype, copy=False)
+
+    def process_events(self, events: typing.Iterable[data.Event]):
+        if not events:
+            return
+        events_from_newest = sorted(events, key=lambda x: x.time)[::-1]
+        indices_from_newest = [self._localize_date(e.time) for e in events_from_newest]
+        for index in indices_from_newest:
+            if not 0 <= index < self._days:
+                msg = "Event outside of the timeline"
+                raise ValueError(msg)
+
+        if (filler_value := events_from_newest[0].value_after) is not None:
+            self._assign(0, self._days, filler_value)
+        # Older events overwrite the beginning of the timeline up to their day
+        for index, e in zip(indices_from_newest, events_from_newest):
+            if index > 0:
+                self._assign(0, index, e.value_before)
+        self.version += 1
+
+    def process_event_columns(self, columns: data.EventColumns):
+        if not len(columns):
+            return
+        indices = self._get_event_indices(columns)
+        if (filler_value := columns.get_last_value_after()) is not None:
+            self._assign(0, self._days, filler_value)
+        for index, value in zip(indices[::-1].tolist(), columns.values_before[::-1].tolist()):
+            if index > 0:
+                self._assign(0, index, value)
+        self.version += 1
+
+    def set_value_at(self, time: datetime.datetime, value):
+        index = self._get_index(time)
+        self._assign(index, index + 1, value)
+
+    def value_at(self, time: datetime.datetime):
+        index = self._get_index(time)
+        segment = bisect.bisect_right(self._starts, index) - 1
+        return self._dtype.type(self._get_segment_value(segment, index))
+
+    def _get_typed_values(self):
+        return np.array(self._values).astype(self._dtype, copy=False)
+
+    def get_value_mask(self, value) -> np.ndarray:
+        if not self._is_piecewise_constant():
+            return self.get_array() == value
+        return self._expand(self._get_typed_values() == value)
+
+    def get_lut_values(self, lut: np.ndarray) -> np.ndarray:
+        if not self._is_piecewise_constant():
+            return lut[self.get_array().astype(int, copy=False)]
+        return self._expand(lut[self._get_typed_values().astype(int, copy=False)])
+
+    def get_masked_values(self, mask) -> np.ndarray:
+        return self.get_array()[mask]
@@ -57,14 +57,25 @@ class IniAppdata(persistence.ini.IniSaver, persistence.ini.IniLoader):
             plugins=self.META.get("plugins_csv", ""),
         )
 
-    def save(self):
+    def _get_data_to_save(self):
         to_save = dict()
         self._save_retrospective_period(to_save)
         self._save_quarters(to_save)
         self._save_metadata(to_save)
+        return to_save
 
-        with self._manipulate_existing_file(self.CONFIG_FILENAME) as config:
-            config.update(to_save)
+    def save(self):
+        to_save = self._get_data_to_save()
+        self._modify_existing_file(self.CONFIG_FILENAME, lambda config: config.update(to_save))
+
+    def is_stored_completely(self):
+        """
+        Tell whether the config file contains all values that saving would write to it.
+        """
+        config = self._load_existing_file(self.CONFIG_FILENAME)
+        return all(
+            config.has_option(section, option)
+            for section, options in self._get_data_to_save().items() for option in options)
 
     def _load_retrospective_period(self, config):
         start = config.get("RETROSPECTIVE_PERIOD", "start", fallback=None)
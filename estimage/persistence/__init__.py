@@ -3,14 +3,25 @@ import collections
 
 LOADERS = collections.defaultdict(dict)
 SAVERS = collections.defaultdict(dict)
+# Composed IO classes bound to files, by (class, format, filename)
+IO_CLASSES = dict()
+
+
+def forget_io_classes():
+    """
+    Forget composed IO classes, to be called whenever LOADERS or SAVERS change.
+    """
+    IO_CLASSES.clear()
 
 
 def register_loader_of(loaded, backend, loader):
     LOADERS[loaded][backend] = loader
+    forget_io_classes()
 
 
 def register_saver_of(saved, backend, saver):
     SAVERS[saved][backend] = saver
+    forget_io_classes()
 
 
 def multiloader_of(loaded, backends):
@@ -43,7 +54,7 @@ def saver_of(saved, backend):
     return decorator
 
 
-def get_persistence(cls, io_format):
+def _check_persistence(cls, io_format):
     if cls not in LOADERS:
         msg = f"Unknown class to load: '{cls}'"
         raise RuntimeError(msg)
@@ -58,6 +69,29 @@ def get_persistence(cls, io_format):
         msg = f"Unknown format to save '{cls}' with: '{io_format}'"
         raise RuntimeError(msg)
 
+
+def stem_to_filename(cls, io_format, stem):
+    _check_persistence(cls, io_format)
+    return LOADERS[cls][io_format].stem_to_filename(stem)
+
+
+def _compose_io_class(cls, io_format, attributes):
+    _check_persistence(cls, io_format)
     io_name = f"{cls.__name__}__{io_format}__{io_format}"
-    io_class = type(io_name, (SAVERS[cls][io_format], LOADERS[cls][io_format]), dict())
-    return io_class
+    return type(io_name, (SAVERS[cls][io_format], LOADERS[cls][io_format]), attributes)
+
+
+def get_persistence(cls, io_format, filename=None):
+    """
+    Return a class that saves and loads instances of cls in the io_format.
+
+    Without a filename, every call returns a new class, which the caller can configure.
+    Classes bound to a filename are shared, so they are created only once.
+    """
+    if filename is None:
+        return _compose_io_class(cls, io_format, dict())
+    key = (cls, io_format, str(filename))
+    if key not in IO_CLASSES:
+        attributes = dict(LOAD_FILENAME=filename, SAVE_FILENAME=filename)
+        IO_CLASSES[key] = _compose_io_class(cls, io_format, attributes)
+    return IO_CLASSES[key]
@@ -1,6 +1,11 @@
 import abc
 import collections
 import contextlib
+import os
+import shutil
+import tempfile
+
+from . import batch, locking
 
 
 class Loader(abc.ABC):
@@ -37,6 +42,28 @@ class Loader(abc.ABC):
         return self._loaded_data[storage_key].get(attribute, fallback)
 
 
+@contextlib.contextmanager
+def replacing_file(filename, mode="w"):
+    """
+    Yield a temporary file that replaces the file once it is written completely,
+    so readers see either the old, or the new contents of the file.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    with tempfile.NamedTemporaryFile(mode, dir=directory, delete=False) as f:
+        try:
+            yield f
+        except BaseException:
+            f.close()
+            os.unlink(f.name)
+            raise
+    # Temporary files are private, unlike files they replace
+    if os.path.exists(filename):
+        shutil.copymode(filename, f.name)
+    else:
+        os.chmod(f.name, 0o644)
+    os.replace(f.name, filename)
+
+
 class FileBased:
     @classmethod
     def stem_to_filename(cls, stem):
@@ -55,8 +82,19 @@ class FileBasedLoader(Loader, FileBased):
             raise RuntimeError(msg)
         return self._loaded_data.get(item_id, attribute_id, fallback=fallback)
 
-    @abc.abstractclassmethod
+    @classmethod
     def _load_existing_file(cls, filename):
+        contents = batch.get_pending_contents(filename)
+        if contents is None:
+            with locking.shared_lock(filename):
+                contents = cls._read_file(filename)
+        return contents
+
+    @abc.abstractclassmethod
+    def _read_file(cls, filename):
+        """
+        Return contents of the file, or empty contents if the file doesn't exist
+        """
         raise NotImplementedError()
 
     def load(self):
@@ -104,13 +142,11 @@ class FileBasedSaver(Saver):
         self.save_filename = None
 
     def save(self):
-        with self._manipulate_existing_file(self.SAVE_FILENAME) as data_in_dict:
-            self._update_existing_data_with_fresh(data_in_dict)
+        self._modify_existing_file(self.SAVE_FILENAME, self._update_existing_data_with_fresh)
 
     @classmethod
     def forget_all(cls):
-        with cls._manipulate_existing_file(cls.SAVE_FILENAME) as data_in_dict:
-            data_in_dict.clear()
+        cls._modify_existing_file(cls.SAVE_FILENAME, lambda data_in_dict: data_in_dict.clear())
 
     def _update_existing_data_with_fresh(self, all_data_to_save):
         for name, data_to_save in self._data_to_save.items():
@@ -120,6 +156,18 @@ class FileBasedSaver(Saver):
         for name in self._data_to_forget:
             all_data_to_save.pop(name, None)
 
+    @classmethod
+    def _modify_existing_file(cls, filename, modify):
+        """
+        Apply the modify function to contents of the file, and write them.
+
+        In a batch of writes, the file is written when the batch is flushed.
+        """
+        # The directory of the file is created when the file is first saved,
+        # before the file is locked, so that also the first save is locked
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        batch.modify_file(filename, modify, cls._read_file, cls._write_file)
+
     @abc.abstractclassmethod
-    def _manipulate_existing_file(cls):
+    def _write_file(cls, filename, contents):
         raise NotImplementedError()
@@ -0,0 +1,146 @@
+"""
+Batches of writes to files, so that a file that is saved many times is written only once.
+
+While a batch is in progress, modifications of a file are applied to its contents in memory,
+which loaders get instead of the file, and the file is written when the batch is flushed.
+The batch remembers modifications, so if the file was changed by someone else in the meantime,
+they are applied again to its current contents instead of overwriting them.
+
+Batches are specific to the thread that begins them.
+"""
+import contextlib
+import dataclasses
+import os
+import threading
+import typing
+
+from . import locking
+
+
+_STATE = threading.local()
+
+
+@dataclasses.dataclass
+class PendingWrite:
+    contents: typing.Any
+    read: typing.Callable
+    write: typing.Callable
+    signature: typing.Any
+    modifications: typing.List[typing.Callable] = dataclasses.field(default_factory=list)
+
+
+def _get_file_signature(filename):
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _get_key(filename):
+    return os.path.abspath(filename)
+
+
+def _get_pending_writes():
+    return getattr(_STATE, "pending_writes", None)
+
+
+def is_in_progress():
+    return _get_pending_writes() is not None
+
+
+def begin():
+    """
+    Begin a batch, or join the batch that is in progress.
+    """
+    if not is_in_progress():
+        _STATE.pending_writes = dict()
+        _STATE.depth = 0
+    _STATE.depth += 1
+
+
+def end():
+    """
+    End a batch, which is flushed if it isn't a part of an enclosing batch.
+    """
+    if not is_in_progress():
+        msg = "There is no batch of writes to end."
+        raise RuntimeError(msg)
+    _STATE.depth -= 1
+    if _STATE.depth > 0:
+        return
+    try:
+        flush()
+    finally:
+        _STATE.pending_writes = None
+
+
+@contextlib.contextmanager
+def write_batch():
+    begin()
+    try:
+        yield
+    finally:
+        end()
+
+
+def flush():
+    """
+    Write files that were modified in the batch that is in progress.
+    """
+    pending_writes = _get_pending_writes()
+    if not pending_writes:
+        return
+    for filename in list(pending_writes):
+        _write_pending(filename, pending_writes.pop(filename))
+
+
+def _write_pending(filename, pending):
+    with locking.exclusive_lock(filename):
+        contents = pending.contents
+        if _get_file_signature(filename) != pending.signature:
+            contents = pending.read(filename)
+            for modify in pending.modifications:
+                modify(contents)
+        pending.write(filename, contents)
+
+
+def get_pending_contents(filename):
+    """
+    Return contents of the file that wait to be written, or None if there are none.
+    """
+    pending_writes = _get_pending_writes()
+    if not pending_writes:
+        return None
+    pending = pending_writes.get(_get_key(filename))
+    if pending is None:
+        return None
+    return pending.contents
+
+
+def modify_file(filename, modify, read, write):
+    """
+    Apply the modify function to contents of the file, which are read and written using the supplied functions.
+
+    Outside of a batch, the file is written right away.
+    The file is locked from reading to writing, so concurrent modifications don't overwrite each other.
+    """
+    pending_writes = _get_pending_writes()
+    if pending_writes is None:
+        with locking.exclusive_lock(filename):
+            contents = read(filename)
+            try:
+                modify(contents)
+            finally:
+                write(filename, contents)
+        return
+
+    key = _get_key(filename)
+    if key not in pending_writes:
+        with locking.shared_lock(filename):
+            signature = _get_file_signature(filename)
+            contents = read(filename)
+        pending_writes[key] = PendingWrite(contents, read, write, signature)
+    pending = pending_writes[key]
+    modify(pending.contents)
+    pending.modifications.append(modify)
@@ -1,6 +1,7 @@
 import collections
 import contextlib
 import abc
+import sys
 import typing
 
 from ... import data
@@ -20,8 +21,8 @@ class CardLoader(abstract.Loader):
         if name in self._card_cache:
             c = self._card_cache[name]
         else:
-            c = item.__class__(name)
-            self._card_cache[name] = c
+            c = item.__class__(sys.intern(name))
+            self._card_cache[c.name] = c
             c.load_data_by_loader(self)
         return c
 
@@ -41,22 +42,28 @@ class CardLoader(abstract.Loader):
     def _get_all_loaded_card_names(self):
         return set(self._loaded_data.keys())
 
+    @staticmethod
+    def _intern_strings(strings):
+        # Many cards share collaborators and tags, interning lets them share the string objects too
+        return type(strings)(sys.intern(s) for s in strings)
+
     @classmethod
     def get_loaded_cards_by_id(cls, card_class=data.BaseCard):
         ret = dict()
         with cls.get_loader_of(card_class) as loader:
             card_names = loader._get_all_loaded_card_names()
             for name in card_names:
-                card = card_class(name)
+                card = card_class(sys.intern(name))
                 card.load_data_by_loader(loader)
                 ret[name] = card
+        data.CardFamilyIndex(ret.values())
         return ret
 
     def load_basic_metadata(self, t):
         t.title = self._get_our(t, "title")
         t.description = self._get_our(t, "description")
         t.point_cost = float(self._get_our(t, "point_cost"))
-        t.assignee = self._get_our(t, "assignee")
+        t.assignee = sys.intern(self._get_our(t, "assignee"))
         t.priority = float(self._get_our(t, "priority"))
         t.tier = int(self._get_our(t, "tier"))
 
@@ -7,6 +7,7 @@ from . import abstract
 
 
 @persistence.loader_of(data.BaseCard, "ini")
+@persistence.loader_of(data.SlottedBaseCard, "ini")
 class IniCardLoader(abstract.CardLoader, persistence.ini.IniLoader):
     def __init__(self, ** kwargs):
         super().__init__(** kwargs)
@@ -17,8 +18,8 @@ class IniCardLoader(abstract.CardLoader, persistence.ini.IniLoader):
 
     def load_basic_metadata(self, t):
         super().load_basic_metadata(t)
-        t.collaborators = self._unpack_list(self._get_our(t, "collaborators", ""))
-        t.tags = self._unpack_list(self._get_our(t, "tags", ""))
+        t.collaborators = self._intern_strings(self._unpack_list(self._get_our(t, "collaborators", "")))
+        t.tags = self._intern_strings(self._unpack_list(self._get_our(t, "tags", "")))
 
     def _load_list_of_cards_from_entry(self, t, entry_name):
         entry_contents = self._get_our(t, entry_name, "")
@@ -64,6 +65,7 @@ class IniCardLoader(abstract.CardLoader, persistence.ini.IniLoader):
 
 
 @persistence.saver_of(data.BaseCard, "ini")
+@persistence.saver_of(data.SlottedBaseCard, "ini")
 class IniCardSaver(abstract.CardSaver, persistence.ini.IniSaver, IniCardLoader):
     def save_basic_metadata(self, t):
         self._store_our(t, "title")
@@ -7,6 +7,7 @@ from ...persistence import memory
 
 
 @persistence.saver_of(data.BaseCard, "memory")
+@persistence.saver_of(data.SlottedBaseCard, "memory")
 class MemoryCardSaver(memory.MemSaver, abstract.CardSaver):
     def save_basic_metadata(self, t):
         self._store_our(t, "title")
@@ -33,6 +34,7 @@ class MemoryCardSaver(memory.MemSaver, abstract.CardSaver):
 
 
 @persistence.loader_of(data.BaseCard, "memory")
+@persistence.loader_of(data.SlottedBaseCard, "memory")
 class MemoryCardLoader(memory.MemLoader, abstract.CardLoader):
     def load_basic_metadata(self, t):
         t.title = self._get_our(t, "title")
@@ -8,12 +8,13 @@ from . import abstract
 
 
 @persistence.loader_of(data.BaseCard, "toml")
+@persistence.loader_of(data.SlottedBaseCard, "toml")
 class TomlCardLoader(abstract.CardLoader, toml.TomlLoader):
     def load_basic_metadata(self, t):
         super().load_basic_metadata(t)
-        t.collaborators = self._get_our(t, "collaborators")
+        t.collaborators = self._intern_strings(self._get_our(t, "collaborators"))
         t.priority = float(self._get_our(t, "priority"))
-        t.tags = self._get_our(t, "tags")
+        t.tags = self._intern_strings(self._get_our(t, "tags"))
 
     def _load_list_of_cards_from_entry(self, t, entry_name):
         ret = []
@@ -56,6 +57,7 @@ class TomlCardLoader(abstract.CardLoader, toml.TomlLoader):
 
 
 @persistence.saver_of(data.BaseCard, "toml")
+@persistence.saver_of(data.SlottedBaseCard, "toml")
 class TomlCardSaver(abstract.CardSaver, toml.TomlSaver, TomlCardLoader):
     def save_basic_metadata(self, t):
         self._store_our(t, "title")
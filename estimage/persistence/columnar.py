@@ -0,0 +1,97 @@
+import json
+import struct
+
+import numpy as np
+
+from . import abstract
+
+
+# A file starts with the magic, followed by the length and contents of a JSON header,
+# which holds tables of strings and positions of columns - blocks of numbers that follow it.
+MAGIC = b"ESTIMAGE-COLUMNS-1\n"
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_columns(filename, contents):
+    """
+    Write a mapping of names to numeric arrays, which become columns, or to lists of strings, which become tables.
+
+    The file is replaced at once, so loaders don't see it half-written,
+    and columns that are memory-mapped from the previous version stay intact.
+    """
+    columns = {name: np.ascontiguousarray(value) for name, value in contents.items() if isinstance(value, np.ndarray)}
+    tables = {name: list(value) for name, value in contents.items() if not isinstance(value, np.ndarray)}
+    header = dict(tables=tables, columns=dict())
+    offset = 0
+    for name, column in columns.items():
+        if column.dtype.hasobject or column.ndim != 1:
+            msg = f"Column '{name}' has to be a one-dimensional array of numbers."
+            raise ValueError(msg)
+        header["columns"][name] = dict(dtype=column.dtype.str, length=len(column), offset=offset)
+        offset = _align(offset + column.nbytes)
+    header_bytes = json.dumps(header).encode()
+    preamble = MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes
+
+    with abstract.replacing_file(filename, "wb") as f:
+        f.write(preamble.ljust(_align(len(preamble)), b"\0"))
+        for column in columns.values():
+            f.write(column.tobytes().ljust(_align(column.nbytes), b"\0"))
+
+
+def read_columns(filename):
+    """
+    Read contents written by write_columns, with columns memory-mapped from the file.
+    """
+    with open(filename, "rb") as f:
+        magic = f.read(len(MAGIC))
+        if not magic:
+            return dict()
+        if magic != MAGIC:
+            msg = f"File '{filename}' doesn't contain columns."
+            raise ValueError(msg)
+        header_length, = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_length))
+    data_start = _align(len(MAGIC) + 8 + header_length)
+
+    ret = dict(header["tables"])
+    for name, column in header["columns"].items():
+        dtype = np.dtype(column["dtype"])
+        if column["length"] == 0:
+            ret[name] = np.empty(0, dtype=dtype)
+            continue
+        ret[name] = np.memmap(
+            filename, dtype=dtype, mode="r", offset=data_start + column["offset"], shape=(column["length"],))
+    return ret
+
+
+def _read_existing_file(filename):
+    try:
+        return read_columns(filename)
+    except FileNotFoundError:
+        return dict()
+
+
+class ColumnarBased(abstract.FileBased):
+    @classmethod
+    def stem_to_filename(cls, stem):
+        return f"{stem}.columns"
+
+
+class ColumnarLoader(abstract.FileBasedLoader, ColumnarBased):
+    @classmethod
+    def _read_file(cls, filename):
+        return _read_existing_file(filename)
+
+
+class ColumnarSaver(abstract.FileBasedSaver, ColumnarBased):
+    @classmethod
+    def _read_file(cls, filename):
+        return _read_existing_file(filename)
+
+    @classmethod
+    def _write_file(cls, filename, contents):
+        write_columns(filename, contents)
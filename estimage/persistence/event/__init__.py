@@ -29,3 +29,6 @@ class MemEventsSaver(abstract.EventSaver, persistence.memory.MemSaver):
 @persistence.loader_of(data.Event, "memory")
 class MemEventsLoader(abstract.EventLoader, persistence.memory.MemLoader):
     pass
+
+
+from . import columnar
@@ -1,8 +1,11 @@
 import abc
 import collections
 import datetime
+import sys
 import typing
 
+import numpy as np
+
 from ... import data
 from ...entities import status
 from .. import abstract
@@ -10,44 +13,143 @@ from .. import abstract
 
 class EventLoader(abstract.Loader):
     WHAT_IS_THIS = "event"
+    EVENT_CLASS = data.Event
+    # Quantities whose values are numbers
+    NUMERIC_QUANTITIES = ("points", "project")
+
     def __init__(self, ** kwargs):
         super().__init__(** kwargs)
-        self._subject_to_events = collections.defaultdict(list)
+        self._subject_to_events = None
+
+    def load(self):
+        # Events are decoded from loaded data only once they are requested
+        self._loaded_data = super().load()
+        self._subject_to_events = None
+        return self._loaded_data
 
     def load_events_by_subject(self):
+        if self._subject_to_events is None:
+            self._subject_to_events = self._decode_events_by_subject()
         return self._subject_to_events
 
+    def _decode_events_by_subject(self):
+        return self._eventize_raw_event_data(self._loaded_data)
+
+    def load_event_columns_by_subject(self):
+        return self._columnize_raw_event_data(self._loaded_data)
+
     @classmethod
     def _eventize_raw_event_data(cls, data):
         ret = collections.defaultdict(list)
         for key, event_dict in data.items():
             if "-" not in key:
                 continue
-            name = key.split("-", 1)[1]
+            name = sys.intern(key.split("-", 1)[1])
             ret[name].append(cls._get_event_from_data(event_dict, name))
         return ret
 
-    def load(self):
-        ret = super().load()
-        self._subject_to_events = self._eventize_raw_event_data(ret)
+    @staticmethod
+    def _parse_times(times):
+        try:
+            return np.array(times, dtype="datetime64[us]")
+        except ValueError:
+            # Numpy doesn't know every format that datetime does
+            return np.array([datetime.datetime.fromisoformat(t) for t in times], dtype="datetime64[us]")
+
+    @classmethod
+    def _convert_values(cls, quantity, values):
+        if quantity in cls.NUMERIC_QUANTITIES:
+            return values.astype(float)
+        if quantity == "state":
+            canonical = {v: status.get_canonical_status(v) for v in set(values.tolist()) if v is not None}
+            canonical[None] = None
+            return np.array([canonical[v] for v in values.tolist()], dtype=object)
+        return values
+
+    @classmethod
+    def _create_event_columns(
+            cls, task_names, task_codes, quantity_names, quantity_codes, times, convert_values):
+        """
+        Split events given as columns into columns of events of individual tasks and quantities.
+
+        Task and quantity codes index tables of their names,
+        and convert_values returns converted values before and after of events of a quantity at given rows.
+        """
+        ret = collections.defaultdict(dict)
+        # Events of a quantity are next to each other, and events of a task within them,
+        # ordered by time, and by the order in which they were stored
+        order = np.lexsort((times, task_codes, quantity_codes))
+        quantity_bounds = np.searchsorted(quantity_codes[order], np.arange(len(quantity_names) + 1))
+
+        for code, quantity in enumerate(quantity_names):
+            rows = order[quantity_bounds[code]:quantity_bounds[code + 1]]
+            if not len(rows):
+                continue
+            quantity = sys.intern(str(quantity)) or None
+            quantity_times = times[rows]
+            quantity_values_before, quantity_values_after = convert_values(quantity, rows)
+            quantity_task_codes = task_codes[rows]
+            task_starts = np.flatnonzero(np.diff(quantity_task_codes)) + 1
+            for start, end in zip(np.r_[0, task_starts], np.r_[task_starts, len(rows)]):
+                name = sys.intern(str(task_names[quantity_task_codes[start]]))
+                ret[name][quantity] = data.EventColumns(
+                    name, quantity, quantity_times[start:end],
+                    quantity_values_before[start:end], quantity_values_after[start:end], cls.EVENT_CLASS)
         return ret
 
+    @classmethod
+    def _columnize_raw_event_data(cls, raw_data):
+        """
+        Decode stored events into columns of events of individual tasks and quantities.
+
+        Times are parsed and values converted for all events of a quantity at once,
+        so no Event objects are created.
+        """
+        names = []
+        quantities = []
+        times = []
+        values_before = []
+        values_after = []
+        for key, event_dict in raw_data.items():
+            if "-" not in key:
+                continue
+            names.append(key.split("-", 1)[1])
+            quantities.append(event_dict["quantity"])
+            times.append(event_dict["time"])
+            values_before.append(event_dict.get("value_before"))
+            values_after.append(event_dict.get("value_after"))
+        if not names:
+            return collections.defaultdict(dict)
+
+        task_names, task_codes = np.unique(np.array(names), return_inverse=True)
+        quantity_names, quantity_codes = np.unique(np.array(quantities), return_inverse=True)
+        values_before = np.array(values_before, dtype=object)
+        values_after = np.array(values_after, dtype=object)
+
+        def convert_values(quantity, rows):
+            return (
+                cls._convert_values(quantity, values_before[rows]),
+                cls._convert_values(quantity, values_after[rows]))
+
+        return cls._create_event_columns(
+            task_names, task_codes, quantity_names, quantity_codes, cls._parse_times(times), convert_values)
+
     def load_events_of(self, name):
-        return self._subject_to_events[name]
+        return self.load_events_by_subject()[name]
 
-    @staticmethod
-    def _get_event_from_data(data_dict, name):
+    @classmethod
+    def _get_event_from_data(cls, data_dict, name):
         time = datetime.datetime.fromisoformat(data_dict["time"])
-        ret = data.Event(name, data_dict["quantity"] or None, time)
+        ret = cls.EVENT_CLASS(name, sys.intern(data_dict["quantity"]) or None, time)
         if "value_before" in data_dict:
             ret.value_before = data_dict["value_before"]
-            if ret.quantity in ("points",):
+            if ret.quantity in cls.NUMERIC_QUANTITIES:
                 ret.value_before = float(ret.value_before)
             elif ret.quantity == "state":
                 ret.value_before = status.get_canonical_status(ret.value_before)
         if "value_after" in data_dict:
             ret.value_after = data_dict["value_after"]
-            if ret.quantity in ("points",):
+            if ret.quantity in cls.NUMERIC_QUANTITIES:
                 ret.value_after = float(ret.value_after)
             elif ret.quantity == "state":
                 ret.value_after = status.get_canonical_status(ret.value_after)
@@ -0,0 +1,134 @@
+import collections
+import typing
+
+import numpy as np
+
+from ... import data, persistence
+from ...persistence import columnar
+from . import abstract
+
+
+# Value codes of events that don't have the value
+MISSING = -1
+
+
+@persistence.loader_of(data.Event, "columnar")
+class ColumnarEventsLoader(abstract.EventLoader, columnar.ColumnarLoader):
+    """
+    Loads events from columns of a binary file.
+
+    The file has a column of task IDs, which index the table of task names,
+    a column of times in microseconds since the epoch, a column of quantity codes,
+    and columns of codes of values before and after, which index the table of values.
+    """
+    def load_event_columns_by_subject(self):
+        stored = self._loaded_data
+        if not len(stored.get("task_ids", ())):
+            return collections.defaultdict(dict)
+
+        # Missing values are coded as MISSING, which indexes the last value
+        values = np.array(stored["values"] + [None], dtype=object)
+
+        def convert_values(quantity, rows):
+            # Values of all quantities share the table, so only values of the quantity are converted
+            codes = np.concatenate((stored["values_before"][rows], stored["values_after"][rows]))
+            used_codes, inverse = np.unique(codes, return_inverse=True)
+            converted = self._convert_values(quantity, values[used_codes])[inverse]
+            return converted[:len(rows)], converted[len(rows):]
+
+        return self._create_event_columns(
+            stored["task_names"], stored["task_ids"], stored["quantities"], stored["quantity_codes"],
+            stored["times"].view("datetime64[us]"), convert_values)
+
+    def _decode_events_by_subject(self):
+        ret = collections.defaultdict(list)
+        for name, columns_by_type in self.load_event_columns_by_subject().items():
+            events = [evt for columns in columns_by_type.values() for evt in columns]
+            ret[name] = sorted(events, key=lambda e: e.time)
+        return ret
+
+
+@persistence.saver_of(data.Event, "columnar")
+class ColumnarEventsSaver(abstract.EventSaver, columnar.ColumnarSaver):
+    """
+    Saves events to columns of a binary file, replacing all stored events of saved subjects.
+    """
+    def __init__(self, ** kwargs):
+        super().__init__(** kwargs)
+        self._events_to_save = dict()
+
+    def _save_one_subject_events(self, subject_name: str, event_list: typing.List[data.Event]):
+        self._events_to_save[subject_name] = list(event_list)
+
+    def save(self):
+        self._modify_existing_file(self.SAVE_FILENAME, self._update_stored_events)
+
+    @staticmethod
+    def _get_value_codes(values, table):
+        return np.fromiter(
+            (MISSING if v is None else table.id_of(str(v)) for v in values), dtype=np.int32, count=len(values))
+
+    def _update_stored_events(self, stored):
+        columns = {
+            "task_ids": np.empty(0, dtype=np.int32),
+            "times": np.empty(0, dtype=np.int64),
+            "quantity_codes": np.empty(0, dtype=np.int16),
+            "values_before": np.empty(0, dtype=np.int32),
+            "values_after": np.empty(0, dtype=np.int32),
+        }
+        task_names = data.SymbolTable()
+        quantities = data.SymbolTable()
+        values = data.SymbolTable()
+        if len(stored.get("task_ids", ())):
+            columns, tables = self._get_kept_columns_and_tables(stored, columns)
+            task_names = data.SymbolTable(tables["task_names"])
+            quantities = data.SymbolTable(tables["quantities"])
+            values = data.SymbolTable(tables["values"])
+
+        events = [evt for event_list in self._events_to_save.values() for evt in event_list]
+        fresh = {
+            "task_ids": np.fromiter(
+                (task_names.id_of(name) for name, event_list in self._events_to_save.items() for _ in event_list),
+                dtype=np.int32, count=len(events)),
+            "times": np.array([e.time for e in events], dtype="datetime64[us]").view(np.int64),
+            "quantity_codes": np.fromiter(
+                (quantities.id_of(e.quantity or "") for e in events), dtype=np.int16, count=len(events)),
+            "values_before": self._get_value_codes([e.value_before for e in events], values),
+            "values_after": self._get_value_codes([e.value_after for e in events], values),
+        }
+
+        stored.clear()
+        stored.update(task_names=task_names.names, quantities=quantities.names, values=values.names)
+        for name, column in columns.items():
+            stored[name] = np.concatenate((column, fresh[name].astype(column.dtype)))
+
+    def _get_kept_columns_and_tables(self, stored, columns):
+        """
+        Return columns of stored events of subjects that are not replaced,
+        and tables of only those names and values that the kept events use, which the columns index.
+        """
+        replaced_ids = [code for code, name in enumerate(stored["task_names"]) if name in self._events_to_save]
+        kept = ~ np.isin(stored["task_ids"], replaced_ids)
+        columns = {name: np.asarray(stored[name])[kept] for name in columns}
+        tables = dict()
+        columns["task_ids"], tables["task_names"] = _compact_codes(columns["task_ids"], stored["task_names"])
+        columns["quantity_codes"], tables["quantities"] = _compact_codes(
+            columns["quantity_codes"], stored["quantities"])
+        # Values before and after share the table
+        num_kept = len(columns["values_before"])
+        value_codes, tables["values"] = _compact_codes(
+            np.concatenate((columns["values_before"], columns["values_after"])), stored["values"])
+        columns["values_before"] = value_codes[:num_kept]
+        columns["values_after"] = value_codes[num_kept:]
+        return columns, tables
+
+
+def _compact_codes(codes, table):
+    """
+    Return codes that index a table of only the used entries of the table, and that table.
+    """
+    present = codes != MISSING
+    used, inverse = np.unique(codes[present], return_inverse=True)
+    ret = np.full(len(codes), MISSING, dtype=codes.dtype)
+    ret[present] = inverse
+    return ret, [table[code] for code in used]
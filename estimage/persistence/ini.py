@@ -1,5 +1,4 @@
 import configparser
-import contextlib
 import typing
 
 from . import abstract
@@ -17,7 +16,7 @@ class IniLoader(abstract.FileBasedLoader, IniBased):
         return string_list.split(",")
 
     @classmethod
-    def _load_existing_file(cls, filename):
+    def _read_file(cls, filename):
         config = configparser.ConfigParser(interpolation=None)
         # Have keys case-sensitive: https://docs.python.org/3/library/configparser.html#id1
         config.optionxform = lambda option: option
@@ -34,11 +33,6 @@ class IniSaver(abstract.FileBasedSaver, IniBased):
         return ",".join(string_list)
 
     @classmethod
-    @contextlib.contextmanager
-    def _manipulate_existing_file(cls, filename):
-        config = cls._load_existing_file(filename)
-        try:
-            yield config
-        finally:
-            with open(filename, "w") as f:
-                config.write(f)
+    def _write_file(cls, filename, contents):
+        with abstract.replacing_file(filename) as f:
+            contents.write(f)
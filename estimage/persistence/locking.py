@@ -0,0 +1,58 @@
+"""
+Advisory locks of files, so that processes that share files don't lose each other's updates.
+
+Files are replaced by new versions when written, so locks are held on accompanying lock files,
+which stay in place.
+Locks are not reentrant, so a lock of a file can't be acquired while the same thread holds it.
+"""
+import contextlib
+import os
+
+try:
+    import fcntl
+except ImportError:
+    # Platforms without fcntl have no advisory locks, so files are not locked there
+    fcntl = None
+
+
+LOCK_SUFFIX = ".lock"
+
+
+def get_lock_filename(filename):
+    return f"{filename}{LOCK_SUFFIX}"
+
+
+@contextlib.contextmanager
+def _locked(filename, operation_name):
+    if fcntl is None:
+        yield
+        return
+    try:
+        lock_file = open(get_lock_filename(filename), "a")
+    except (FileNotFoundError, PermissionError):
+        # Nobody can write to the directory, so there is nobody to wait for
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, getattr(fcntl, operation_name))
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def shared_lock(filename):
+    """
+    Hold a lock of the file that lets others read it, but not write it.
+    """
+    # Files are replaced at once, so a file that doesn't exist yet can't be read half-written
+    if not os.path.exists(filename):
+        return contextlib.nullcontext()
+    return _locked(filename, "LOCK_SH")
+
+
+def exclusive_lock(filename):
+    """
+    Hold a lock of the file that lets nobody else read or write it.
+    """
+    return _locked(filename, "LOCK_EX")
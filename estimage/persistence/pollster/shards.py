@@ -0,0 +1,64 @@
+import pathlib
+import urllib.parse
+
+from ... import data, persistence
+
+
+# Keys of estimates of users are '<namespace>-<task name>', where the namespace is 'user-<username>-'
+USER_KEY_PREFIX = "user-"
+USER_KEY_SEPARATOR = "--"
+POINT_ATTRIBUTES = ("most_likely", "optimistic", "pessimistic")
+
+
+def user_shard_stem(username):
+    """
+    Return the stem of the file that holds estimates of the user, escaped so it is a plain filename.
+    """
+    return urllib.parse.quote(str(username), safe="")
+
+
+def get_user_shard_io(backend, directory, username, cls=data.Pollster):
+    filename = pathlib.Path(directory) / persistence.stem_to_filename(cls, backend, user_shard_stem(username))
+    return persistence.get_persistence(cls, backend, filename)
+
+
+def get_username_of_key(key):
+    if not key.startswith(USER_KEY_PREFIX):
+        return None
+    # Usernames may contain the separator, or end with a dash, unlike task names
+    username, separator, _ = key[len(USER_KEY_PREFIX):].rpartition(USER_KEY_SEPARATOR)
+    if not separator:
+        return None
+    return username
+
+
+def _group_keys_by_username(keys):
+    ret = dict()
+    for key in keys:
+        username = get_username_of_key(key)
+        if username is not None:
+            ret.setdefault(username, []).append(key)
+    return ret
+
+
+def split_user_pollster(source_io, get_shard_io):
+    """
+    Copy estimates of users from a storage shared by all users to shards of individual users.
+
+    Args:
+        source_io: Pollster IO of the shared storage, which is left as it is.
+        get_shard_io: Function that returns the pollster IO of the shard of the given user.
+
+    Returns:
+        Sorted names of users whose estimates were copied.
+    """
+    with source_io.get_loader() as loader:
+        keys_by_username = _group_keys_by_username(list(loader._loaded_data))
+        for username, keys in keys_by_username.items():
+            with get_shard_io(username).get_saver() as saver:
+                for key in keys:
+                    for attribute in POINT_ATTRIBUTES:
+                        value = loader._get_items_attribute(key, attribute)
+                        if value is not None:
+                            saver._store_item_attribute(key, attribute, value)
+    return sorted(keys_by_username)
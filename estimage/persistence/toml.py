@@ -1,4 +1,3 @@
-import contextlib
 import tomllib
 
 import tomli_w
@@ -14,7 +13,7 @@ class TomlBased(abstract.FileBased):
 
 class TomlLoader(abstract.FileBasedLoader, TomlBased):
     @classmethod
-    def _load_existing_file(cls, filename):
+    def _read_file(cls, filename):
         contents = dict()
         try:
             with open(filename, "rb") as f:
@@ -26,11 +25,6 @@ class TomlLoader(abstract.FileBasedLoader, TomlBased):
 
 class TomlSaver(abstract.FileBasedSaver, TomlBased):
     @classmethod
-    @contextlib.contextmanager
-    def _manipulate_existing_file(cls, filename):
-        config = cls._load_existing_file(filename)
-        try:
-            yield config
-        finally:
-            with open(filename, "wb") as f:
-                tomli_w.dump(config, f)
+    def _write_file(cls, filename, contents):
+        with abstract.replacing_file(filename, "wb") as f:
+            tomli_w.dump(contents, f)
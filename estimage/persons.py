@@ -42,8 +42,8 @@ class Workloads:
     cards: typing.List[data.BaseCard] = dataclasses.field(default_factory=list)
     persons_potential: typing.Dict[str, float] = dataclasses.field(
         default_factory=lambda: collections.defaultdict(lambda: 0))
-    persons_indices: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
-    cards_indices: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
+    persons_indices: data.SymbolTable = dataclasses.field(default_factory=data.SymbolTable)
+    cards_indices: data.SymbolTable = dataclasses.field(default_factory=data.SymbolTable)
     work_matrix = np.ndarray
     task_sizes = np.ndarray
 
@@ -57,8 +57,8 @@ class Workloads:
         self.cards_by_name = collections.OrderedDict()
         self.cards = cards
         self.persons_potential = dict()
-        self.persons_indices = dict()
-        self.cards_indices = dict()
+        self.persons_indices = data.SymbolTable()
+        self.cards_indices = data.SymbolTable()
         for t in cards:
             self.cards_by_name[t.name] = t
         self._card_persons_map = dict()
@@ -70,10 +70,20 @@ class Workloads:
         self._create_indices()
 
     def _create_indices(self):
-        for index, person_name in enumerate(self.persons_potential):
-            self.persons_indices[person_name] = index
-        for index, card in enumerate(self.cards):
-            self.cards_indices[card.name] = index
+        self.persons_indices = data.SymbolTable(self.persons_potential)
+        self.cards_indices = data.SymbolTable(card.name for card in self.cards)
+
+    def _get_collaboration_indices(self):
+        """
+        Return indices of persons and cards, one pair per person working on a card.
+        """
+        persons_indices = []
+        cards_indices = []
+        for card_index, card in enumerate(self.cards):
+            collaborating_group = self.get_who_works_on(card.name)
+            persons_indices.extend(self.persons_indices.ids_of(collaborating_group))
+            cards_indices.extend([card_index] * len(collaborating_group))
+        return np.array(persons_indices, dtype=int), np.array(cards_indices, dtype=int)
 
     def _fill_in_collaborators(self):
         all_collaborators = set()
@@ -103,26 +113,16 @@ class Workloads:
 
 class SimpleWorkloads(Workloads):
     def solve_problem(self):
-        for tidx, card in enumerate(self.cards):
-            if self.task_sizes[tidx] == 0:
-                continue
-            collaborating_group = self.get_who_works_on(card.name)
-            person_potentials = [self.persons_potential.get(name) for name in collaborating_group]
-            card_potential = sum(person_potentials)
-            self._solve_problem_for_card(tidx, card_potential, collaborating_group)
-
-    def _solve_problem_for_card(self, tidx, card_potential, collaborating_group):
-        for pidx, person_name in enumerate(self.persons_potential):
-            if person_name not in collaborating_group:
-                continue
-
-            own_potential = self.persons_potential[person_name]
-
-            proportion = own_potential / card_potential
-            points_contribution = self.task_sizes[tidx]
-            points_contribution *= proportion
+        persons_indices, cards_indices = self._get_collaboration_indices()
+        potentials = np.array(list(self.persons_potential.values()), dtype=float)
+        collaboration_potentials = np.zeros_like(self.work_matrix)
+        collaboration_potentials[persons_indices, cards_indices] = potentials[persons_indices]
+        cards_potentials = collaboration_potentials.sum(axis=0)
 
-            self.work_matrix[pidx, tidx] = points_contribution
+        estimated = np.logical_and(self.task_sizes != 0, cards_potentials > 0)
+        self.work_matrix[:, estimated] = (
+            collaboration_potentials[:, estimated] / cards_potentials[estimated]
+            * self.task_sizes[estimated])
 
     def of_person(self, person_name):
         ret = Workload(name=person_name)
@@ -154,11 +154,7 @@ class OptimizedWorkloads(Workloads):
     def cost_matrix(self):
         ret = np.ones((len(self.persons_potential), len(self.cards_by_name)))
         ret *= np.inf
-        for collab_idx, collab_name in enumerate(self.persons_potential):
-            for task_idx, task_name in enumerate(self.cards_by_name):
-                task_collaborators = self._card_persons_map[task_name]
-                if collab_name in task_collaborators:
-                    ret[collab_idx, task_idx] = 1
+        ret[self._get_collaboration_indices()] = 1
         return ret
 
     def solve_problem(self):
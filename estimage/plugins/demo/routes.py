@@ -31,12 +31,16 @@ def next_day():
     start_date = flask.current_app.get_config_option("RETROSPECTIVE_PERIOD")[0]
     doer = demo.Demo(start_date, retro_card_io, router.get_storage_io(), router.get_event_io())
     doer.start_if_on_start()
+    if doer.day_index == 0:
+        # Cards and events were just reset to the start of the demo
+        web_utils.updated_cards_and_events_from_tracker()
 
     form = forms.DemoForm()
     form.issues.choices = doer.get_sensible_choices()
 
     if form.validate_on_submit():
         doer.apply_work(form.progress.data, form.issues.data)
+        web_utils.updated_cards_and_events_from_tracker()
 
     form.issues.choices = doer.get_actual_choices()
 
@@ -51,4 +55,5 @@ def reset():
     reset_form = forms.ResetForm()
     if reset_form.validate_on_submit():
         demo.reset_data(router.get_storage_io(), router.get_event_io())
+        web_utils.updated_cards_and_events_from_tracker()
     return flask.redirect(web_utils.head_url_for("demo.next_day"))
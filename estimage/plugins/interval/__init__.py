@@ -19,31 +19,61 @@ DEFAULT_CV = lognorm_shape_to_c_of_v(0.26)
 
 class IntervalCard(data.BaseCard):
 
-    @classmethod
-    def create_estim_input(cls, expected, coef_of_var=DEFAULT_CV, gamma=4):
-        ret = data.EstimInput(expected)
+    @staticmethod
+    def _get_lognorm_variance_and_skewness(expected, coef_of_var):
         lognorm_shape = np.sqrt(np.log(coef_of_var ** 2 + 1))
-        lognorm_scale = expected / np.exp(lognorm_shape ** 2 / 2.0)
         lognorm_skewness = (np.exp(lognorm_shape ** 2) + 2) * np.sqrt(np.exp(lognorm_shape ** 2) - 1)
         lognorm_variance = coef_of_var ** 2 * expected ** 2
+        return lognorm_variance, lognorm_skewness
+
+    @staticmethod
+    def _get_constraint_error_message(gamma):
+        msg = (
+                "Constraints don't allow creation of such lognorm-like PERT distribution "
+                f"for PERT gamma parameter as low as {gamma}")
+        return msg
+
+    @classmethod
+    def create_estim_input(cls, expected, coef_of_var=DEFAULT_CV, gamma=4):
+        ret = data.EstimInput(expected)
+        lognorm_variance, lognorm_skewness = cls._get_lognorm_variance_and_skewness(expected, coef_of_var)
         ret.GAMMA = gamma
         o, p, m = estimate.calculate_o_p_m_ext(expected, lognorm_variance, lognorm_skewness, ret.GAMMA)
         if not o <= m <= p:
-            msg = (
-                    "Constraints don't allow creation of such lognorm-like PERT distribution "
-                    f"for PERT gamma parameter as low as {ret.GAMMA}")
-            raise ValueError(msg)
+            raise ValueError(cls._get_constraint_error_message(ret.GAMMA))
         ret.optimistic = o
         ret.most_likely = m
         ret.pessimistic = p
         return ret
 
-    def populate_taskmodel(self, result, statuses):
-        super().populate_taskmodel(result, statuses)
-        if self.point_cost:
-            expected = self.point_cost
+    @classmethod
+    def create_estimates(cls, expected, coef_of_var=DEFAULT_CV, gamma=4) -> estimate.EstimateArray:
+        """
+        Array counterpart of :meth:`create_estim_input` that returns estimates right away.
+        """
+        expected = np.asarray(expected, dtype=float)
+        lognorm_variance, lognorm_skewness = cls._get_lognorm_variance_and_skewness(expected, coef_of_var)
+        o, p, m = estimate.calculate_o_p_m_ext(expected, lognorm_variance, lognorm_skewness, gamma)
+        if not estimate.EstimateArray.triples_are_valid(m, o, p).all():
+            raise ValueError(cls._get_constraint_error_message(gamma))
+        return estimate.EstimateArray.from_triple(m, o, p, gamma)
+
+    @classmethod
+    def to_tree(cls, cards, statuses=None):
+        ret = super().to_tree(cards, statuses)
+        cls.supply_interval_estimates(ret.get_contained_elements())
+        return ret
 
-            inp = self.create_estim_input(self.point_cost)
+    @classmethod
+    def supply_interval_estimates(cls, tasks):
+        """
+        Replace exact point costs, which populate_taskmodel gives to tasks, by interval estimates.
 
-            result.point_estimate = data.Estimate.from_input(inp)
-        return result
+        Estimates of all tasks are created at once, which matters for trees of thousands of cards.
+        """
+        sized_tasks = [t for t in tasks if t.nominal_point_estimate.expected]
+        if not sized_tasks:
+            return
+        estimates = cls.create_estimates([t.nominal_point_estimate.expected for t in sized_tasks])
+        for task, estimate in zip(sized_tasks, estimates.to_estimates()):
+            task.point_estimate = estimate
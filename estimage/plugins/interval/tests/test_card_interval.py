@@ -27,6 +27,22 @@ def test_fuzzy_card():
     assert fuzzy_tree.nominal_point_estimate.sigma > 0
 
 
+def test_fuzzy_tree_matches_single_estimation():
+    parent = tm.IntervalCard("parent")
+    for i, cost in enumerate((1, 0, 2.5)):
+        child = tm.IntervalCard(f"child-{i}")
+        child.point_cost = cost
+        parent.add_element(child)
+
+    fuzzy_tree = tm.IntervalCard.to_tree([parent])
+    tasks = {t.name: t for t in fuzzy_tree.get_contained_elements()}
+    assert tasks["child-1"].nominal_point_estimate.expected == 0
+    for name, cost in (("child-0", 1), ("child-2", 2.5)):
+        single = data.Estimate.from_input(tm.IntervalCard.create_estim_input(cost))
+        assert tasks[name].nominal_point_estimate.expected == pytest.approx(single.expected)
+        assert tasks[name].nominal_point_estimate.sigma == pytest.approx(single.sigma)
+
+
 @pytest.mark.parametrize("backend", ("ini", "memory", "toml"))
 def test_card_io_children_of_correct_type(backend, temp_filename):
     parent = tm.IntervalCard("parent")
@@ -59,3 +75,16 @@ def test_estimation_properties():
     inp = card.create_estim_input(1, coef_of_var, 8)
     est = data.Estimate.from_input(inp)
     assert est.sigma / est.expected == pytest.approx(coef_of_var)
+
+
+def test_bulk_estimation_matches_single_estimation():
+    expected = [1, 2.5, 8, 13]
+    estimates = tm.IntervalCard.create_estimates(expected)
+    for value, est in zip(expected, estimates.to_estimates()):
+        single = data.Estimate.from_input(tm.IntervalCard.create_estim_input(value))
+        assert est.expected == pytest.approx(single.expected)
+        assert est.sigma == pytest.approx(single.sigma)
+    with pytest.raises(ValueError, match="gamma"):
+        tm.IntervalCard.create_estimates(expected, 0.4)
+    estimates = tm.IntervalCard.create_estimates(expected, 0.4, 8)
+    np.testing.assert_allclose(estimates.sigma / estimates.expected, 0.4)
@@ -1,3 +1,6 @@
+import math
+import typing
+
 from ... import persistence
 from . import forms
 
@@ -24,6 +27,8 @@ class ProjectiveForms:
 
     def setup_forms_according_to_context(self, context, card):
         super().setup_forms_according_to_context(context, card)
+        # One scoring of all cards serves all scores that the request displays
+        self.wsjf_scoring = WSJFScoring(self.all_cards_by_id.values() or [card])
         self.forms["wsjf"].business_value.data = card.business_value
         self.forms["wsjf"].time_sensitivity.data = card.time_sensitivity
         self.forms["wsjf"].risk_and_opportunity.data = card.risk_and_opportunity
@@ -42,9 +47,7 @@ class WSJFCard:
 
     @property
     def cost_of_delay(self):
-        ret = self._get_inherent_cost_of_delay()
-        ret += sum(self.inherited_priority.values()) * self.point_cost
-        return ret
+        return WSJFScoring([self]).cost_of_delay(self)
 
     @property
     def intrinsic_cost_of_delay(self):
@@ -52,29 +55,11 @@ class WSJFCard:
 
     @property
     def inherited_priority(self):
-        ret = self._shallow_inherited_priority()
-        for c in self.get_direct_dependencies():
-            new_prio = c.inherited_priority
-            ret.update(new_prio)
-        return ret
-
-    def _shallow_inherited_priority(self):
-        ret = dict()
-        for c in self.get_direct_dependencies():
-            prio = c.intrinsic_cost_of_delay / c.point_cost
-            if not prio:
-                continue
-            ret[c.name] = prio
-        return ret
+        return WSJFScoring([self]).inherited_priority(self)
 
     @property
     def wsjf_score(self):
-        if self.cost_of_delay == 0:
-            return 0
-        if self.point_cost == 0:
-            msg = f"Point Cost aka size of '{self.name}' is unknown, as is its priority."
-            raise ValueError(msg)
-        return self.cost_of_delay / self.point_cost
+        return WSJFScoring([self]).wsjf_score(self)
 
     def pass_data_to_saver(self, saver):
         super().pass_data_to_saver(saver)
@@ -85,6 +70,129 @@ class WSJFCard:
         loader.load_wsjf_fields(self)
 
 
+class WSJFScoring:
+    """
+    Scores cards and everything they depend on in one go.
+
+    Dependencies and children of cards form a DAG that is ordered topologically once.
+    Every card then gets the set of cards that it inherits priority from,
+    stored as a bitset of their positions in that order, and the sum of their priorities,
+    so benefactors shared by many cards are neither copied, nor counted twice.
+    Like card containment, scoring works with card names.
+    """
+    def __init__(self, cards: typing.Iterable[WSJFCard]):
+        self._cards_in_order = self._get_dependencies_first(cards)
+        self._positions = {c.name: i for i, c in enumerate(self._cards_in_order)}
+        self._priorities = [None] * len(self._cards_in_order)
+        self._benefactors = [0] * len(self._cards_in_order)
+        self._inherited_priority_sums = [0.0] * len(self._cards_in_order)
+        for position, c in enumerate(self._cards_in_order):
+            self._add_benefactors_of(position, c.get_direct_dependencies())
+
+    def _get_priority(self, position):
+        if self._priorities[position] is None:
+            c = self._cards_in_order[position]
+            if not c.intrinsic_cost_of_delay:
+                self._priorities[position] = 0
+            elif c.point_cost == 0:
+                # Only scores of cards that inherit the unknown priority are unknown
+                self._priorities[position] = math.nan
+            else:
+                self._priorities[position] = c.intrinsic_cost_of_delay / c.point_cost
+        return self._priorities[position]
+
+    def _add_benefactors_of(self, position, dependencies):
+        benefactors = 0
+        most_benefactors_position = None
+        for dep in dependencies:
+            dep_position = self._positions[dep.name]
+            dep_benefactors = self._benefactors[dep_position]
+            benefactors |= dep_benefactors
+            if self._get_priority(dep_position):
+                benefactors |= 1 << dep_position
+            if (most_benefactors_position is None
+                    or dep_benefactors.bit_count() > self._benefactors[most_benefactors_position].bit_count()):
+                most_benefactors_position = dep_position
+
+        ret = 0.0
+        to_sum = benefactors
+        if most_benefactors_position is not None:
+            # Priorities of benefactors of the dependency that has most of them are summed already
+            ret = self._inherited_priority_sums[most_benefactors_position]
+            to_sum &= ~ self._benefactors[most_benefactors_position]
+        for benefactor_position in _get_set_bits(to_sum):
+            ret += self._priorities[benefactor_position]
+        self._benefactors[position] = benefactors
+        self._inherited_priority_sums[position] = ret
+
+    @staticmethod
+    def _get_dependencies_first(cards):
+        ret = []
+        entered_names = set()
+        finished_names = set()
+        for root in cards:
+            to_visit = [(root, False)]
+            while to_visit:
+                current, dependencies_done = to_visit.pop()
+                if dependencies_done:
+                    finished_names.add(current.name)
+                    ret.append(current)
+                    continue
+                if current.name in finished_names:
+                    continue
+                if current.name in entered_names:
+                    msg = f"Card '{current.name}' depends on itself."
+                    raise ValueError(msg)
+                entered_names.add(current.name)
+                to_visit.append((current, True))
+                to_visit.extend(
+                    (dep, False) for dep in current.get_direct_dependencies()
+                    if dep.name not in finished_names)
+        return ret
+
+    def inherited_priority(self, card: WSJFCard) -> typing.Dict[str, float]:
+        benefactors = self._benefactors[self._positions[card.name]]
+        return {
+            self._cards_in_order[position].name: self._priorities[position]
+            for position in _get_set_bits(benefactors)}
+
+    def _get_inherited_priority_sum(self, card):
+        ret = self._inherited_priority_sums[self._positions[card.name]]
+        if math.isnan(ret):
+            unknown = [name for name, prio in self.inherited_priority(card).items() if math.isnan(prio)]
+            msg = f"Point Cost aka size of '{unknown[0]}' is unknown, as is the priority that '{card.name}' inherits."
+            raise ValueError(msg)
+        return ret
+
+    def cost_of_delay(self, card: WSJFCard) -> float:
+        ret = card._get_inherent_cost_of_delay()
+        ret += self._get_inherited_priority_sum(card) * card.point_cost
+        return ret
+
+    def wsjf_score(self, card: WSJFCard) -> float:
+        cost_of_delay = self.cost_of_delay(card)
+        if cost_of_delay == 0:
+            return 0
+        if card.point_cost == 0:
+            msg = f"Point Cost aka size of '{card.name}' is unknown, as is its priority."
+            raise ValueError(msg)
+        return cost_of_delay / card.point_cost
+
+    def get_scores(self, cards: typing.Iterable[WSJFCard]) -> typing.Dict[str, float]:
+        return {c.name: self.wsjf_score(c) for c in cards}
+
+    def sorted_by_score(self, cards: typing.Sequence[WSJFCard]) -> typing.List[WSJFCard]:
+        scores = self.get_scores(cards)
+        return sorted(cards, key=lambda c: - scores[c.name])
+
+
+def _get_set_bits(bits):
+    while bits:
+        lowest = bits & - bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
 @persistence.multiloader_of(WSJFCard, ("ini", "toml", "memory"))
 class IniCardStateLoader:
     def load_wsjf_fields(self, card):
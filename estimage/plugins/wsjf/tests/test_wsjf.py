@@ -117,3 +117,63 @@ def test_children_propagation(wsjf_cls, wsjf_card):
     assert "child" not in wsjf_card.inherited_priority
     child.business_value = 1
     assert wsjf_card.inherited_priority["child"] + granchild.wsjf_score == child.wsjf_score
+
+
+def make_ladder_of_shared_dependencies(wsjf_cls, height):
+    cards = []
+    below = []
+    for level in range(height):
+        rung = [wsjf_cls(f"{level}-{side}") for side in "lr"]
+        for c in rung:
+            c.point_cost = 1
+            c.business_value = level + 1
+            for dep in below:
+                c.register_direct_dependency(dep)
+        cards.extend(rung)
+        below = rung
+    return cards
+
+
+def test_scoring_engine_matches_properties(wsjf_cls):
+    cards = make_ladder_of_shared_dependencies(wsjf_cls, 5)
+    scoring = tm.WSJFScoring(cards)
+    scores = scoring.get_scores(cards)
+    for c in cards:
+        assert scores[c.name] == c.wsjf_score
+        assert scoring.inherited_priority(c) == c.inherited_priority
+    assert scores["0-l"] == 1
+    assert scores["1-l"] == 2 + 1 * 2
+    assert scoring.sorted_by_score(cards)[0].name.startswith("4-")
+
+
+def test_scoring_engine_handles_deep_shared_dependencies(wsjf_cls):
+    cards = make_ladder_of_shared_dependencies(wsjf_cls, 60)
+    top = cards[-1]
+    assert len(top.inherited_priority) == len(cards) - 2
+    assert top.wsjf_score == 60 + sum(range(1, 60)) * 2
+
+
+def test_scoring_engine_detects_cycles(wsjf_cls):
+    one = wsjf_cls("one")
+    two = wsjf_cls("two")
+    one.register_direct_dependency(two)
+    two.add_element(one)
+    with pytest.raises(ValueError, match="itself"):
+        tm.WSJFScoring([one])
+
+
+def test_scoring_engine_reports_unknown_sizes_of_benefactors(wsjf_cls):
+    cards = make_ladder_of_shared_dependencies(wsjf_cls, 3)
+    unsized = cards[2]
+    unsized.point_cost = 0
+    scoring = tm.WSJFScoring(cards)
+    assert scoring.wsjf_score(cards[1]) == 1
+    with pytest.raises(ValueError, match=unsized.name):
+        scoring.wsjf_score(cards[-1])
+
+
+def test_scoring_engine_works_with_names(wsjf_cls):
+    cards = make_ladder_of_shared_dependencies(wsjf_cls, 3)
+    copies = make_ladder_of_shared_dependencies(wsjf_cls, 3)
+    scoring = tm.WSJFScoring(cards)
+    assert scoring.get_scores(copies) == scoring.get_scores(cards)
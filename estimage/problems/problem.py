@@ -88,13 +88,27 @@ class ProblemDetector:
         # ordered dictionary by ascending priority
         self.pollster_dict = None
         self.cards = []
+        self.card_ids = None
+        # expected points of pollsters, indexed by IDs of cards in card_ids
+        self.pollster_points_by_name = dict()
         self.problems = []
         self.base_problem_t = base_problem_t
 
-    def detect(self, model: EstiModel, cards: typing.Iterable[BaseCard], pollster_dict: typing.OrderedDict[str, data.Pollster]=None):
+    def detect(
+            self, model: EstiModel, cards: typing.Iterable[BaseCard],
+            pollster_dict: typing.OrderedDict[str, data.Pollster]=None, card_ids: data.SymbolTable=None):
         self.model = model
         self.cards = cards
         self.pollster_dict = pollster_dict
+        self.card_ids = card_ids
+        if self.card_ids is None:
+            self.card_ids = data.SymbolTable()
+        card_names = [card.name for card in self.cards]
+        self.card_ids.extend(card_names)
+        if self.pollster_dict:
+            self.pollster_points_by_name = {
+                name: pollster.provide_expected_points_by_id(self.card_ids, card_names)
+                for name, pollster in self.pollster_dict.items()}
         self._get_problems()
         return self.problems
 
@@ -188,13 +202,11 @@ class ProblemDetector:
         else:
             self._inconsistent_card_differing_estimate(problem_data, analysis)
 
-    def _pollster_is_fine(self, pollster, analysis):
-        name = analysis.card.name
-        if not pollster.knows_points(name):
+    def _pollster_is_fine(self, pollster_name, analysis):
+        pollster_expected = self.pollster_points_by_name[pollster_name][self.card_ids[analysis.card.name]]
+        if np.isnan(pollster_expected):
             return True
 
-        pollster_input = pollster.ask_points(name)
-        pollster_expected = data.Estimate.from_input(pollster_input).expected
         if self._numbers_differ_significantly(analysis.recorded_cost, pollster_expected):
             return False
 
@@ -203,9 +215,7 @@ class ProblemDetector:
     def _analyze_leaf_wrt_pollsters(self, problem_data, analysis):
         pollster_names_by_priority_descending = reversed(self.pollster_dict.keys())
         for pollster_name in pollster_names_by_priority_descending:
-            pollster = self.pollster_dict[pollster_name]
-
-            if self._pollster_is_fine(pollster, analysis):
+            if self._pollster_is_fine(pollster_name, analysis):
                 continue
 
             problem_data["tags"].add("pollster_disagrees")
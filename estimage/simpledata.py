@@ -6,6 +6,7 @@ import dataclasses
 import dateutil.relativedelta
 
 import flask
+import numpy as np
 
 from . import data
 from . import inidata
@@ -141,24 +142,91 @@ def get_model(cards_tree_without_duplicates):
     return model
 
 
-def _create_distance_task_tuples(
-        relevant_tasks, reference_estimate,
-        distance_threshold: float, rank_threshold: float):
-    distance_task_tuples = list()
-    for t in relevant_tasks:
-        distance = abs(t.nominal_point_estimate.expected - reference_estimate.expected)
-        rank = t.nominal_point_estimate.rank_distance(reference_estimate)
-        if (distance <= distance_threshold or rank <= rank_threshold):
-            distance_task_tuples.append((distance, t))
-    return distance_task_tuples
+class SimilarityIndex:
+    """
+    Task models sorted by their expected nominal point cost,
+    so tasks of similar size can be found without evaluating all of them.
+    """
+    def __init__(self, tasks: typing.Iterable[data.TaskModel]):
+        tasks = list(tasks)
+        estimates = [t.nominal_point_estimate for t in tasks]
+        expected = np.array([e.expected for e in estimates], dtype=float)
+        sigma = np.array([e.sigma for e in estimates], dtype=float)
+        self._index(tasks, expected, sigma)
+
+    @classmethod
+    def _from_arrays(cls, tasks, expected, sigma):
+        ret = cls.__new__(cls)
+        ret._index(tasks, expected, sigma)
+        return ret
+
+    def _index(self, tasks, expected, sigma):
+        self._tasks_in_order = tasks
+        self._expected_in_order = expected
+        self._sigma_in_order = sigma
+        self._position_by_name = {t.name: i for i, t in enumerate(tasks)}
+        # Original positions break ties of equally distant tasks
+        self.positions = np.argsort(expected, kind="stable")
+        self.tasks = [tasks[i] for i in self.positions]
+        self.tasks_by_name = {t.name: t for t in tasks}
+        self.expected = expected[self.positions]
+        self.sigma = sigma[self.positions]
+        self.max_sigma = self.sigma.max(initial=0)
+
+    def with_tasks_replaced(self, tasks: typing.Iterable[data.TaskModel]) -> "SimilarityIndex":
+        """
+        Return an index in which the tasks replace indexed tasks of the same name.
+
+        Estimates of other tasks are not evaluated again, so the index can be shared,
+        and e.g. private estimates of a user can be applied to it for that user only.
+        """
+        replacements = [t for t in tasks if t.name in self._position_by_name]
+        if not replacements:
+            return self
+        all_tasks = list(self._tasks_in_order)
+        expected = self._expected_in_order.copy()
+        sigma = self._sigma_in_order.copy()
+        for task in replacements:
+            position = self._position_by_name[task.name]
+            estimate = task.nominal_point_estimate
+            all_tasks[position] = task
+            expected[position] = estimate.expected
+            sigma[position] = estimate.sigma
+        return self._from_arrays(all_tasks, expected, sigma)
+
+    def _get_bounds(self, reference_estimate, distance_threshold, rank_threshold):
+        reach = max(distance_threshold, rank_threshold * (reference_estimate.sigma + self.max_sigma))
+        # The slack makes sure that rounding doesn't exclude anything, exact criteria are applied later.
+        reach += 1e-9 * (1 + abs(reference_estimate.expected) + reach)
+        low = np.searchsorted(self.expected, reference_estimate.expected - reach, side="left")
+        high = np.searchsorted(self.expected, reference_estimate.expected + reach, side="right")
+        return low, high
+
+    def get_nearby_tasks(
+            self, reference_task: data.TaskModel,
+            distance_threshold: float, rank_threshold: float) -> typing.List[data.TaskModel]:
+        """
+        Return tasks whose expected point cost is within the distance threshold of the reference task,
+        or whose rank distance to it is within the rank threshold, nearest first.
+        """
+        reference_estimate = reference_task.nominal_point_estimate
+        low, high = self._get_bounds(reference_estimate, distance_threshold, rank_threshold)
+
+        distances = np.abs(self.expected[low:high] - reference_estimate.expected)
+        sums_of_sigmas = self.sigma[low:high] + reference_estimate.sigma
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ranks = distances / sums_of_sigmas
+        ranks[(distances > 0) & (sums_of_sigmas == 0)] = float("inf")
+        ranks[distances == 0] = 0
+
+        selected = np.flatnonzero((distances <= distance_threshold) | (ranks <= rank_threshold))
+        by_distance = np.lexsort((self.positions[low:high][selected], distances[selected]))
+        nearby_tasks = [self.tasks[low + selected[i]] for i in by_distance]
+        return [t for t in nearby_tasks if t.name != reference_task.name]
 
 
 def order_nearby_tasks(
         reference_task: data.TaskModel, all_tasks: typing.Iterable[data.TaskModel],
         distance_threshold: float, rank_threshold: float) -> typing.List[data.TaskModel]:
-    reference_estimate = reference_task.nominal_point_estimate
-    relevant_tasks = [t for t in all_tasks if t.name != reference_task.name]
-    distance_task_tuples = _create_distance_task_tuples(
-        relevant_tasks, reference_estimate, distance_threshold, rank_threshold)
-    sorted_distance_tasks = sorted(distance_task_tuples, key=lambda x: x[0])
-    return [dt[1] for dt in sorted_distance_tasks]
+    index = SimilarityIndex(all_tasks)
+    return index.get_nearby_tasks(reference_task, distance_threshold, rank_threshold)
@@ -0,0 +1,166 @@
+import concurrent.futures
+import dataclasses
+import typing
+
+import numpy as np
+import scipy as sp
+
+from ..entities.composition import Composition
+from ..entities.task import TaskModel
+
+
+# Upper bound of the number of leaf samples that are held in memory at once
+MAX_CHUNK_ELEMENTS = 2_000_000
+QUANTILE_RESOLUTION = 1024
+
+
+@dataclasses.dataclass
+class LeafParameters:
+    """
+    Parameters of remaining work distributions of leaf tasks.
+
+    Leaves with a known 3-point source are sampled from tables of quantiles of their PERT distribution,
+    which split the distribution into equally probable bins.
+    The others are sampled from the normal distribution given by their expected value and sigma.
+    """
+    quantiles: np.ndarray
+    expected: np.ndarray
+    sigma: np.ndarray
+    has_pert: np.ndarray
+
+    @classmethod
+    def from_tasks(cls, tasks: typing.Sequence[TaskModel], resolution=QUANTILE_RESOLUTION):
+        estimates = [t.remaining_point_estimate for t in tasks]
+        has_pert = np.array([e.source is not None for e in estimates], dtype=bool)
+        expected = np.array([e.expected for e in estimates], dtype=float)
+        sigma = np.array([e.sigma for e in estimates], dtype=float)
+        quantiles = np.empty((int(has_pert.sum()), resolution))
+        for row, e in enumerate(e for e in estimates if e.source is not None):
+            bin_edges = e.get_pert_quantiles(resolution + 1)[1]
+            quantiles[row] = (bin_edges[:-1] + bin_edges[1:]) / 2
+        return cls(quantiles, expected, sigma, has_pert)
+
+    def _sample_quantiles(self, rng, size):
+        num_leaves, resolution = self.quantiles.shape
+        # Samples of a leaf are next to each other, so they look up the same table
+        indices = rng.integers(0, resolution, size=(num_leaves, size))
+        indices += (np.arange(num_leaves) * resolution)[:, np.newaxis]
+        return self.quantiles.ravel()[indices]
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """
+        Return a matrix of samples, one row per leaf and one column per sample.
+        """
+        if self.has_pert.all():
+            return self._sample_quantiles(rng, size)
+        ret = np.empty((len(self.expected), size))
+        ret[self.has_pert] = self._sample_quantiles(rng, size)
+        normal = ~ self.has_pert
+        ret[normal] = rng.normal(
+            self.expected[normal, np.newaxis], self.sigma[normal, np.newaxis], size=(normal.sum(), size))
+        return ret
+
+
+def _simulate_chunk(leaf_parameters, aggregation_matrix, seed_sequence, size):
+    rng = np.random.default_rng(seed_sequence)
+    leaf_samples = leaf_parameters.sample(rng, size)
+    return np.asarray(aggregation_matrix @ leaf_samples)
+
+
+# Pool workers receive the simulation only once, when they are started
+_WORKER_SIMULATION = dict()
+
+
+def _initialize_worker(leaf_parameters, aggregation_matrix):
+    _WORKER_SIMULATION["leaf_parameters"] = leaf_parameters
+    _WORKER_SIMULATION["aggregation_matrix"] = aggregation_matrix
+
+
+def _simulate_chunk_in_worker(seed_sequence, size):
+    return _simulate_chunk(
+        _WORKER_SIMULATION["leaf_parameters"], _WORKER_SIMULATION["aggregation_matrix"], seed_sequence, size)
+
+
+@dataclasses.dataclass
+class SimulationResult:
+    names: typing.List[str]
+    samples: np.ndarray
+
+    def get_samples_of(self, name: str) -> np.ndarray:
+        return self.samples[self.names.index(name)]
+
+    def get_quantiles(self, quantiles: typing.Sequence[float]) -> typing.Dict[str, np.ndarray]:
+        values = np.quantile(self.samples, quantiles, axis=1)
+        return {name: values[:, i] for i, name in enumerate(self.names)}
+
+
+class RemainingWorkSimulation:
+    """
+    Monte Carlo simulation of remaining work of all compositions in a tree at once.
+
+    Remaining point estimates of all leaf tasks are sampled together,
+    and a sparse matrix that maps leaves to compositions containing them
+    sums the samples into totals of every composition.
+    Masked tasks and compositions contribute nothing, like they do to remaining point estimates.
+    """
+    def __init__(self, root: Composition):
+        self.names = []
+        self.leaves = []
+        rows = []
+        columns = []
+        self._traverse(root, rows, columns)
+
+        self.aggregation_matrix = sp.sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, columns)), shape=(len(self.names), len(self.leaves)))
+        self.leaf_parameters = LeafParameters.from_tasks(self.leaves)
+
+    def _traverse(self, root, rows, columns):
+        # Compositions whose remaining work includes the currently visited node
+        to_visit = [(root, [])]
+        while to_visit:
+            composition, including_rows = to_visit.pop()
+            row = len(self.names)
+            self.names.append(composition.name)
+            including_rows = [] if composition.masked else including_rows + [row]
+
+            for e in composition.elements:
+                if e.masked:
+                    continue
+                column = len(self.leaves)
+                self.leaves.append(e)
+                rows.extend(including_rows)
+                columns.extend([column] * len(including_rows))
+
+            for c in reversed(composition.compositions):
+                to_visit.append((c, including_rows))
+
+    def simulate(
+            self, num_samples: int, seed=None,
+            chunk_size: int=None, processes: int=None) -> SimulationResult:
+        """
+        Simulate remaining work of every composition num_samples times.
+
+        Samples are generated in chunks, every chunk using its own seed derived from the seed,
+        so results don't depend on whether chunks are processed by a pool of processes.
+        By default, chunks are as large as MAX_CHUNK_ELEMENTS allows.
+        """
+        if num_samples < 1:
+            msg = f"Invalid number of samples {num_samples} - need at least 1"
+            raise ValueError(msg)
+        if chunk_size is None:
+            chunk_size = max(1, MAX_CHUNK_ELEMENTS // max(1, len(self.leaves)))
+        chunk_sizes = [chunk_size] * (num_samples // chunk_size)
+        if remainder := num_samples % chunk_size:
+            chunk_sizes.append(remainder)
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+
+        if processes is None:
+            totals = [
+                _simulate_chunk(self.leaf_parameters, self.aggregation_matrix, seed_sequence, size)
+                for seed_sequence, size in zip(seed_sequences, chunk_sizes)]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=processes, initializer=_initialize_worker,
+                    initargs=(self.leaf_parameters, self.aggregation_matrix)) as executor:
+                totals = list(executor.map(_simulate_chunk_in_worker, seed_sequences, chunk_sizes))
+        return SimulationResult(list(self.names), np.concatenate(totals, axis=1))
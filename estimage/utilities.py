@@ -1,5 +1,9 @@
+import collections
 import cProfile
+import dataclasses
 import functools
+import threading
+import types
 import typing
 
 import numpy as np
@@ -36,6 +40,98 @@ def profile(wrapped):
     return wrapper
 
 
+def lru_cache_of_arrays(max_bytes):
+    """
+    Decorate a function that returns a tuple of arrays to cache its results,
+    discarding least recently used results once the arrays take more than max_bytes in total.
+
+    Returned arrays are shared among callers, so they should be made read-only.
+    """
+    def decorator(wrapped):
+        results = collections.OrderedDict()
+        lock = threading.Lock()
+        total_bytes = 0
+
+        @functools.wraps(wrapped)
+        def wrapper(* args):
+            nonlocal total_bytes
+            with lock:
+                if args in results:
+                    results.move_to_end(args)
+                    return results[args]
+            ret = wrapped(* args)
+            size = sum(array.nbytes for array in ret)
+            with lock:
+                if args not in results:
+                    results[args] = ret
+                    total_bytes += size
+                while total_bytes > max_bytes and results:
+                    evicted = results.popitem(last=False)[1]
+                    total_bytes -= sum(array.nbytes for array in evicted)
+            return ret
+
+        def cache_clear():
+            nonlocal total_bytes
+            with lock:
+                results.clear()
+                total_bytes = 0
+
+        def cache_bytes():
+            return total_bytes
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_bytes = cache_bytes
+        return wrapper
+    return decorator
+
+
+def _rebind_zero_argument_super(function, new_class):
+    if "__class__" not in function.__code__.co_freevars:
+        return function
+    closure = tuple(
+        types.CellType(new_class) if name == "__class__" else cell
+        for name, cell in zip(function.__code__.co_freevars, function.__closure__))
+    ret = types.FunctionType(
+        function.__code__, function.__globals__, function.__name__, function.__defaults__, closure)
+    ret.__kwdefaults__ = function.__kwdefaults__
+    ret.__qualname__ = function.__qualname__
+    ret.__doc__ = function.__doc__
+    return ret
+
+
+def _rebind_attribute(attribute, new_class):
+    if isinstance(attribute, types.FunctionType):
+        return _rebind_zero_argument_super(attribute, new_class)
+    if isinstance(attribute, (classmethod, staticmethod)):
+        return type(attribute)(_rebind_attribute(attribute.__func__, new_class))
+    if isinstance(attribute, property):
+        return property(
+            * [_rebind_attribute(f, new_class) if f else None for f in (attribute.fget, attribute.fset, attribute.fdel)],
+            attribute.__doc__)
+    return attribute
+
+
+def create_slotted_copy(cls, name, extra_slots=()):
+    """
+    Given a dataclass, create its copy that stores fields
+    and extra_slots in slots instead of the instance __dict__.
+
+    The copy shares bases with the original instead of subclassing it,
+    as instances of subclasses would still reserve space for the __dict__.
+    """
+    slots = tuple(f.name for f in dataclasses.fields(cls)) + tuple(extra_slots)
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in slots + ("__dict__", "__weakref__")}
+    namespace["__slots__"] = slots
+    namespace["__qualname__"] = name
+    ret = type(cls)(name, cls.__bases__, namespace)
+    for key, value in namespace.items():
+        if (rebound := _rebind_attribute(value, ret)) is not value:
+            setattr(ret, key, rebound)
+    return ret
+
+
 def _container_in_one_of(reference: typing.Container, sets: typing.Iterable[typing.Container]):
     for candidate in sets:
         if reference in candidate:
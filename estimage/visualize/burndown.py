@@ -5,7 +5,7 @@ import typing
 import numpy as np
 
 from ..entities import status
-from . import utils
+from . import utils, svg
 from .. import history, PluginResolver, utilities
 
 
@@ -18,6 +18,8 @@ class StatusStyle(typing.NamedTuple):
 @PluginResolver.class_is_extendable("MPLPointPlot")
 class MPLPointPlot:
     DDAY_LABEL = "today"
+    # Either "svg" for the lightweight renderer, or "matplotlib"
+    SMALL_FIGURE_BACKEND = "svg"
 
     def __init__(self, a: history.Aggregation, * args, ** kwargs):
         self.aggregation = a
@@ -68,7 +70,7 @@ class MPLPointPlot:
             self._plot_data_with_termination(ax, array, bottom, style)
             bottom += array
 
-    def _plot_data_with_termination(self, ax, array, bottom, style):
+    def _terminate_data_at_dday(self, array, bottom):
         days = np.arange(self.aggregation.days)
         if 0 <= self.index_of_dday < len(days):
             up_until_dday = slice(0, self.index_of_dday + 1)
@@ -76,6 +78,10 @@ class MPLPointPlot:
             array = utils.insert_element_into_array_after(array[up_until_dday], dday, 0)
             bottom = utils.insert_element_into_array_after(bottom[up_until_dday], dday, 0)
             days = utils.insert_element_into_array_after(days[up_until_dday], dday, dday)
+        return days, array, bottom
+
+    def _plot_data_with_termination(self, ax, array, bottom, style):
+        days, array, bottom = self._terminate_data_at_dday(array, bottom)
         if array.sum() > 0:
             ax.fill_between(days, array + bottom, bottom, label=style.label,
                             color=style.color, edgecolor="white", linewidth=self.width * 0.5)
@@ -112,6 +118,44 @@ class MPLPointPlot:
 
         return fig
 
+    def get_small_svg(self, size_inches):
+        self._prepare_plots()
+        plan = self.aggregation.get_plan_array()
+        stacked_total = self.status_arrays.sum(0)
+        y_max = max(stacked_total.max(initial=0), plan.max(initial=0))
+        sparkline = svg.SVGSparkline(size_inches, (0, self.aggregation.days - 1), (0, y_max))
+
+        bottom = np.zeros(self.aggregation.days)
+        for index, style in enumerate(self.styles.values()):
+            array = self.status_arrays[index]
+            days, terminated_array, terminated_bottom = self._terminate_data_at_dday(array, bottom)
+            if terminated_array.sum() > 0:
+                sparkline.add_area(
+                    days, terminated_array + terminated_bottom, terminated_bottom,
+                    style.color, linewidth=self.width * 0.5)
+            bottom = bottom + array
+
+        sparkline.add_line(np.arange(len(plan)), plan, "orange", self.width)
+        if self.start <= self.get_date_of_dday() <= self.end:
+            sparkline.add_vline(self.index_of_dday, "grey", self.width * 2)
+        return sparkline.render()
+
+    def get_chart_data(self):
+        self._prepare_plots()
+        ret = utils.get_chart_data_skeleton(np.arange(self.aggregation.days), "time / days", "points")
+        ret["start"] = self.start.isoformat()
+        for index, style in enumerate(self.styles.values()):
+            ret["stacked"].append(dict(
+                label=style.label, color=svg.color_to_css(style.color),
+                values=utils.encode_float_array(self.status_arrays[index])))
+        ret["lines"].append(dict(
+            label="burndown", color="orange",
+            values=utils.encode_float_array(self.aggregation.get_plan_array())))
+        if self.start <= self.get_date_of_dday() <= self.end:
+            ret["stacked_until"] = self.index_of_dday
+            ret["markers"].append(dict(label=self.DDAY_LABEL, color="grey", x=self.index_of_dday))
+        return ret
+
     def plot_stuff(self):
         plt = utils.get_standard_pyplot()
         self.get_figure()
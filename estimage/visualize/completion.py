@@ -49,21 +49,45 @@ class MPLCompletionPlot:
         week_index = utils.get_week_index(self.period_start, chart_start)
         utils.x_axis_weeks_and_months(ax, chart_start, chart_end, week_index)
 
-    def _plot_percentile(self, ax, value_in_percents):
+    def _get_percentile_marker(self, value_in_percents):
         where = self.ppf(value_in_percents / 100.0)
-        ax.axvline(self._dom_to_days(where), color="orange",
-                   linewidth=self.width, label=f"confidence {round(value_in_percents)} %")
+        return dict(label=f"confidence {round(value_in_percents)} %", color="orange", x=self._dom_to_days(where))
 
-    def _plot_dday(self, ax):
-        ax.axvline(self._dom_to_days(0), label=self.DDAY_LABEL, color="grey", linewidth=2)
+    def _get_dday_marker(self):
+        return dict(label=self.DDAY_LABEL, color="grey", x=self._dom_to_days(0))
 
-    def _plot_period_end(self, ax):
+    def _get_period_end_marker(self):
         period_end_index = (self.period_end - self.get_date_of_dday()).days
         color = "blue"
         period_end_is_before_completion = self.chart_days_after_completion == 0
         if period_end_is_before_completion:
             color = "red"
-        ax.axvline(self._dom_to_days(period_end_index), label="period end", color=color, linewidth=2)
+        return dict(label="period end", color=color, x=self._dom_to_days(period_end_index))
+
+    def _plot_marker(self, ax, marker, linewidth):
+        ax.axvline(marker["x"], label=marker["label"], color=marker["color"], linewidth=linewidth)
+
+    def _plot_percentile(self, ax, value_in_percents):
+        self._plot_marker(ax, self._get_percentile_marker(value_in_percents), self.width)
+
+    def _plot_dday(self, ax):
+        self._plot_marker(ax, self._get_dday_marker(), 2)
+
+    def _plot_period_end(self, ax):
+        self._plot_marker(ax, self._get_period_end_marker(), 2)
+
+    def get_chart_data(self):
+        ret = utils.get_chart_data_skeleton(self._dom_to_days(self.dom), "time / days", "percents")
+        ret["start"] = (self.get_date_of_dday() + utils.ONE_DAY * self.dom[0]).isoformat()
+        ret["lines"].append(dict(
+            label="prob of completion", color="green", values=utils.encode_float_array(self.cdf)))
+        markers = []
+        if self.cdf[0] == 0:
+            markers.append(self._get_percentile_marker(95.0))
+        markers.append(self._get_dday_marker())
+        markers.append(self._get_period_end_marker())
+        ret["markers"].extend(dict(marker, x=float(marker["x"])) for marker in markers)
+        return ret
 
     def get_figure(self):
         plt = utils.get_standard_pyplot()
@@ -47,6 +47,16 @@ class PertPlotter:
             arrowprops=dict(arrowstyle="->", connectionstyle="arc3", ec=self.PERT_COLOR, lw=2), zorder=4)
         ax.scatter(self.expected, 0, ec="b", fc="w", lw=2, zorder=3)
 
+    def get_chart_data(self):
+        domain, values = self.pert
+        ret = utils.get_chart_data_skeleton(domain, "points", "probability density")
+        ret["lines"].append(dict(
+            label=f"task {self.task_name}", color=self.PERT_COLOR,
+            values=utils.encode_float_array(values)))
+        ret["markers"].append(dict(
+            label="expected value", color=self.EXPECTED_COLOR, x=float(self.expected)))
+        return ret
+
     def plot_any_pert(self, ax):
         if self.estimation.sigma == 0:
             self.plot_delta_pert(ax)
@@ -0,0 +1,92 @@
+import typing
+import xml.sax.saxutils
+
+import numpy as np
+
+
+POINTS_PER_INCH = 72
+# Matplotlib adds 5% of the data range to every side of the axes
+AXES_MARGIN = 0.05
+
+
+def _format_rgb(color: typing.Sequence[float]) -> str:
+    return ",".join(str(round(c * 255)) for c in color[:3])
+
+
+def rgba_to_svg_attributes(color: typing.Sequence[float], kind="fill"):
+    if isinstance(color, str):
+        return f'{kind}="{xml.sax.saxutils.escape(color)}"'
+    rgb = _format_rgb(color)
+    ret = f'{kind}="rgb({rgb})"'
+    if len(color) > 3 and color[3] != 1:
+        ret += f' {kind}-opacity="{color[3]:.3g}"'
+    return ret
+
+
+def color_to_css(color) -> str:
+    if isinstance(color, str):
+        return color
+    rgb = _format_rgb(color)
+    alpha = color[3] if len(color) > 3 else 1
+    return f"rgba({rgb},{alpha:.3g})"
+
+
+def _format_coords(xs, ys):
+    return " ".join(f"{x:.2f},{y:.2f}" for x, y in zip(xs, ys))
+
+
+class SVGSparkline:
+    """
+    Minimal SVG canvas that draws into a data coordinate system.
+
+    It is intended for tiny, axis-less figures,
+    where creating a matplotlib figure costs far more than the figure itself.
+    """
+    def __init__(self, size_inches: typing.Tuple[float, float],
+                 x_range: typing.Tuple[float, float], y_range: typing.Tuple[float, float]):
+        self.width = size_inches[0] * POINTS_PER_INCH
+        self.height = size_inches[1] * POINTS_PER_INCH
+        self.x_min, self.x_max = self._pad_range(* x_range)
+        self.y_min, self.y_max = self._pad_range(* y_range)
+        self._elements = []
+
+    @staticmethod
+    def _pad_range(low, high):
+        extent = high - low
+        if extent == 0:
+            extent = 1
+        return low - extent * AXES_MARGIN, high + extent * AXES_MARGIN
+
+    def _x_to_canvas(self, xs):
+        return (np.asarray(xs, dtype=float) - self.x_min) / (self.x_max - self.x_min) * self.width
+
+    def _y_to_canvas(self, ys):
+        return self.height - (np.asarray(ys, dtype=float) - self.y_min) / (self.y_max - self.y_min) * self.height
+
+    def add_area(self, xs, top, bottom, color, edgecolor="white", linewidth=0.5):
+        xs = self._x_to_canvas(xs)
+        outline_x = np.concatenate((xs, xs[::-1]))
+        outline_y = np.concatenate((self._y_to_canvas(top), self._y_to_canvas(bottom)[::-1]))
+        self._elements.append(
+            f'<polygon points="{_format_coords(outline_x, outline_y)}" '
+            f'{rgba_to_svg_attributes(color)} {rgba_to_svg_attributes(edgecolor, "stroke")} '
+            f'stroke-width="{linewidth:.3g}"/>')
+
+    def add_line(self, xs, ys, color, linewidth=1):
+        coords = _format_coords(self._x_to_canvas(xs), self._y_to_canvas(ys))
+        self._elements.append(
+            f'<polyline points="{coords}" fill="none" '
+            f'{rgba_to_svg_attributes(color, "stroke")} stroke-width="{linewidth:.3g}"/>')
+
+    def add_vline(self, x, color, linewidth=1):
+        canvas_x = float(self._x_to_canvas(x))
+        self._elements.append(
+            f'<line x1="{canvas_x:.2f}" y1="0" x2="{canvas_x:.2f}" y2="{self.height:.2f}" '
+            f'{rgba_to_svg_attributes(color, "stroke")} stroke-width="{linewidth:.3g}"/>')
+
+    def render(self) -> str:
+        header = (
+            '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+            f'width="{self.width:.1f}pt" height="{self.height:.1f}pt" '
+            f'viewBox="0 0 {self.width:.1f} {self.height:.1f}">')
+        return "\n".join([header] + self._elements + ["</svg>"]) + "\n"
@@ -1,3 +1,4 @@
+import base64
 import typing
 import datetime
 
@@ -7,6 +8,12 @@ import numpy as np
 ONE_DAY = datetime.timedelta(days=1)
 
 
+# matplotlib takes long to import, so it is imported only once something gets plotted
+def use_svg_backend():
+    import matplotlib
+    matplotlib.use("svg")
+
+
 def get_standard_pyplot():
     import matplotlib.pyplot as plt
     plt.rcParams['svg.fonttype'] = 'none'
@@ -73,3 +80,46 @@ def simplify_timeline_array(array_to_simplify):
         simplified.append(middle)
     simplified.append(array_to_simplify[-1])
     return np.array(simplified, dtype=array_to_simplify.dtype)
+
+
+def encode_float_array(array) -> dict:
+    """
+    Encode an array of floats as base64 of little-endian float32 values,
+    which is considerably more compact than a JSON list of floats.
+    """
+    raw = np.asarray(array, dtype="<f4").tobytes()
+    return dict(encoding="float32-base64", data=base64.b64encode(raw).decode("ascii"))
+
+
+def encode_int_array(array) -> dict:
+    """
+    Encode an array of integers as a list of differences between neighbors,
+    so regularly spaced sequences s.a. day indices compress to runs of small numbers.
+    """
+    ints = np.asarray(array, dtype=np.int64)
+    deltas = np.diff(ints, prepend=0)
+    return dict(encoding="delta-int", data=deltas.tolist())
+
+
+def decode_array(encoded: dict) -> np.ndarray:
+    if encoded["encoding"] == "float32-base64":
+        return np.frombuffer(base64.b64decode(encoded["data"]), dtype="<f4")
+    elif encoded["encoding"] == "delta-int":
+        return np.cumsum(np.array(encoded["data"], dtype=np.int64))
+    msg = f"Unknown array encoding '{encoded['encoding']}'"
+    raise ValueError(msg)
+
+
+def get_chart_data_skeleton(x, xlabel, ylabel) -> dict:
+    """
+    Return a structure that describes a chart in a renderer-agnostic way,
+    so the chart can be drawn by a client instead of the server.
+    """
+    if np.issubdtype(np.asarray(x).dtype, np.integer):
+        encoded_x = encode_int_array(x)
+    else:
+        encoded_x = encode_float_array(x)
+    return dict(
+        x=encoded_x, xlabel=xlabel, ylabel=ylabel,
+        stacked=[], stacked_until=None, lines=[], markers=[],
+    )
@@ -4,7 +4,7 @@ import datetime
 import numpy as np
 import scipy as sp
 
-from . import utils
+from . import utils, svg
 from .. import history, PluginResolver
 from ..statops import func
 
@@ -40,19 +40,10 @@ class MPLVelocityPlot:
 
     def _prepare_plots(self, cutoff_date):
         for tier, aggregation in enumerate(self.aggregations_by_tiers):
-            for r in aggregation.repres:
-                self.velocity_focus[tier] += r.get_velocity_array()
-                self._fill_rolling_velocity(tier, r, cutoff_date)
-
-    def _fill_rolling_velocity(self, tier, repre, cutoff_date):
-        completed_from_before = repre.points_completed(self.start)
-        for days in self.days:
-            date = self.start + utils.ONE_DAY * days
-            points_completed_to_date = repre.points_completed(date) - completed_from_before
-            self.velocity_estimate[tier, days] += points_completed_to_date / (days + 1)
-
-            if date >= cutoff_date:
-                break
+            if not aggregation.repres:
+                continue
+            self.velocity_focus[tier] += aggregation.get_velocity_array()
+            self.velocity_estimate[tier] += aggregation.get_rolling_velocity_array(cutoff_date)
 
     def plot_stuff(self, cutoff_date):
         plt = utils.get_standard_pyplot()
@@ -69,6 +60,28 @@ class MPLVelocityPlot:
     def get_date_of_dday(self):
         return datetime.datetime.today()
 
+    def get_chart_data(self, cutoff_date):
+        self._prepare_plots(cutoff_date)
+        ret = utils.get_chart_data_skeleton(self.days, "time / days", "team velocity / points per week")
+        ret["start"] = self.start.isoformat()
+
+        aggregate_focus = np.zeros_like(self.velocity_focus[0])
+        for tier, tier_focus in enumerate(self.velocity_focus):
+            aggregate_focus += tier_focus
+            tier_style = self.TIER_STYLES[tier]
+            ret["lines"].append(dict(
+                label=f"{tier_style.label} Velocity Fit", color=svg.color_to_css(tier_style.color),
+                values=utils.encode_float_array(aggregate_focus * DAYS_IN_WEEK)))
+        all_tiers_rolling_velocity = np.sum(self.velocity_estimate, 0)
+        ret["lines"].append(dict(
+            label="Rolling velocity estimate", color="orange",
+            values=utils.encode_float_array(all_tiers_rolling_velocity * DAYS_IN_WEEK)))
+
+        index_of_dday = history.days_between(self.start, self.get_date_of_dday())
+        if 0 <= index_of_dday <= len(self.days):
+            ret["markers"].append(dict(label=self.DDAY_LABEL, color="grey", x=index_of_dday))
+        return ret
+
     def get_figure(self, cutoff_date):
         plt = utils.get_standard_pyplot()
 
@@ -1,6 +1,7 @@
 import collections
 import pathlib
 import os
+import threading
 
 import flask
 from flask_login import LoginManager
@@ -13,6 +14,7 @@ CACHE = Cache()
 
 
 from .. import data, simpledata, plugins, PluginResolver
+from ..persistence import batch
 from . import users, config
 
 from .neck import bp as neck_bp
@@ -63,6 +65,17 @@ class PluginFriendlyFlask(flask.Flask):
     def get_perhaps_overriden_path(self, path):
         raise NotImplementedError()
 
+    def get_card_ids(self) -> data.SymbolTable:
+        """
+        Return the symbol table that assigns IDs to cards of the head that serves the request.
+
+        The table lives as long as the worker, and it never forgets names,
+        so it also holds cards that were removed from the head since.
+        It grows by about a hundred bytes per card that the head ever had,
+        and code that fills arrays indexed by it should only fill entries of cards that it works with.
+        """
+        raise NotImplementedError()
+
 
 class PluginFriendlySingleheadFlask(PluginFriendlyFlask):
     def __init__(self, import_name, ** kwargs):
@@ -71,6 +84,7 @@ class PluginFriendlySingleheadFlask(PluginFriendlyFlask):
         self._plugin_resolver.add_known_extendable_classes()
 
         self._template_ancestor_path_map = collections.defaultdict(collections.OrderedDict)
+        self._card_ids = data.SymbolTable()
 
     def supply_with_plugins(self, plugins_dict):
         for plugin in plugins_dict.values():
@@ -104,14 +118,30 @@ class PluginFriendlySingleheadFlask(PluginFriendlyFlask):
     def get_plugins_in_context(self):
         return self.get_config_option("PLUGINS")
 
+    def get_card_ids(self):
+        return self._card_ids
+
 
 class PluginFriendlyMultiheadFlask(PluginFriendlyFlask):
+    """
+    Flask app that serves multiple heads, each of them with its own plugins.
+
+    Heads are only configured when they receive their first request,
+    so starting the app doesn't take longer with every head that it serves.
+    The first worker that configures a head saves how it resolved plugins of the head,
+    and other workers reuse that until the config of the head changes.
+    """
     NON_HEAD_BLUEPRINTS = ("login", "neck")
 
     def __init__(self, import_name, ** kwargs):
+        # Flask sets itself up using methods that check the state
+        self._head_resolution_state = threading.local()
         super().__init__(import_name, ** kwargs)
         self._plugin_resolvers = dict()
         self._template_ancestor_path_maps = dict()
+        self._card_ids_of_heads = dict()
+        self._directories_of_unresolved_heads = dict()
+        self._head_resolution_lock = threading.Lock()
 
         no_plugins = PluginResolver()
         no_plugins.add_known_extendable_classes()
@@ -123,11 +153,15 @@ class PluginFriendlyMultiheadFlask(PluginFriendlyFlask):
         self._plugin_resolvers[name].add_known_extendable_classes()
 
         self._template_ancestor_path_maps[name] = collections.defaultdict(collections.OrderedDict)
+        self._card_ids_of_heads[name] = data.SymbolTable()
 
-    def supply_with_plugins(self, head, plugins_dict):
+    def supply_with_plugins(self, head, plugins_dict, extensions=None):
         self._new_head(head)
-        for plugin in plugins_dict.values():
-            self._plugin_resolvers[head].resolve_extension(plugin)
+        if extensions is None:
+            for plugin in plugins_dict.values():
+                self._plugin_resolvers[head].resolve_extension(plugin)
+        else:
+            self._plugin_resolvers[head].apply_extensions(extensions, plugins_dict.values())
         self._populate_template_overrides_map(plugins_dict, self._template_ancestor_path_maps[head])
 
     def _template_not_extended(self, template_name):
@@ -162,6 +196,64 @@ class PluginFriendlyMultiheadFlask(PluginFriendlyFlask):
     def store_plugins_to_config(self, head):
         self.config["head"][head]["classes"] = self._plugin_resolvers[head].class_dict
 
+    def add_head_lazily(self, head, directory):
+        self._directories_of_unresolved_heads[head] = directory
+
+    def resolve_head(self, head):
+        if head not in self._directories_of_unresolved_heads:
+            return
+        with self._head_resolution_lock:
+            directory = self._directories_of_unresolved_heads.get(head)
+            if directory is None:
+                return
+            self._head_resolution_state.resolving = True
+            try:
+                self._configure_head(head, directory)
+            finally:
+                self._head_resolution_state.resolving = False
+            del self._directories_of_unresolved_heads[head]
+
+    def _configure_head(self, head, directory):
+        config_class = simpledata.AppData
+        config_class.DATADIR = pathlib.Path(directory)
+        resolution = config.load_resolution(config_class)
+        if resolution:
+            # The config was stored completely when the resolution was saved
+            head_config = config_class.load()
+        else:
+            head_config = config.read_or_create_config(config_class)
+        self.config["head"][head].update(head_config.__dict__)
+
+        metadata = self.config["head"][head].pop("META", dict())
+        self.config["head"][head]["description"] = metadata.get("description", "")
+        plugin_names = config.parse_csv(metadata.get("plugins_csv", ""))
+        self.config["head"][head]["PLUGINS"] = plugin_names
+        if resolution and resolution["plugins"] != plugin_names:
+            resolution = None
+
+        plugins_dict = {name: plugins.get_plugin(name) for name in plugin_names}
+        self.supply_with_plugins(head, plugins_dict, resolution["extensions"] if resolution else None)
+        self.store_plugins_to_config(head)
+        if not resolution:
+            config.save_resolution(config_class, plugin_names, self._plugin_resolvers[head].extensions)
+
+        for plugin in plugins_dict.values():
+            plugin_bp = plugins.get_plugin_blueprint(plugin)
+            if plugin_bp:
+                self.register_blueprint(plugin_bp, name_prefix=head, url_prefix=f"/{head}/plugins")
+
+    def _check_setup_finished(self, f_name):
+        # Blueprints of plugins of a head are registered when it is configured, while other heads serve requests
+        if getattr(self._head_resolution_state, "resolving", False):
+            return
+        super()._check_setup_finished(f_name)
+
+    def wsgi_app(self, environ, start_response):
+        # Heads are configured before requests are routed, so that routes of their plugins exist by then
+        head = environ.get("PATH_INFO", "").lstrip("/").split("/", 1)[0]
+        self.resolve_head(head)
+        return super().wsgi_app(environ, start_response)
+
     @property
     def current_head(self):
         return flask.request.blueprints[-1]
@@ -181,6 +273,9 @@ class PluginFriendlyMultiheadFlask(PluginFriendlyFlask):
             return dict()
         return self.get_config_option("PLUGINS")
 
+    def get_card_ids(self):
+        return self._card_ids_of_heads[self.current_head]
+
 
 def create_app():
     if "DATA_DIRS" in os.environ:
@@ -190,9 +285,24 @@ def create_app():
     return app
 
 
+def _flush_writes(response):
+    batch.flush()
+    return response
+
+
+def _end_writes(exc):
+    if batch.is_in_progress():
+        batch.end()
+
+
 def create_app_common(app):
     Bootstrap5(app)
 
+    # Saves of a request are merged into one write of every saved file, which happens before the response is sent
+    app.before_request(batch.begin)
+    app.after_request(_flush_writes)
+    app.teardown_request(_end_writes)
+
     LOGIN.init_app(app)
     LOGIN.user_loader(users.load_user)
     LOGIN.login_view = "login.auto_login"
@@ -248,21 +358,12 @@ def create_app_multihead(config_class=config.MultiheadConfig):
 
 
 def configure_head(app, directory):
-    config_class = simpledata.AppData
-    config_class.DATADIR = pathlib.Path(directory)
-    head_name = config_class.DATADIR.stem
-    app.config["head"][head_name]["DATA_DIR"] = config_class.DATADIR
-    app.config["head"][head_name].update(config.read_or_create_config(simpledata.AppData).__dict__)
-    # TODO: Consider e.g.
-    # config_class(directory).configure_elementary(app.config["head"][head_name])
-
-    metadata = app.config["head"][head_name].pop("META", dict())
-    app.config["head"][head_name]["description"] = metadata.get("description", "")
-    app.config["head"][head_name]["PLUGINS"] = config.parse_csv(metadata.get("plugins_csv", ""))
-
-    plugins_dict = {name: plugins.get_plugin(name) for name in app.config["head"][head_name]["PLUGINS"]}
-    app.supply_with_plugins(head_name, plugins_dict)
-    app.store_plugins_to_config(head_name)
+    """
+    Register the head of the directory, whose config and plugins are only read on its first request.
+    """
+    head_name = pathlib.Path(directory).stem
+    app.config["head"][head_name]["DATA_DIR"] = pathlib.Path(directory)
+    app.add_head_lazily(head_name, directory)
 
     # TODO: Consider e.g.
     # full_config = app.get_final_class("AppData")(directory)
@@ -274,9 +375,4 @@ def configure_head(app, directory):
     bp.register_blueprint(vis_bp, url_prefix="/vis")
     bp.register_blueprint(persons_bp)
 
-    for plugin in plugins_dict.values():
-        plugin_bp = plugins.get_plugin_blueprint(plugin)
-        if plugin_bp:
-            bp.register_blueprint(plugin_bp, url_prefix=f"/plugins")
-
     app.register_blueprint(bp)
@@ -1,7 +1,9 @@
 import os
 import datetime
+import json
 
 from ..simpledata import AppData
+from ..persistence import abstract
 
 
 def parse_csv(csv):
@@ -20,8 +22,14 @@ for key, val in os.environ.items():
         setattr(CacheConfig, key, val)
 
 
+def parse_bool(string):
+    return string.lower() in ("1", "true", "yes", "on")
+
+
 class CommonConfig(CacheConfig):
     SECRET_KEY = os.environ.get("SECRET_KEY")
+    # Let browsers draw charts from JSON data instead of fetching rendered SVGs
+    CLIENT_SIDE_CHARTS = parse_bool(os.environ.get("CLIENT_SIDE_CHARTS", "false"))
     LOGIN_PROVIDER_NAME = os.environ.get("LOGIN_PROVIDER_NAME", "autologin")
 
     GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID", None)
@@ -30,11 +38,14 @@ class CommonConfig(CacheConfig):
         "https://accounts.google.com/.well-known/openid-configuration"
     )
 
+    BACKEND = os.environ.get("BACKEND", "toml")
+    # Events can use a backend of their own, e.g. the binary "columnar" one
+    EVENTS_BACKEND = os.environ.get("EVENTS_BACKEND", BACKEND)
+
 
 class Config(CommonConfig):
     DATA_DIR = os.environ.get("DATA_DIR", "data")
     PLUGINS = parse_csv(os.environ.get("PLUGINS", ""))
-    BACKEND = os.environ.get("BACKEND", "toml")
 
 
 class MultiheadConfig(CommonConfig):
@@ -43,5 +54,48 @@ class MultiheadConfig(CommonConfig):
 
 def read_or_create_config(cls):
     config = cls.load()
-    config.save()
+    # Workers don't rewrite configs when they start, unless defaults of missing values should be written
+    if not config.is_stored_completely():
+        config.save()
     return config
+
+
+# Plugins of a head and extensions of classes by them, as resolved by the first worker that served the head
+RESOLUTION_BASENAME = ".resolved-plugins.json"
+
+
+def _get_config_mtime(cls):
+    try:
+        return os.stat(cls.CONFIG_FILENAME).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_resolution(cls):
+    """
+    Return the resolution of plugins saved alongside the config,
+    or None if there is none, or if the config has changed since it was saved.
+    """
+    try:
+        with open(cls.DATADIR / RESOLUTION_BASENAME) as f:
+            resolution = json.load(f)
+    except (OSError, ValueError):
+        return None
+    config_mtime = _get_config_mtime(cls)
+    if config_mtime is None or resolution.get("config_mtime") != config_mtime:
+        return None
+    return resolution
+
+
+def save_resolution(cls, plugin_names, extensions):
+    resolution = dict(
+        config_mtime=_get_config_mtime(cls),
+        plugins=list(plugin_names),
+        extensions=[list(extension) for extension in extensions],
+    )
+    try:
+        with abstract.replacing_file(cls.DATADIR / RESOLUTION_BASENAME) as f:
+            json.dump(resolution, f)
+    except OSError:
+        # Workers that can't save the resolution just resolve plugins themselves
+        pass
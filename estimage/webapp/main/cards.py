@@ -10,7 +10,7 @@ from .. import web_utils, routers
 from ... import simpledata as webdata
 from ... import history
 from ... import data
-from ... import utilities, statops, PluginResolver
+from ... import statops, PluginResolver
 from ...statops import summary
 
 
@@ -49,11 +49,12 @@ def view_task(task_name, breadcrumbs, mode, card_details=None):
     give_data_to_context(context, pollster, c_pollster)
 
     if card_details:
+        card_details.all_cards_by_id = card_r.all_cards_by_id
         card_details.setup_forms_according_to_context(context, task)
 
     similar_cards = []
     if context.estimation_source != "none":
-        similar_cards = get_similar_cards_with_estimations(task_name)
+        similar_cards = get_similar_cards_with_estimations(task_name, pollster)
         LIMIT = 8
         similar_cards["proj"] = similar_cards["proj"][:LIMIT]
         similar_cards["retro"] = similar_cards["retro"][:LIMIT - len(similar_cards["proj"])]
@@ -87,6 +88,8 @@ class ProjectiveDetails:
         self.forms = dict()
         self.sections_by_priority = dict()
         self._known_section_names = set()
+        # All cards of the request, so details of a card can take other cards into account
+        self.all_cards_by_id = dict()
         self.add_sections()
 
     def get_category(self, name):
@@ -228,7 +231,7 @@ def overview_retro():
     r = routers.AggregationRouter(mode="retro")
 
     tier0_cards = [t for t in r.all_cards_by_id.values() if t.tier == 0]
-    tier0_cards_tree_without_duplicates = utilities.reduce_subsets_from_sets(tier0_cards)
+    tier0_cards_tree_without_duplicates = data.reduce_subsets_of_cards(tier0_cards)
 
     summary = executive_summary_of_points_and_velocity(r, tier0_cards_tree_without_duplicates)
 
@@ -244,7 +247,7 @@ def completion():
     r = routers.AggregationRouter(mode="retro")
 
     tier0_cards = [t for t in r.all_cards_by_id.values() if t.tier == 0]
-    tier0_cards_tree_without_duplicates = utilities.reduce_subsets_from_sets(tier0_cards)
+    tier0_cards_tree_without_duplicates = data.reduce_subsets_of_cards(tier0_cards)
 
     summary = executive_summary_of_points_and_velocity(r, tier0_cards_tree_without_duplicates, statops.summary.StatSummary)
 
@@ -260,7 +263,7 @@ def tree_view_retro():
     r = routers.AggregationRouter(mode="retro")
 
     tier0_cards = [t for t in r.all_cards_by_id.values() if t.tier == 0]
-    tier0_cards_tree_without_duplicates = utilities.reduce_subsets_from_sets(tier0_cards)
+    tier0_cards_tree_without_duplicates = data.reduce_subsets_of_cards(tier0_cards)
 
     summary = executive_summary_of_points_and_velocity(r, tier0_cards_tree_without_duplicates)
     priority_sorted_cards = sorted(r.cards_tree_without_duplicates, key=lambda x: - x.priority)
@@ -277,28 +280,19 @@ def tell_of_bad_estimation_input(task_name, task_category, message):
     return msg
 
 
-def get_similar_cards_with_estimations(task_name):
-    rs = dict(
-        proj=routers.ModelRouter(mode="proj"),
-        retro=routers.ModelRouter(mode="retro"),
-    )
-    ref_task = rs["proj"].model.get_element(task_name)
+def get_similar_cards_with_estimations(task_name, private_pollster):
+    r = routers.SimilarityRouter(private_pollster=private_pollster)
+    ref_task = r.indices["proj"].tasks_by_name[task_name]
 
     ret = dict()
     for mode in ("proj", "retro"):
         similar_cards = []
 
-        r = rs[mode]
-        similar_tasks = get_similar_tasks(r, ref_task)
+        all_cards_by_id = r.all_cards_by_id[mode]
+        similar_tasks = r.indices[mode].get_nearby_tasks(ref_task, 0.5, 2)
         for task in similar_tasks:
-            card = r.all_cards_by_id[task.name]
+            card = all_cards_by_id[task.name]
             card.point_estimate = task.nominal_point_estimate
             similar_cards.append(card)
         ret[mode] = similar_cards
     return ret
-
-
-def get_similar_tasks(model_router, ref_task):
-    model = model_router.model
-    all_tasks = model.get_all_task_models()
-    return webdata.order_nearby_tasks(ref_task, all_tasks, 0.5, 2)
@@ -43,6 +43,7 @@ def act_on_global_estimate(task_name):
             _delete_global_estimate(task_name, r)
         else:
             flask.flash("Consensus not updated, request was not serious")
+        routers.PollsterRouter.clear_cache()
 
     return flask.redirect(
         web_utils.head_url_for("main.view_projective_task", task_name=task_name))
@@ -71,6 +72,7 @@ def move_consensus_estimate_to_authoritative(task_name):
         except Exception as exc:
             msg = f"Error updating the record: {exc}"
             flask.flash(msg)
+        routers.CardRouter.clear_cache()
 
     return cards.view_projective_task(task_name, dict(authoritative=form))
 
@@ -96,6 +98,7 @@ def estimate(task_name):
         _attempt_record_of_estimate(task_name, form, pollster)
         if r.private_pollster.knows_points(task_name):
             r.private_pollster.forget_points(task_name)
+        routers.PollsterRouter.clear_cache()
     else:
         msg = "There were following errors: "
         msg += ", ".join(form.get_all_errors())
@@ -168,6 +171,7 @@ def fix_problems(category):
     form.add_problems(r.problem_detector.problems)
     if form.validate_on_submit():
         _solve_problem_category(form, r.classifier, r.all_cards_by_id, r.cards_io)
+        routers.CardRouter.clear_cache()
     else:
         flask.flash(f"Error handing over solution: {form.errors}")
     return flask.redirect(
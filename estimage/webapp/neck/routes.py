@@ -26,5 +26,7 @@ def index():
 def get_heads_summaries():
     summaries = dict()
     for name in flask.current_app.config.get("head", frozenset()):
+        # Descriptions of heads are in their configs, which are read when heads are resolved
+        flask.current_app.resolve_head(name)
         summaries[name] = flask.current_app.config["head"][name].get("description")
     return summaries
@@ -1,10 +1,12 @@
 import collections
+import copy
 import pathlib
 
 import flask
 import flask_login
 
-from .. import data, simpledata, persistence, utilities, history, problems
+from .. import data, simpledata, persistence, history, problems
+from ..persistence.pollster import shards
 from . import CACHE
 
 
@@ -35,29 +37,26 @@ class IORouter(Router):
         super().__init__(** kwargs)
 
         self.io_backend = flask.current_app.config["BACKEND"]
+        self.events_backend = flask.current_app.config.get("EVENTS_BACKEND", self.io_backend)
         self.card_class = flask.current_app.get_final_class("BaseCard")
         self.storage_class = flask.current_app.get_final_class("Storage")
         # self.event_class = flask.current_app.get_final_class("Event")
         self.event_class = data.Event
         self.pollster_class = data.Pollster
 
-    @staticmethod
-    def _set_file_path(io, path):
-        io.LOAD_FILENAME = path
-        io.SAVE_FILENAME = path
-
-    def _get_io(self, of_what, stem, datadir=None):
-        ret = persistence.get_persistence(of_what, self.io_backend)
-        path = self._get_filepath(ret, stem, datadir)
-        self._set_file_path(ret, path)
-        return ret
+    def _get_io(self, of_what, stem, datadir=None, backend=None):
+        backend = backend or self.io_backend
+        path = self._get_filepath(of_what, stem, datadir, backend)
+        return persistence.get_persistence(of_what, backend, path)
 
     def get_event_io(self):
-        event_io = self._get_io(self.event_class, "events")
+        event_io = self._get_io(self.event_class, "events", backend=self.events_backend)
         return event_io
 
-    def get_user_pollster_io(self):
-        pollster_io = self._get_io(self.pollster_class, "pollster-user")
+    def get_user_pollster_io(self, username):
+        # Every user has their own file, so requests read and write only estimates of the requesting user
+        pollster_io = self._get_io(
+            self.pollster_class, shards.user_shard_stem(username), datadir=pathlib.Path("pollster-user"))
         return pollster_io
 
     def get_global_pollster_io(self):
@@ -68,14 +67,12 @@ class IORouter(Router):
         storage_io = self._get_io(self.storage_class, "storage")
         return storage_io
 
-    @staticmethod
-    def _get_filepath(io, stem, datadir):
+    def _get_filepath(self, of_what, stem, datadir, backend):
         if not datadir:
             datadir = pathlib.Path(".")
-        return datadir / io.stem_to_filename(stem)
+        return datadir / persistence.stem_to_filename(of_what, backend, stem)
 
     def get_card_io(self, mode):
-        cards_io = persistence.get_persistence(self.card_class, self.io_backend)
         if mode == "proj":
             stem = "projective"
         elif mode == "retro":
@@ -105,7 +102,10 @@ class CardRouter(IORouter):
 
         self.all_cards_by_id = self.get_all_cards_by_id()
         cards_list = list(self.all_cards_by_id.values())
-        self.cards_tree_without_duplicates = utilities.reduce_subsets_from_sets(cards_list)
+        self.cards_tree_without_duplicates = data.reduce_subsets_of_cards(cards_list)
+        # Loaded cards get their IDs, which events, progress and problem detection of the head share
+        self.card_ids = flask.current_app.get_card_ids()
+        self.card_ids.extend(self.all_cards_by_id)
 
     def get_all_cards_by_id(self):
         if self.mode == "retro":
@@ -127,24 +127,46 @@ class CardRouter(IORouter):
         super().clear_cache()
         keys = [gen_cache_key(stem) for stem in (cls.CACHE_STEM_PROJ, cls.CACHE_STEM_RETRO)]
         CACHE.delete_many(* keys)
+        SimilarityRouter.clear_cache()
 
     def _get_all_cards_by_id(self):
         ret = self.cards_io.get_loaded_cards_by_id(self.card_class)
         return ret
 
 
-class PollsterRouter(UserRouter, IORouter):
+class GlobalPollsterRouter(IORouter):
+    """
+    Provides the pollster that is the same for all users, so it doesn't need the current user.
+    """
     def __init__(self, ** kwargs):
         super().__init__(** kwargs)
 
         self.global_pollster = simpledata.AuthoritativePollster(io_cls=self.get_global_pollster_io())
-        self.private_pollster = simpledata.UserPollster(io_cls=self.get_user_pollster_io(), username=self.user_id)
         self.pollsters_as_dict = collections.OrderedDict()
         self.pollsters_as_dict["global"] = self.global_pollster
+
+    @classmethod
+    def clear_cache(cls):
+        super().clear_cache()
+        SimilarityRouter.clear_cache()
+
+
+class PollsterRouter(UserRouter, GlobalPollsterRouter):
+    def __init__(self, ** kwargs):
+        super().__init__(** kwargs)
+
+        self.private_pollster = simpledata.UserPollster(
+            io_cls=self.get_user_pollster_io(self.user_id), username=self.user_id)
         self.pollsters_as_dict["private"] = self.private_pollster
 
 
-class ModelRouter(PollsterRouter, CardRouter):
+class SharedModelRouter(GlobalPollsterRouter, CardRouter):
+    """
+    Model router whose model is the same for all users, as it doesn't use private estimates.
+    """
+    # Pollsters whose estimates the model uses, estimates of later ones take precedence
+    MODEL_POLLSTERS = ("global",)
+
     def __init__(self, ** kwargs):
         super().__init__(** kwargs)
 
@@ -156,7 +178,8 @@ class ModelRouter(PollsterRouter, CardRouter):
         self.model.update_cards_with_values(self.cards_tree_without_duplicates)
 
     def serve_pollsters_to_model(self):
-        for pollster_name, pollster in self.pollsters_as_dict.items():
+        for pollster_name in self.MODEL_POLLSTERS:
+            pollster = self.pollsters_as_dict[pollster_name]
             try:
                 pollster.supply_valid_estimations_to_tasks(self.model.get_all_task_models())
             except ValueError as exc:
@@ -164,6 +187,62 @@ class ModelRouter(PollsterRouter, CardRouter):
                 flask.flash(msg)
 
 
+# SharedModelRouter comes first, so it builds the model after PollsterRouter adds the private pollster
+class ModelRouter(SharedModelRouter, PollsterRouter):
+    MODEL_POLLSTERS = ("global", "private")
+
+
+class SimilarityRouter(Router):
+    """
+    Provides similarity indices of projective and retrospective tasks, and cards of those tasks.
+
+    Indices without private estimates are shared by all users of the head, and cached.
+    Private estimates of the supplied pollster are applied to them afterwards.
+    Clearing the cache bumps the generation of indices of the head.
+    """
+    CACHE_STEM = "similarity-indices"
+    CACHE_STEM_GENERATION = "similarity-indices-generation"
+
+    def __init__(self, ** kwargs):
+        super().__init__(** kwargs)
+
+        shared = self._get_cached_indices_and_cards()
+        private_pollster = kwargs["private_pollster"]
+        self.indices = dict()
+        self.all_cards_by_id = dict()
+        for mode, (index, all_cards_by_id) in shared.items():
+            self.indices[mode] = self._apply_private_estimates(index, private_pollster)
+            self.all_cards_by_id[mode] = all_cards_by_id
+
+    @staticmethod
+    def _apply_private_estimates(index, pollster):
+        known_estimates = pollster.provide_info_about(index.tasks_by_name.keys())
+        if not known_estimates:
+            return index
+        tasks_by_name = {name: copy.copy(index.tasks_by_name[name]) for name in known_estimates}
+        pollster.supply_known_estimates_to_tasks_and_get_failed_task_names(known_estimates, tasks_by_name)
+        return index.with_tasks_replaced(tasks_by_name.values())
+
+    @classmethod
+    def _get_cache_key(cls):
+        generation = CACHE.get(gen_cache_key(cls.CACHE_STEM_GENERATION)) or 0
+        return gen_cache_key(f"{cls.CACHE_STEM}-{generation}")
+
+    @CACHE.cached(timeout=60, key_prefix=lambda: SimilarityRouter._get_cache_key())
+    def _get_cached_indices_and_cards(self):
+        ret = dict()
+        for mode in ("proj", "retro"):
+            r = SharedModelRouter(mode=mode)
+            ret[mode] = (simpledata.SimilarityIndex(r.model.get_all_task_models()), r.all_cards_by_id)
+        return ret
+
+    @classmethod
+    def clear_cache(cls):
+        super().clear_cache()
+        key = gen_cache_key(cls.CACHE_STEM_GENERATION)
+        CACHE.set(key, (CACHE.get(key) or 0) + 1, timeout=0)
+
+
 class ProblemRouter(ModelRouter):
     def __init__(self, ** kwargs):
         super().__init__(** kwargs)
@@ -171,7 +250,7 @@ class ProblemRouter(ModelRouter):
         all_cards = list(self.all_cards_by_id.values())
         detector_cls = flask.current_app.get_final_class("ProblemDetector")
         self.problem_detector = detector_cls()
-        self.problem_detector.detect(self.model, all_cards, self.pollsters_as_dict)
+        self.problem_detector.detect(self.model, all_cards, self.pollsters_as_dict, self.card_ids)
 
         self.classifier = problems.groups.ProblemClassifier()
         self.classifier.classify(self.problem_detector.problems)
@@ -207,6 +286,6 @@ class AggregationRouter(ModelRouter):
         return self.get_aggregation_of_cards(cards)
 
     def get_aggregation_of_cards(self, cards):
-        ret = history.Aggregation.from_cards(cards, self.start, self.end, self.statuses)
+        ret = history.Aggregation.from_cards(cards, self.start, self.end, self.statuses, self.card_ids)
         ret.process_event_manager(self.all_events)
         return ret
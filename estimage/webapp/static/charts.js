@@ -0,0 +1,127 @@
+// Renders charts described by the JSON endpoints of the vis blueprint.
+// Every <svg data-chart-src="..."> element is filled by a chart fetched from that URL.
+(function () {
+    "use strict";
+
+    const SVG_NS = "http://www.w3.org/2000/svg";
+    const MARGIN = {left: 40, right: 8, top: 8, bottom: 24};
+
+    function decodeArray(encoded) {
+        if (encoded.encoding === "delta-int") {
+            let accumulator = 0;
+            return encoded.data.map((delta) => accumulator += delta);
+        }
+        if (encoded.encoding === "float32-base64") {
+            const binary = atob(encoded.data);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            return Array.from(new Float32Array(bytes.buffer));
+        }
+        throw new Error(`Unknown array encoding ${encoded.encoding}`);
+    }
+
+    function createElement(name, attributes) {
+        const element = document.createElementNS(SVG_NS, name);
+        for (const [key, value] of Object.entries(attributes)) {
+            element.setAttribute(key, value);
+        }
+        return element;
+    }
+
+    function padRange(low, high) {
+        const extent = (high - low) || 1;
+        return [low - extent * 0.05, high + extent * 0.05];
+    }
+
+    function getDimensions(svg) {
+        const viewBox = svg.viewBox.baseVal;
+        return {width: viewBox.width, height: viewBox.height};
+    }
+
+    function stackAreas(chart, x) {
+        const until = chart.stacked_until === null ? x.length - 1 : chart.stacked_until;
+        let bottom = new Array(x.length).fill(0);
+        const areas = [];
+        for (const series of chart.stacked) {
+            const values = decodeArray(series.values);
+            const top = values.map((v, i) => v + bottom[i]);
+            if (values.some((v) => v > 0)) {
+                areas.push({series: series, top: top.slice(0, until + 1), bottom: bottom.slice(0, until + 1)});
+            }
+            bottom = top;
+        }
+        return areas;
+    }
+
+    function render(svg, chart) {
+        const x = decodeArray(chart.x);
+        const areas = stackAreas(chart, x);
+        const lines = chart.lines.map((series) => ({series: series, values: decodeArray(series.values)}));
+        const small = svg.classList.contains("chart-small");
+        const margin = small ? {left: 0, right: 0, top: 0, bottom: 0} : MARGIN;
+
+        const allY = [0];
+        areas.forEach((a) => allY.push(...a.top));
+        lines.forEach((l) => allY.push(...l.values));
+        const [xMin, xMax] = padRange(Math.min(...x), Math.max(...x));
+        const [yMin, yMax] = padRange(Math.min(...allY), Math.max(...allY));
+
+        const {width, height} = getDimensions(svg);
+        const plotWidth = width - margin.left - margin.right;
+        const plotHeight = height - margin.top - margin.bottom;
+        const toX = (v) => margin.left + (v - xMin) / (xMax - xMin) * plotWidth;
+        const toY = (v) => margin.top + plotHeight - (v - yMin) / (yMax - yMin) * plotHeight;
+        const points = (xs, ys) => xs.map((v, i) => `${toX(v).toFixed(2)},${toY(ys[i]).toFixed(2)}`).join(" ");
+
+        svg.replaceChildren();
+        for (const area of areas) {
+            const xs = x.slice(0, area.top.length);
+            const outline = points(xs, area.top) + " " + points(xs.slice().reverse(), area.bottom.slice().reverse());
+            const polygon = createElement("polygon", {points: outline, fill: area.series.color, stroke: "white", "stroke-width": 0.5});
+            polygon.appendChild(createElement("title", {})).textContent = area.series.label;
+            svg.appendChild(polygon);
+        }
+        for (const line of lines) {
+            const polyline = createElement("polyline", {points: points(x, line.values), fill: "none", stroke: line.series.color, "stroke-width": 1.5});
+            polyline.appendChild(createElement("title", {})).textContent = line.series.label;
+            svg.appendChild(polyline);
+        }
+        for (const marker of chart.markers) {
+            const position = toX(marker.x);
+            const line = createElement("line", {x1: position, x2: position, y1: margin.top, y2: margin.top + plotHeight, stroke: marker.color, "stroke-width": 2});
+            line.appendChild(createElement("title", {})).textContent = marker.label;
+            svg.appendChild(line);
+        }
+        if (!small) {
+            renderAxes(svg, chart, margin, plotWidth, plotHeight, toY, [yMin, yMax]);
+        }
+    }
+
+    function renderAxes(svg, chart, margin, plotWidth, plotHeight, toY, yRange) {
+        const style = {fill: "currentColor", "font-size": 10};
+        svg.appendChild(createElement("rect", {x: margin.left, y: margin.top, width: plotWidth, height: plotHeight, fill: "none", stroke: "grey"}));
+        const ticks = 5;
+        for (let i = 0; i <= ticks; i++) {
+            const value = yRange[0] + (yRange[1] - yRange[0]) * i / ticks;
+            const label = createElement("text", Object.assign({x: margin.left - 4, y: toY(value), "text-anchor": "end"}, style));
+            label.textContent = value.toPrecision(2);
+            svg.appendChild(label);
+        }
+        const xlabel = createElement("text", Object.assign({x: margin.left + plotWidth / 2, y: margin.top + plotHeight + 16, "text-anchor": "middle"}, style));
+        xlabel.textContent = chart.xlabel;
+        svg.appendChild(xlabel);
+    }
+
+    function renderAllCharts() {
+        for (const svg of document.querySelectorAll("svg[data-chart-src]")) {
+            fetch(svg.dataset.chartSrc)
+                .then((response) => response.json())
+                .then((chart) => render(svg, chart))
+                .catch((error) => console.error(`Couldn't render chart from ${svg.dataset.chartSrc}: ${error}`));
+        }
+    }
+
+    document.addEventListener("DOMContentLoaded", renderAllCharts);
+})();
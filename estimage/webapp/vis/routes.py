@@ -7,7 +7,6 @@ import flask_login
 import markupsafe
 
 import numpy as np
-import matplotlib
 
 from . import bp
 from .. import web_utils, routers
@@ -51,6 +50,20 @@ def send_figure_as(figure, basename, output_string):
     return flask.send_file(bytesio, download_name=filename, mimetype="image/svg+xml")
 
 
+def send_svg_string(svg_string, basename):
+    output_type = OUTPUT_TYPES["svg"]
+    filename = f"{basename}.{output_type.extension}"
+
+    bytesio = io.BytesIO(svg_string.encode())
+    return flask.send_file(bytesio, download_name=filename, mimetype=output_type.mimetype)
+
+
+def send_chart_data(chart_data):
+    response = flask.jsonify(chart_data)
+    response.add_etag()
+    return response.make_conditional(flask.request)
+
+
 def get_pert_in_figure(estimation, task_name):
     pert_class = flask.current_app.get_final_class("PertPlotter")
     fig = pert.get_pert_in_figure(estimation, task_name, pert_class)
@@ -59,9 +72,7 @@ def get_pert_in_figure(estimation, task_name):
     return fig
 
 
-@bp.route('/completion.svg')
-@flask_login.login_required
-def visualize_completion():
+def get_completion_plotter():
     router = routers.AggregationRouter(mode="retro")
     tier0_cards = [c for c in router.cards_tree_without_duplicates if c.tier == 0]
     aggregation = router.get_aggregation_of_cards(tier0_cards)
@@ -88,16 +99,27 @@ def visualize_completion():
     time_dom = np.concatenate(([0, max(0, time_dom[0] - 1)], time_dom))
     completion_cdf = np.concatenate(([0, 0], completion_cdf))
 
-    matplotlib.use("svg")
-
     completion_class = flask.current_app.get_final_class("MPLCompletionPlot")
+    return completion_class((aggregation.start, aggregation.end), time_dom, completion_cdf, ppf)
+
 
-    fig = completion_class(
-        (aggregation.start, aggregation.end), time_dom, completion_cdf, ppf).get_figure()
+@bp.route('/completion.svg')
+@flask_login.login_required
+def visualize_completion():
+    plotter = get_completion_plotter()
+
+    utils.use_svg_backend()
+    fig = plotter.get_figure()
     fig.set_size_inches(* NORMAL_FIGURE_SIZE)
     return send_figure_as(fig, "completion", "svg")
 
 
+@bp.route('/completion.json')
+@flask_login.login_required
+def get_completion_data():
+    return send_chart_data(get_completion_plotter().get_chart_data())
+
+
 @bp.route('/velocity-fit.svg')
 @flask_login.login_required
 def visualize_velocity_fit():
@@ -107,7 +129,7 @@ def visualize_velocity_fit():
     velocity_array = aggregation.get_velocity_array()
     nonzero_weekly_velocity = func.get_nonzero_velocity(velocity_array) * 7
 
-    matplotlib.use("svg")
+    utils.use_svg_backend()
 
     fit_class = flask.current_app.get_final_class("VelocityFitPlot")
 
@@ -116,41 +138,57 @@ def visualize_velocity_fit():
     return send_figure_as(fig, "completion", "svg")
 
 
-@bp.route('/<epic_name>-velocity.svg')
-@flask_login.login_required
-def visualize_velocity_of_epic(epic_name):
-    velocity_class = flask.current_app.get_final_class("MPLVelocityPlot")
+def get_epic_aggregation(epic_name):
+    r = routers.AggregationRouter(mode="retro")
+    return r.get_aggregation_of_names([epic_name])
+
 
+def get_complete_aggregation():
     r = routers.AggregationRouter(mode="retro")
-    aggregation = r.get_aggregation_of_names([epic_name])
+    return r.aggregation
 
+
+def output_velocity(aggregation, basename):
+    velocity_class = flask.current_app.get_final_class("MPLVelocityPlot")
     cutoff_date = min(datetime.datetime.today(), aggregation.end)
 
-    matplotlib.use("svg")
+    utils.use_svg_backend()
     fig = velocity_class(aggregation).get_figure(cutoff_date)
     fig.set_size_inches(* NORMAL_FIGURE_SIZE)
-    return send_figure_as(fig, epic_name, "svg")
+    return send_figure_as(fig, basename, "svg")
 
 
-@bp.route('/velocity-complete.svg')
-@flask_login.login_required
-def visualize_complete_velocity():
+def output_velocity_data(aggregation):
     velocity_class = flask.current_app.get_final_class("MPLVelocityPlot")
+    cutoff_date = min(datetime.datetime.today(), aggregation.end)
+    return send_chart_data(velocity_class(aggregation).get_chart_data(cutoff_date))
 
-    r = routers.AggregationRouter(mode="retro")
-    aggregation = r.aggregation
 
-    cutoff_date = min(datetime.datetime.today(), aggregation.end)
+@bp.route('/<epic_name>-velocity.svg')
+@flask_login.login_required
+def visualize_velocity_of_epic(epic_name):
+    return output_velocity(get_epic_aggregation(epic_name), epic_name)
 
-    matplotlib.use("svg")
-    fig = velocity_class(aggregation).get_figure(cutoff_date)
-    fig.set_size_inches(* NORMAL_FIGURE_SIZE)
-    return send_figure_as(fig, "all", "svg")
 
+@bp.route('/<epic_name>-velocity.json')
+@flask_login.login_required
+def get_velocity_data_of_epic(epic_name):
+    return output_velocity_data(get_epic_aggregation(epic_name))
 
-@bp.route('/all_tasks-<nominal_or_remaining>-pert.svg')
+
+@bp.route('/velocity-complete.svg')
 @flask_login.login_required
-def visualize_all_projective_tasks(nominal_or_remaining):
+def visualize_complete_velocity():
+    return output_velocity(get_complete_aggregation(), "all")
+
+
+@bp.route('/velocity-complete.json')
+@flask_login.login_required
+def get_complete_velocity_data():
+    return output_velocity_data(get_complete_aggregation())
+
+
+def get_all_projective_tasks_estimation(nominal_or_remaining):
     allowed_modes = ("nominal", "remaining")
     if nominal_or_remaining not in allowed_modes:
         msg = (
@@ -167,11 +205,21 @@ def visualize_all_projective_tasks(nominal_or_remaining):
         estimation = r.model.nominal_point_estimate
     else:
         estimation = r.model.remaining_point_estimate
+    return estimation
 
-    matplotlib.use("svg")
-    fig = get_pert_in_figure(estimation, "all")
 
-    return send_figure_as(fig, "all", "svg")
+@bp.route('/all_tasks-<nominal_or_remaining>-pert.svg')
+@flask_login.login_required
+def visualize_all_projective_tasks(nominal_or_remaining):
+    estimation = get_all_projective_tasks_estimation(nominal_or_remaining)
+    return visualize_estimation("all", estimation)
+
+
+@bp.route('/all_tasks-<nominal_or_remaining>-pert.json')
+@flask_login.login_required
+def get_all_projective_tasks_data(nominal_or_remaining):
+    estimation = get_all_projective_tasks_estimation(nominal_or_remaining)
+    return output_estimation_data("all", estimation)
 
 
 @bp.route('/<task_name>-<mode>-remaining-pert.svg')
@@ -182,6 +230,14 @@ def visualize_task_remaining(task_name, mode):
     return visualize_estimation(task_name, estimation)
 
 
+@bp.route('/<task_name>-<mode>-remaining-pert.json')
+@flask_login.login_required
+def get_task_remaining_data(task_name, mode):
+    r = routers.ModelRouter(mode=mode)
+    estimation = r.model.remaining_point_estimate_of(task_name)
+    return output_estimation_data(task_name, estimation)
+
+
 @bp.route('/<task_name>-<mode>-nominal-pert.svg')
 @flask_login.login_required
 def visualize_task_nominal(task_name, mode):
@@ -190,13 +246,26 @@ def visualize_task_nominal(task_name, mode):
     return visualize_estimation(task_name, estimation)
 
 
+@bp.route('/<task_name>-<mode>-nominal-pert.json')
+@flask_login.login_required
+def get_task_nominal_data(task_name, mode):
+    r = routers.ModelRouter(mode=mode)
+    estimation = r.model.nominal_point_estimate_of(task_name)
+    return output_estimation_data(task_name, estimation)
+
+
 def visualize_estimation(task_name, estimation):
-    matplotlib.use("svg")
+    utils.use_svg_backend()
     fig = get_pert_in_figure(estimation, task_name)
 
     return send_figure_as(fig, task_name, "svg")
 
 
+def output_estimation_data(task_name, estimation):
+    pert_class = flask.current_app.get_final_class("PertPlotter")
+    return send_chart_data(pert_class(task_name, estimation).get_chart_data())
+
+
 @bp.route('/<epic_name>-burndown-<size>.svg')
 @flask_login.login_required
 def visualize_epic_burndown(epic_name, size):
@@ -205,10 +274,14 @@ def visualize_epic_burndown(epic_name, size):
         msg = f"Figure size must be one of {allowed_sizes}, got '{size}' instead."
         raise ValueError(msg)
 
-    r = routers.AggregationRouter(mode="retro")
-    a = r.get_aggregation_of_names([epic_name])
+    return output_burndown(get_epic_aggregation(epic_name), size)
 
-    return output_burndown(a, size)
+
+@bp.route('/<epic_name>-burndown.json')
+@flask_login.login_required
+def get_epic_burndown_data(epic_name):
+    burndown_class = flask.current_app.get_final_class("MPLPointPlot")
+    return send_chart_data(burndown_class(get_epic_aggregation(epic_name)).get_chart_data())
 
 
 @bp.route('/tier<tier>-burndown-<size>.svg')
@@ -218,21 +291,35 @@ def visualize_overall_burndown(tier, size):
     if size not in allowed_sizes:
         msg = f"Figure size must be one of {allowed_sizes}, got '{size}' instead."
         raise ValueError(msg)
+    return output_burndown(get_tier_aggregation(tier), size)
+
+
+@bp.route('/tier<tier>-burndown.json')
+@flask_login.login_required
+def get_overall_burndown_data(tier):
+    burndown_class = flask.current_app.get_final_class("MPLPointPlot")
+    return send_chart_data(burndown_class(get_tier_aggregation(tier)).get_chart_data())
+
+
+def get_tier_aggregation(tier):
     if (tier := int(tier)) < 0:
         msg = "Tier must be a non-negative number, got {tier}"
         raise ValueError(msg)
 
     r = routers.AggregationRouter(mode="retro")
     right_tier_cards = [c for c in r.cards_tree_without_duplicates if c.tier <= 0]
-    aggregation = r.get_aggregation_of_cards(right_tier_cards)
-
-    return output_burndown(aggregation, size)
+    return r.get_aggregation_of_cards(right_tier_cards)
 
 
 def output_burndown(aggregation, size):
     burndown_class = flask.current_app.get_final_class("MPLPointPlot")
+    basename = flask.request.path.split("/")[-1]
+
+    if size == "small" and burndown_class.SMALL_FIGURE_BACKEND == "svg":
+        svg_string = burndown_class(aggregation).get_small_svg(SMALL_FIGURE_SIZE)
+        return send_svg_string(svg_string, basename)
 
-    matplotlib.use("svg")
+    utils.use_svg_backend()
     if size == "small":
         fig = burndown_class(aggregation).get_small_figure()
         fig.set_size_inches(* SMALL_FIGURE_SIZE)
@@ -243,6 +330,4 @@ def output_burndown(aggregation, size):
         fig = burndown_class(aggregation).get_figure()
         fig.set_size_inches(* NORMAL_FIGURE_SIZE)
 
-    basename = flask.request.path.split("/")[-1]
-
     return send_figure_as(fig, basename, "svg")
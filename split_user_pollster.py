@@ -0,0 +1,40 @@
+"""
+Move estimates of users from the 'pollster-user' file that holds estimates of all users
+to files of individual users in the 'pollster-user' directory, which the app reads since it shards them.
+
+Run it in the data directory of the app, or pass the directory as an argument:
+
+    python split_user_pollster.py [data directory] [--backend toml]
+
+The original file is left in place, so it can be removed once the app works with the split estimates.
+"""
+import argparse
+import pathlib
+
+from estimage import data, persistence
+import estimage.persistence.pollster
+from estimage.persistence.pollster import shards
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Split estimates of users to files of individual users.")
+    parser.add_argument("datadir", nargs="?", default=".", type=pathlib.Path)
+    parser.add_argument("--backend", default="toml", choices=("ini", "toml"))
+    return parser.parse_args()
+
+
+def main(datadir, backend):
+    source = datadir / persistence.stem_to_filename(data.Pollster, backend, "pollster-user")
+    if not source.is_file():
+        print(f"There is no '{source}' to split.")
+        return
+    shards_dir = datadir / "pollster-user"
+    usernames = shards.split_user_pollster(
+        persistence.get_persistence(data.Pollster, backend, source),
+        lambda username: shards.get_user_shard_io(backend, shards_dir, username))
+    print(f"Split estimates of {len(usernames)} users from '{source}' to '{shards_dir}'.")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.datadir, args.backend)
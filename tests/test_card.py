@@ -1,12 +1,15 @@
 import datetime
 import os
+import random
+import sys
 
 import pytest
 
-from estimage import persistence
+from estimage import persistence, PluginResolver
 from estimage.persistence.card import memory
 
 import estimage.data as tm
+from estimage import utilities
 from estimage.entities import card, status
 
 from tests.test_inidata import temp_filename, get_file_based_io
@@ -380,3 +383,115 @@ def test_save_something2_load_same(card_io):
 
     assert card.name == data2.name
     assert card.title == data2.title
+
+
+def _make_random_forest(size, seed):
+    rng = random.Random(seed)
+    cards = [tm.BaseCard(f"card-{i}") for i in range(size)]
+    for position, c in enumerate(cards[1:], 1):
+        if rng.random() < 0.8:
+            cards[rng.randrange(position)].add_element(c)
+    return cards
+
+
+def test_family_index_matches_containment():
+    cards = _make_random_forest(60, 2)
+    expected = [[contained in container for contained in cards] for container in cards]
+
+    index = tm.CardFamilyIndex(cards)
+    assert index.valid
+    assert all(index.covers(c) for c in cards)
+    assert [[contained in container for contained in cards] for container in cards] == expected
+
+
+def test_family_index_gets_invalidated(subtree_card, standalone_leaf_card):
+    index = tm.CardFamilyIndex([subtree_card, standalone_leaf_card])
+    subtree_card.add_element(standalone_leaf_card)
+    assert not index.valid
+    assert standalone_leaf_card in subtree_card
+
+
+def test_family_index_refuses_cycles(subtree_card, leaf_card):
+    leaf_card.children.append(subtree_card)
+    index = tm.CardFamilyIndex([subtree_card])
+    assert not index.valid
+    assert not index.covers(leaf_card)
+
+
+def test_reduce_subsets_of_cards_matches_generic_reduction():
+    cards = _make_random_forest(200, 0)
+    rng = random.Random(1)
+    selections = [rng.choices(cards, k=50) for _ in range(20)]
+
+    expected = [utilities.reduce_subsets_from_sets(selection) for selection in selections]
+    tm.CardFamilyIndex(cards)
+    for selection, reference in zip(selections, expected):
+        assert tm.reduce_subsets_of_cards(selection) == reference
+    assert tm.reduce_subsets_of_cards([]) == []
+
+
+def test_loaded_cards_are_indexed(card_io, tree_card, standalone_leaf_card, leaf_card):
+    card_io.bulk_save_metadata([tree_card, tree_card.children[0], leaf_card, standalone_leaf_card])
+    cards_by_id = card_io.get_loaded_cards_by_id()
+    index = cards_by_id["tree"]._family_index
+    assert index.covers(cards_by_id["leaf"])
+    assert cards_by_id["leaf"] in cards_by_id["tree"]
+    assert cards_by_id["tree"] not in cards_by_id["leaf"]
+    reduced = tm.reduce_subsets_of_cards(list(cards_by_id.values()))
+    assert {c.name for c in reduced} == {"tree", "feal"}
+
+
+def test_slotted_card_load_and_save_values(card_io):
+    base_card_load_save(card_io, tm.SlottedBaseCard, fill_card_instance_with_stuff, assert_cards_are_equal)
+
+
+def test_loaded_card_strings_are_interned(card_io):
+    one = tm.BaseCard("".join(["o", "ne"]))
+    fill_card_instance_with_stuff(one)
+    one.save_metadata(card_io)
+
+    loaded_one = card_io.get_loaded_cards_by_id(tm.SlottedBaseCard)["one"]
+    assert not hasattr(loaded_one, "__dict__")
+    assert loaded_one.name is sys.intern("one")
+    assert loaded_one.status is sys.intern("in_progress")
+    assert loaded_one.assignee is sys.intern("trubador")
+    assert loaded_one.collaborators[0] is sys.intern("a")
+
+
+class SlottedCardExtension:
+    extra: int = 0
+
+
+class SlottedCardPlugin:
+    EXPORTS = dict(BaseCard="SlottedCardExtension")
+    SlottedCardExtension = SlottedCardExtension
+
+
+def test_slotted_card_is_extendable():
+    resolver = PluginResolver()
+    resolver.add_extendable_class("BaseCard", tm.SlottedBaseCard)
+    resolver.resolve_extension(SlottedCardPlugin)
+    card_class = resolver.get_final_class("BaseCard")
+    assert issubclass(card_class, tm.SlottedBaseCard)
+    assert persistence.get_persistence(card_class, "memory")
+
+    one = card_class("one")
+    assert one.__dict__ == dict()
+    one.extra = 1
+    assert one.__dict__ == dict(extra=1)
+    one.add_element(card_class("two"))
+    assert one.children[0].name == "two"
+
+
+def test_file_bound_card_io_is_cached(temp_filename):
+    io = persistence.get_persistence(tm.BaseCard, "ini", temp_filename)
+    assert io.LOAD_FILENAME == temp_filename
+    assert io.SAVE_FILENAME == temp_filename
+    assert persistence.get_persistence(tm.BaseCard, "ini", temp_filename) is io
+    assert persistence.get_persistence(tm.BaseCard, "toml", temp_filename) is not io
+    assert persistence.get_persistence(tm.BaseCard, "ini") is not persistence.get_persistence(tm.BaseCard, "ini")
+
+    resolver = PluginResolver()
+    resolver.add_extendable_class("BaseCard", tm.BaseCard)
+    resolver.resolve_extension(SlottedCardPlugin)
+    assert persistence.get_persistence(tm.BaseCard, "ini", temp_filename) is not io
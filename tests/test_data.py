@@ -1,4 +1,7 @@
 import math
+import pickle
+import subprocess
+import sys
 
 import pytest
 
@@ -168,3 +171,30 @@ def test_composition():
     assert c.remaining_point_estimate.expected == 2
     c2.unmask()
     assert c.remaining_point_estimate.expected == 6
+
+
+def test_symbol_table():
+    table = tm.SymbolTable(["b", "a", "b"])
+    assert len(table) == 2
+    assert list(table) == ["b", "a"]
+    assert table["a"] == 1
+    assert table.id_of("c") == 2
+    assert table.name_of(2) == "c"
+    assert "c" in table
+    assert list(table.ids_of(["c", "b", "b"])) == [2, 0, 0]
+    with pytest.raises(KeyError, match="d"):
+        table.ids_of(["a", "d"])
+    assert "d" not in table
+
+    copied = pickle.loads(pickle.dumps(table))
+    assert copied.id_of("d") == 3
+    assert "d" not in table
+
+
+def test_scipy_is_loaded_only_when_needed():
+    script = (
+        "import sys; import estimage.data as d; "
+        "assert 'scipy.stats' not in sys.modules; "
+        "d.Estimate.from_triple(2, 1, 3).get_pert(); "
+        "assert 'scipy.stats' in sys.modules")
+    subprocess.run([sys.executable, "-c", script], check=True)
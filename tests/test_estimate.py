@@ -361,3 +361,83 @@ def test_compute_from_EVS():
     )
     for triple in test_triples:
         _test_consistency_of_triple(triple)
+
+
+@pytest.fixture
+def bunch_of_triples():
+    most_likely = np.array([0, 1, 3, 4, 2, 5])
+    optimistic = np.array([0, 0, 2, 4, 1, 1])
+    pessimistic = np.array([0, 3, 8, 4, 2, 12])
+    return most_likely, optimistic, pessimistic
+
+
+def test_estimate_array_matches_estimates(bunch_of_triples):
+    estimates = tm.EstimateArray.from_triple(* bunch_of_triples)
+    assert len(estimates) == 6
+    for i, triple in enumerate(zip(* bunch_of_triples)):
+        reference = tm.Estimate.from_triple(* triple)
+        assert estimates[i].expected == reference.expected
+        assert estimates[i].sigma == reference.sigma
+        assert estimates[i].source == reference.source
+        assert estimates.skewness[i] == pytest.approx(reference.skewness)
+
+    inputs = [e.source for e in estimates.to_estimates()]
+    np.testing.assert_array_equal(tm.EstimateArray.from_inputs(inputs).expected, estimates.expected)
+
+
+def test_estimate_array_refuses_invalid_triples(bunch_of_triples):
+    most_likely, optimistic, pessimistic = bunch_of_triples
+    most_likely[1] = 5
+    valid = tm.EstimateArray.triples_are_valid(most_likely, optimistic, pessimistic)
+    assert list(valid) == [True, False, True, True, True, True]
+    with pytest.raises(ValueError, match="1 estimates"):
+        tm.EstimateArray.from_triple(most_likely, optimistic, pessimistic)
+
+
+def test_estimate_array_composition(bunch_of_triples):
+    estimates = tm.EstimateArray.from_triple(* bunch_of_triples)
+    others = estimates[::-1]
+    composed = estimates.compose_using_parameters(others)
+    for i in range(len(estimates)):
+        reference = estimates[i].compose_using_parameters(others[i])
+        assert composed[i].expected == pytest.approx(reference.expected)
+        assert composed[i].sigma == pytest.approx(reference.sigma)
+        assert composed[i].source.optimistic == pytest.approx(reference.source.optimistic)
+        assert composed[i].source.pessimistic == pytest.approx(reference.source.pessimistic)
+
+
+def test_pert_tables_are_reused_safely():
+    est = tm.Estimate.from_triple(4, 2, 9)
+    pert = est.get_pert(50)
+    pert[1][:] = 0
+    same_pert = tm.Estimate.from_triple(4, 2, 9).get_pert(50)
+    assert same_pert[1].sum() > 0
+    np.testing.assert_array_equal(same_pert[0], pert[0])
+
+    dense_pert = est.get_pert_of_given_density()
+    np.testing.assert_array_equal(dense_pert[1], est.get_pert(dom=dense_pert[0])[1])
+
+
+def test_tabulated_sampling_statistics():
+    est = tm.Estimate.from_triple(4, 2, 9)
+    np.random.seed(0)
+    samples = est.pert_rvs(200000)
+    assert samples.min() >= 2
+    assert samples.max() <= 9
+    assert samples.mean() == pytest.approx(est.expected, rel=1e-2)
+    assert samples.std() == pytest.approx(est.sigma, rel=1e-2)
+
+
+def test_slotted_estimates():
+    est = tm.SlottedEstimate.from_triple(2, 1, 4)
+    assert isinstance(est.source, tm.SlottedEstimInput)
+    assert est.__dict__ == dict()
+    assert est.source.__dict__ == dict()
+    reference = tm.Estimate.from_triple(2, 1, 4)
+    assert est.expected == reference.expected
+    assert est.sigma == reference.sigma
+    assert est.pert_beta_a == reference.pert_beta_a
+
+    inp = tm.SlottedEstimInput.from_parameters(est.expected, est.variance, 0.2, gamma=3)
+    assert inp.GAMMA == 3
+    assert tm.SlottedEstimInput.GAMMA == 4
@@ -1,10 +1,12 @@
 import datetime
 import os
+import sys
 import tempfile
 
 import pytest
 
 import estimage.entities.event as data
+from estimage.entities.symbols import SymbolTable
 from estimage.persistence.event import memory, ini
 
 from tests.test_inidata import temp_filename, get_file_based_io
@@ -40,7 +42,7 @@ def late_event():
     return late_event
 
 
-@pytest.fixture(params=("ini", "memory", "toml"))
+@pytest.fixture(params=("ini", "memory", "toml", "columnar"))
 def event_io(request, temp_filename):
     io = get_file_based_io(data.Event, request.param, temp_filename)
     yield io
@@ -70,6 +72,25 @@ def test_event_manager(mgr, early_event, less_early_event):
     assert events == {None: [early_event, less_early_event]}
 
 
+def test_event_manager_by_ids(mgr, event_io, early_event, less_early_event):
+    with pytest.raises(RuntimeError):
+        mgr.get_chronological_event_columns_by_type_of([0])
+    mgr.add_event(early_event)
+    mgr.save(event_io)
+    mgr.load(event_io)
+
+    card_ids = SymbolTable(["other"])
+    mgr.index_by(card_ids)
+    columns = mgr.get_chronological_event_columns_by_type_of([card_ids.id_of("later"), 0])
+    assert columns == [dict(), dict()]
+    columns, = mgr.get_chronological_event_columns_by_type_of([card_ids[early_event.task_name]])
+    assert list(columns[None]) == [early_event]
+
+    mgr.add_event(less_early_event)
+    columns, = mgr.get_chronological_event_columns_by_type_of([card_ids[early_event.task_name]])
+    assert list(columns[None]) == [early_event, less_early_event]
+
+
 def test_event_manager_erase(mgr, event_io, early_event, less_early_event):
     mgr.add_event(less_early_event)
     mgr.add_event(early_event)
@@ -180,3 +201,94 @@ def test_eventmgr_storage_state(event_io, early_event):
     assert mgr_two.get_chronological_task_events_by_type(early_event.task_name) == {"state": [early_event]}
 
 
+
+
+def test_slotted_events_load_with_interned_strings(event_io, early_event):
+    mgr_one = data.EventManager()
+    early_event.task_name = "".join(["ta", "sk"])
+    early_event.value_after = "done"
+    early_event.value_before = "in_progress"
+    early_event.quantity = "state"
+    mgr_one.add_event(early_event)
+    mgr_one.save(event_io)
+
+    slotted_io = type("slotted_io", (event_io,), dict(EVENT_CLASS=data.SlottedEvent))
+    mgr_two = data.EventManager()
+    mgr_two.load(slotted_io)
+    loaded = mgr_two.get_chronological_task_events_by_type("task")["state"][0]
+    assert isinstance(loaded, data.SlottedEvent)
+    assert not hasattr(loaded, "__dict__")
+    assert str(loaded) == str(early_event)
+    assert loaded.task_name is sys.intern("task")
+    assert loaded.value_after is sys.intern("done")
+
+
+def test_event_columns_are_decoded_like_events(event_io, early_event, less_early_event, late_event):
+    early_event.quantity = "points"
+    early_event.value_after = 3.5
+    less_early_event.quantity = "state"
+    less_early_event.value_before = "3"
+    less_early_event.value_after = "done"
+    late_event.quantity = "points"
+    late_event.task_name = "other"
+    mgr = data.EventManager()
+    for evt in (late_event, less_early_event, early_event):
+        mgr.add_event(evt)
+    mgr.save(event_io)
+
+    with event_io.get_loader() as loader:
+        events = loader.load_events_by_subject()
+        columns = loader.load_event_columns_by_subject()
+        # Events are decoded only once
+        assert loader.load_events_of("other") is events["other"]
+    assert set(columns) == set(events) == {"", "other"}
+    for name, columns_by_type in columns.items():
+        decoded = sorted((evt for c in columns_by_type.values() for evt in c), key=lambda e: e.time)
+        assert decoded == sorted(events[name], key=lambda e: e.time)
+    assert columns[""]["points"].values_before.dtype == float
+    assert columns[""]["state"].values_before[0] == "in_progress"
+    assert columns["other"]["points"].get_last_value_after() == 0
+
+
+def test_columnar_events_keep_order_and_replace_subjects(temp_filename):
+    io = get_file_based_io(data.Event, "columnar", temp_filename)
+    many = []
+    for index in range(12_000):
+        evt = data.Event("many", "points", PERIOD_START + datetime.timedelta(minutes=index))
+        evt.value_before = index
+        evt.value_after = index + 1
+        many.append(evt)
+    other = data.Event("other", "state", PERIOD_START)
+    other.value_after = "done"
+    with io.get_saver() as saver:
+        saver.save_events_by_subject({"many": many, "other": [other]})
+
+    loaded = data.EventManager()
+    loaded.load(io)
+    points = loaded.get_chronological_task_event_columns_by_type("many")["points"]
+    assert len(points) == 12_000
+    assert list(points.values_after[-2:]) == [11_999, 12_000]
+
+    replacement = data.Event("many", "points", PERIOD_START)
+    replacement.value_after = 3
+    mgr_two = data.EventManager()
+    mgr_two.add_event(replacement)
+    mgr_two.save(io)
+    loaded = data.EventManager()
+    loaded.load(io)
+    assert loaded.get_chronological_task_events_by_type("many") == {"points": [replacement]}
+    assert loaded.get_chronological_task_events_by_type("other") == {"state": [other]}
+
+    # Tables hold only names and values of stored events
+    with io.get_loader() as loader:
+        assert sorted(loader._loaded_data["values"]) == ["3", "done"]
+        assert sorted(loader._loaded_data["task_names"]) == ["many", "other"]
+    with io.get_saver() as saver:
+        saver.save_events_by_subject({"many": []})
+    with io.get_loader() as loader:
+        assert loader._loaded_data["values"] == ["done"]
+        assert loader._loaded_data["task_names"] == ["other"]
+        assert loader._loaded_data["quantities"] == ["state"]
+    loaded = data.EventManager()
+    loaded.load(io)
+    assert loaded.get_chronological_task_events_by_type("other") == {"state": [other]}
@@ -239,6 +239,31 @@ def test_card_span_propagates_to_children():
     assert r.remainder_timeline.value_at(END) == 0
 
 
+def test_card_span_propagation_leaves_cards_intact():
+    END = PERIOD_START + 5 * ONE_DAY
+    parent = card.BaseCard("p")
+    parent.work_span = (PERIOD_START + ONE_DAY, None)
+    children = [card.BaseCard(f"c{i}") for i in range(3)]
+    for c in children:
+        parent.add_element(c)
+    grandchild = card.BaseCard("gc")
+    grandchild.work_span = (PERIOD_START + 3 * ONE_DAY, END)
+    children[1].add_element(grandchild)
+
+    leaves = tm.convert_card_to_representations_of_leaves(parent, PERIOD_START, END, ExtendedStatuses())
+    assert [r.task_name for r in leaves] == ["c0", "gc", "c2"]
+    for r in leaves:
+        assert r.remainder_timeline.value_at(PERIOD_START + ONE_DAY) == 1
+        assert r.remainder_timeline.value_at(PERIOD_START + 2 * ONE_DAY) < 1
+    assert parent.work_span == (PERIOD_START + ONE_DAY, None)
+    assert children[0].work_span is None
+    assert grandchild.work_span == (PERIOD_START + 3 * ONE_DAY, END)
+
+    assert tm.get_effective_work_span(grandchild) == parent.work_span
+    parent.work_span = None
+    assert tm.get_effective_work_span(grandchild) == grandchild.work_span
+
+
 def get_standard_span_progress(card, end):
     statuses = ExtendedStatuses()
     ret = tm.convert_card_to_representations_of_leaves(card, PERIOD_START, end, statuses)[0]
@@ -453,3 +478,85 @@ def test_no_two_progresses_of_same_task(simple_card):
     same_cards = [simple_card, simple_card]
     with pytest.raises(ValueError):
         tm.Aggregation.from_cards(same_cards, PERIOD_START, PERIOD_START)
+
+
+def _rolling_velocity_by_definition(aggregation, cutoff_date):
+    ret = np.zeros(aggregation.days)
+    for r in aggregation.repres:
+        completed_from_before = r.points_completed(aggregation.start)
+        for days in range(aggregation.days):
+            date = aggregation.start + ONE_DAY * days
+            ret[days] += (r.points_completed(date) - completed_from_before) / (days + 1)
+            if date >= cutoff_date:
+                break
+    return ret
+
+
+def test_rolling_velocity(make_simple_card):
+    mgr = data.EventManager()
+    cards = []
+    for index, (cost, done_after_days) in enumerate(((2, 0), (3, 4), (5, 4), (8, 12), (1, None))):
+        c = make_simple_card(f"task-{index}", cost)
+        cards.append(c)
+        if done_after_days is None:
+            continue
+        c.status = "done"
+        add_status_event_days_after_start(mgr, c, done_after_days, "in_progress", "done")
+    a = tm.Aggregation.from_cards(cards, PERIOD_START, LONG_PERIOD_END)
+    a.process_event_manager(mgr)
+
+    velocity = a.get_rolling_velocity_array()
+    assert velocity[3] == 0
+    assert velocity[4] == pytest.approx(8 / 5)
+    assert velocity[12] == pytest.approx(16 / 13)
+
+    for cutoff in (PERIOD_START - ONE_DAY, PERIOD_START + 6 * ONE_DAY, PERIOD_START + 6.5 * ONE_DAY, LONG_PERIOD_END):
+        np.testing.assert_array_almost_equal(
+            a.get_rolling_velocity_array(cutoff), _rolling_velocity_by_definition(a, cutoff))
+
+    assert len(tm.Aggregation().get_rolling_velocity_array()) == 0
+
+
+def test_tiered_aggregations_share_leaves(make_simple_card, mgr):
+    leaf = make_simple_card("leaf", 3)
+    leaf.status = "done"
+    other_leaf = make_simple_card("other-leaf", 5)
+    epic = card.BaseCard("epic")
+    epic.add_element(leaf)
+    epic.add_element(other_leaf)
+    initiative = card.BaseCard("initiative")
+    initiative.tier = 1
+    initiative.add_element(epic)
+    add_status_event_days_after_start(mgr, leaf, 10, "todo", "done")
+    all_cards = {c.name: c for c in (leaf, other_leaf, epic, initiative)}
+
+    tiers = tm.produce_tiered_aggregations(all_cards, mgr, PERIOD_START, LONG_PERIOD_END)
+    assert len(tiers) == 2
+    assert [r.task_name for r in tiers[0].repres] == ["leaf", "other-leaf"]
+    assert [id(r) for r in tiers[0].repres] == [id(r) for r in tiers[1].repres]
+
+    expected = tm.Aggregation.from_card(epic, PERIOD_START, LONG_PERIOD_END)
+    expected.process_event_manager(mgr)
+    for tier in tiers:
+        numpy.testing.assert_array_equal(tier.get_velocity_array(), expected.get_velocity_array())
+        assert tier.points_on(PERIOD_START) == expected.points_on(PERIOD_START)
+
+
+def test_aggregations_share_card_ids_with_events(make_simple_card, mgr):
+    leaf = make_simple_card("leaf", 3)
+    leaf.status = "done"
+    add_status_event_days_after_start(mgr, leaf, 10, "todo", "done")
+    card_ids = data.SymbolTable(["unrelated"])
+
+    shared = tm.Aggregation.from_card(leaf, PERIOD_START, LONG_PERIOD_END, card_ids=card_ids)
+    shared.process_event_manager(mgr)
+    assert mgr.card_ids is card_ids
+    assert card_ids["leaf"] == 1
+    with pytest.raises(ValueError, match="repeated"):
+        shared.add_repre(shared.repres[0])
+
+    own = tm.Aggregation.from_card(leaf, PERIOD_START, LONG_PERIOD_END)
+    own.process_event_manager(mgr)
+    assert own.card_ids["leaf"] == 0
+    assert own.get_velocity_array().sum() > 0
+    numpy.testing.assert_array_equal(shared.get_velocity_array(), own.get_velocity_array())
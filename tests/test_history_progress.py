@@ -43,12 +43,16 @@ def test_irrelevant_statuses():
     assert incomplete_statuses[2].name == "review"
 
 
-@pytest.fixture
-def repre():
+class RunLengthProgress(tm.Progress):
+    TIMELINE_CLASS = history.RunLengthTimeline
+
+
+@pytest.fixture(params=(tm.Progress, RunLengthProgress))
+def repre(request):
     start = PERIOD_START
     end = LONG_PERIOD_END
 
-    progress = tm.Progress(start, end)
+    progress = request.param(start, end)
     progress.statuses = ExtendedStatuses()
     return progress
 
@@ -104,6 +108,23 @@ def fiveday_repre():
     return progress
 
 
+def test_repre_status_masks_follow_updates(repre):
+    assert repre.always_was_irrelevant()
+    assert not repre.is_done()
+
+    repre.update(LATER, status="in_progress")
+    assert not repre.always_was_irrelevant()
+    assert repre._get_value_mask_of_in_progress().sum() == 1
+
+    repre.update(LATER + ONE_DAY, status="done", points=3)
+    assert repre.is_done()
+    assert repre.points_completed() == 3
+    assert repre.get_day_of_completion() == LATER + ONE_DAY
+
+    repre.fill_history_from(LATER)
+    assert repre._get_value_mask_of_in_progress().sum() == 10
+
+
 def test_repre(repre):
     someday = LATER
     day_after = someday + ONE_DAY
@@ -163,6 +184,25 @@ def test_repre_plan(twoday_repre_done_in_day):
     assert plan[0] == points
 
 
+def test_repre_has_compact_timelines_and_float_results(twoday_repre_done_in_day):
+    r = twoday_repre_done_in_day
+    assert r.points_timeline.dtype == np.float64
+    assert r.status_timeline.dtype == np.int8
+    assert r.relevancy_timeline.dtype == bool
+    assert r.status_timeline.get_array().nbytes == 2
+
+    r.update(PERIOD_START + ONE_DAY, points=2.5)
+    assert r.get_points_at(PERIOD_START + ONE_DAY) == 2.5
+    assert r.get_plan_array().dtype == np.float64
+    assert r.get_plan_array()[0] == 2.5
+    velocity = r.get_velocity_array()
+    assert velocity.dtype == np.float64
+    assert velocity.sum() == 2.5
+
+    r.update(PERIOD_START + ONE_DAY, points=0.3)
+    assert r.get_points_at(PERIOD_START + ONE_DAY) == 0.3
+
+
 def test_irrelevant_repre():
     r = tm.Progress(PERIOD_START, LONG_PERIOD_END)
     r.statuses = ExtendedStatuses()
@@ -211,6 +251,36 @@ def test_project_events(repre, early_event, late_event):
     assert repre.get_status_at(late_event.time + ONE_DAY).name == "irrelevant"
 
 
+def test_event_columns_are_processed_like_events(early_event, less_early_event, late_event):
+    points_event = data.Event("", "points", PERIOD_START + ONE_DAY)
+    points_event.value_before = 5
+    points_event.value_after = 3
+    status_event = data.Event("", "state", PERIOD_START + 2 * ONE_DAY)
+    status_event.value_before = "todo"
+    status_event.value_after = "in_progress"
+    late_event.quantity = "state"
+    late_event.value_before = "in_progress"
+    late_event.value_after = "done"
+    early_event.quantity = "project"
+    early_event.value_before = 0
+    early_event.value_after = 1
+    outside_event = data.Event("", "points", LONG_PERIOD_END + ONE_DAY)
+    outside_event.value_before = 3
+    outside_event.value_after = 8
+    events = [points_event, status_event, late_event, early_event, outside_event]
+
+    from_events = tm.Progress(PERIOD_START, LONG_PERIOD_END)
+    from_events.process_events(events)
+    from_columns = tm.Progress(PERIOD_START, LONG_PERIOD_END)
+    mgr = data.EventManager()
+    for evt in events:
+        mgr.add_event(evt)
+    from_columns.process_event_columns_by_type(mgr.get_chronological_task_event_columns_by_type(""))
+    for kind in ("points", "status", "relevancy"):
+        expected = getattr(from_events, f"{kind}_timeline").get_array()
+        numpy.testing.assert_array_equal(getattr(from_columns, f"{kind}_timeline").get_array(), expected)
+
+
 def test_repre_has_sane_plan(oneday_repre, twoday_repre, fiveday_repre):
     assert oneday_repre.remainder_timeline.value_at(oneday_repre.end) == 0
 
@@ -1,5 +1,7 @@
 import datetime
+import random
 
+import numpy as np
 import pytest
 
 import estimage.history.timeline as tm
@@ -25,9 +27,9 @@ def test_timeline_masking():
     assert timeline.get_masked_values(mask)[0] == 55
 
 
-@pytest.fixture
-def long_timeline():
-    return tm.Timeline(PERIOD_START, LONG_PERIOD_END)
+@pytest.fixture(params=(tm.Timeline, tm.RunLengthTimeline))
+def long_timeline(request):
+    return request.param(PERIOD_START, LONG_PERIOD_END)
 
 
 def test_beyond_timeline(long_timeline):
@@ -66,3 +68,79 @@ def test_timeline_process_close_and_distinct_events(
     assert long_timeline.value_at(late_event.time) == 0
     assert long_timeline.value_at(late_event.time + ONE_DAY) == 0
     assert long_timeline.value_at(less_early_event.time) == 10
+
+
+def _modify_timelines_randomly(timelines, rng):
+    days = timelines[0].days
+    random_day = lambda: PERIOD_START + ONE_DAY * rng.randrange(days)
+    operation = rng.randrange(4)
+    if operation == 0:
+        when, value = random_day(), rng.randrange(4)
+        for t in timelines:
+            t.set_value_at(when, value)
+    elif operation == 1:
+        start, end = sorted((random_day(), random_day()))
+        start -= ONE_DAY * rng.randrange(3)
+        end += ONE_DAY * rng.randrange(3)
+        start_value, end_value = rng.random() * 5, rng.random() * 5
+        for t in timelines:
+            t.set_gradient_values(start, start_value, end, end_value)
+    elif operation == 2:
+        events = []
+        for _ in range(rng.randrange(1, 4)):
+            evt = data.Event("", None, random_day())
+            evt.value_before = rng.randrange(4)
+            evt.value_after = rng.choice((None, rng.randrange(4)))
+            events.append(evt)
+        for t in timelines:
+            t.process_events(events)
+    else:
+        value, dtype = rng.randrange(4), rng.choice((int, float))
+        for t in timelines:
+            t.recreate_with_value(value, dtype)
+
+
+def test_run_length_timeline_matches_dense_timeline():
+    rng = random.Random(0)
+    for _ in range(50):
+        timelines = (tm.Timeline(PERIOD_START, LONG_PERIOD_END), tm.RunLengthTimeline(PERIOD_START, LONG_PERIOD_END))
+        dense, run_length = timelines
+        for _ in range(20):
+            _modify_timelines_randomly(timelines, rng)
+            assert np.array_equal(dense.get_array(), run_length.get_array())
+            assert dense.get_array().dtype == run_length.get_array().dtype
+            for value in range(4):
+                assert np.array_equal(dense.get_value_mask(value), run_length.get_value_mask(value))
+            lut = np.array([False, True, True, False, True, False])
+            assert np.array_equal(dense.get_lut_values(lut), run_length.get_lut_values(lut))
+            when = PERIOD_START + ONE_DAY * rng.randrange(dense.days)
+            assert dense.value_at(when) == run_length.value_at(when)
+    assert len(run_length._starts) < run_length.days
+
+
+@pytest.mark.parametrize("timeline_class", (tm.Timeline, tm.RunLengthTimeline))
+def test_timeline_processes_event_columns_like_events(timeline_class):
+    rng = random.Random(1)
+    for _ in range(100):
+        events = []
+        for _ in range(rng.randrange(1, 6)):
+            when = PERIOD_START + ONE_DAY * rng.randrange(21) + datetime.timedelta(hours=rng.randrange(24))
+            evt = data.Event("task", "points", when)
+            evt.value_before = rng.randrange(4)
+            evt.value_after = rng.choice((None, rng.randrange(4)))
+            events.append(evt)
+        from_events = timeline_class(PERIOD_START, LONG_PERIOD_END)
+        from_events.set_value_at(LONG_PERIOD_END, 9)
+        from_events.process_events(events)
+        from_columns = timeline_class(PERIOD_START, LONG_PERIOD_END)
+        from_columns.set_value_at(LONG_PERIOD_END, 9)
+        from_columns.process_event_columns(data.EventColumns.from_events(events))
+        assert np.array_equal(from_events.get_array(), from_columns.get_array())
+
+
+def test_timeline_rejects_event_columns_outside():
+    timeline = tm.Timeline(PERIOD_START, LONG_PERIOD_END)
+    evt = data.Event("task", "points", LONG_PERIOD_END + ONE_DAY)
+    evt.value_before = 1
+    with pytest.raises(ValueError, match="outside"):
+        timeline.process_event_columns(data.EventColumns.from_events([evt]))
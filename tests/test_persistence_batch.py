@@ -0,0 +1,85 @@
+import os
+import threading
+
+import pytest
+
+import estimage.data as tm
+from estimage import persistence
+from estimage.persistence import batch, locking
+import estimage.persistence.pollster
+
+
+@pytest.fixture(params=("ini", "toml"))
+def pollster_io(request, tmp_path):
+    filename = tmp_path / persistence.stem_to_filename(tm.Pollster, request.param, "pollster")
+    return persistence.get_persistence(tm.Pollster, request.param, filename)
+
+
+def test_batch_writes_file_once(pollster_io, monkeypatch):
+    written = []
+    original_write = pollster_io._write_file
+    monkeypatch.setattr(
+        pollster_io, "_write_file", lambda filename, contents: written.append(original_write(filename, contents)))
+
+    pollster = tm.Pollster(io_cls=pollster_io)
+    with batch.write_batch():
+        for i in range(5):
+            pollster.tell_points(f"task-{i}", tm.EstimInput(i))
+        assert pollster.ask_points("task-3") == tm.EstimInput(3)
+        assert not os.path.exists(pollster_io.SAVE_FILENAME)
+    assert len(written) == 1
+    assert tm.Pollster(io_cls=pollster_io).ask_points("task-4") == tm.EstimInput(4)
+
+
+def test_batch_flushes_explicitly(pollster_io):
+    pollster = tm.Pollster(io_cls=pollster_io)
+    with batch.write_batch():
+        pollster.tell_points("task", tm.EstimInput(1))
+        batch.flush()
+        assert os.path.exists(pollster_io.SAVE_FILENAME)
+        assert not batch.get_pending_contents(pollster_io.SAVE_FILENAME)
+        pollster.forget_points("task")
+        assert not pollster.knows_points("task")
+    assert not pollster.knows_points("task")
+
+
+def test_nested_batch_is_flushed_by_the_outer_one(pollster_io):
+    pollster = tm.Pollster(io_cls=pollster_io)
+    with batch.write_batch():
+        with batch.write_batch():
+            pollster.tell_points("task", tm.EstimInput(1))
+        assert not os.path.exists(pollster_io.SAVE_FILENAME)
+    assert not batch.is_in_progress()
+    assert pollster.knows_points("task")
+
+
+def test_batch_keeps_changes_made_by_others(pollster_io):
+    pollster = tm.Pollster(io_cls=pollster_io)
+    pollster.tell_points("theirs", tm.EstimInput(1))
+    with batch.write_batch():
+        pollster.tell_points("ours", tm.EstimInput(2))
+        pollster.forget_points("theirs")
+        # Batches are specific to threads, so the other thread writes the file right away
+        other = threading.Thread(target=pollster.tell_points, args=("others", tm.EstimInput(3)))
+        other.start()
+        other.join()
+    assert pollster.ask_points("ours") == tm.EstimInput(2)
+    assert pollster.ask_points("others") == tm.EstimInput(3)
+    assert not pollster.knows_points("theirs")
+
+
+def test_end_without_batch_fails():
+    with pytest.raises(RuntimeError):
+        batch.end()
+
+
+def test_files_are_replaced_whole(pollster_io):
+    pollster = tm.Pollster(io_cls=pollster_io)
+    pollster.tell_points("task", tm.EstimInput(1))
+    os.chmod(pollster_io.SAVE_FILENAME, 0o600)
+    pollster.tell_points("task", tm.EstimInput(2))
+    data_files = [
+        name for name in os.listdir(os.path.dirname(pollster_io.SAVE_FILENAME))
+        if not name.endswith(locking.LOCK_SUFFIX)]
+    assert data_files == [os.path.basename(pollster_io.SAVE_FILENAME)]
+    assert os.stat(pollster_io.SAVE_FILENAME).st_mode & 0o777 == 0o600
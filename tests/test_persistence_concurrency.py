@@ -0,0 +1,64 @@
+import datetime
+import multiprocessing
+
+import pytest
+
+import estimage.data as tm
+from estimage import persistence
+from estimage.persistence import batch, locking
+import estimage.persistence.pollster
+import estimage.persistence.event
+
+
+NUM_PROCESSES = 8
+NUM_SAVES = 10
+
+
+def get_io(cls, backend, directory, stem):
+    filename = directory / persistence.stem_to_filename(cls, backend, stem)
+    return persistence.get_persistence(cls, backend, filename)
+
+
+def save_concurrently(worker_index, pollster_backend, events_backend, directory):
+    pollster = tm.Pollster(io_cls=get_io(tm.Pollster, pollster_backend, directory, "pollster"))
+    events_io = get_io(tm.Event, events_backend, directory, "events")
+    # Half of workers write through batches, whose writes are merged, the other half writes right away
+    if worker_index % 2:
+        batch.begin()
+    for i in range(NUM_SAVES):
+        name = f"task-{worker_index}-{i}"
+        pollster.tell_points(name, tm.EstimInput(i + 1))
+        event = tm.Event(name, "points", datetime.datetime(2024, 1, 1 + i))
+        event.value_before = 0
+        event.value_after = i + 1
+        with events_io.get_saver() as saver:
+            saver.save_events_by_subject({name: [event]})
+        if i == NUM_SAVES // 2:
+            batch.flush()
+    if worker_index % 2:
+        batch.end()
+
+
+@pytest.mark.skipif(locking.fcntl is None, reason="Files can't be locked on this platform")
+@pytest.mark.parametrize("pollster_backend, events_backend", (("ini", "toml"), ("toml", "columnar")))
+def test_processes_dont_lose_updates(tmp_path, pollster_backend, events_backend):
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=save_concurrently, args=(index, pollster_backend, events_backend, tmp_path))
+        for index in range(NUM_PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * NUM_PROCESSES
+
+    pollster = tm.Pollster(io_cls=get_io(tm.Pollster, pollster_backend, tmp_path, "pollster"))
+    manager = tm.EventManager()
+    manager.load(get_io(tm.Event, events_backend, tmp_path, "events"))
+    for worker_index in range(NUM_PROCESSES):
+        for i in range(NUM_SAVES):
+            name = f"task-{worker_index}-{i}"
+            assert pollster.ask_points(name) == tm.EstimInput(i + 1)
+            events_by_type = manager.get_chronological_task_events_by_type(name)
+            assert "points" in events_by_type
+            assert events_by_type["points"][0].value_after == i + 1
@@ -5,7 +5,9 @@ from test_inidata import temp_filename
 from test_card import get_file_based_io
 
 import estimage.data as tm
-from estimage.persistence.pollster import ini, memory
+from estimage import persistence
+from estimage.persistence import locking
+from estimage.persistence.pollster import ini, memory, shards
 import estimage.simpledata as tm_simple
 
 
@@ -186,3 +188,55 @@ def test_integrate(relevant_io):
 
     assert est.main_composition.nominal_point_estimate.expected == 8
     assert est.main_composition.nominal_point_estimate.variance == 0
+
+
+@pytest.fixture(params=("ini", "toml"))
+def file_backend(request):
+    return request.param
+
+
+def test_user_shards_dont_share_estimates(tmp_path, file_backend, estiminput_1, estiminput_2):
+    pollsters = dict()
+    for username in ("alice", "bob/../x"):
+        io = shards.get_user_shard_io(file_backend, tmp_path, username)
+        pollsters[username] = tm_simple.UserPollster(io_cls=io, username=username)
+    pollsters["alice"].tell_points("task", estiminput_1)
+    pollsters["bob/../x"].tell_points("task", estiminput_2)
+
+    assert pollsters["alice"].ask_points("task") == estiminput_1
+    assert pollsters["bob/../x"].ask_points("task") == estiminput_2
+    assert len([path for path in tmp_path.iterdir() if path.suffix != locking.LOCK_SUFFIX]) == 2
+    pollsters["alice"].forget_points("task")
+    assert not pollsters["alice"].knows_points("task")
+    assert pollsters["bob/../x"].knows_points("task")
+
+
+def test_username_of_key():
+    assert shards.get_username_of_key("user-alice--task") == "alice"
+    assert shards.get_username_of_key("user-a-b--task-1") == "a-b"
+    assert shards.get_username_of_key("user-bob---task") == "bob-"
+    assert shards.get_username_of_key("user-a--b--task") == "a--b"
+    assert shards.get_username_of_key("***--task") is None
+    assert shards.get_username_of_key("user-alice") is None
+
+
+def test_split_user_pollster(tmp_path, file_backend, estiminput_1, estiminput_2):
+    filename = tmp_path / persistence.stem_to_filename(tm.Pollster, file_backend, "pollster-user")
+    source_io = persistence.get_persistence(tm.Pollster, file_backend, filename)
+    tm_simple.UserPollster(io_cls=source_io, username="alice").tell_points("one", estiminput_1)
+    tm_simple.UserPollster(io_cls=source_io, username="alice").tell_points("two", estiminput_2)
+    tm_simple.UserPollster(io_cls=source_io, username="bob").tell_points("one", estiminput_2)
+    tm_simple.AuthoritativePollster(io_cls=source_io).tell_points("one", estiminput_2)
+
+    # The directory of shards is created when they are saved to
+    shards_dir = tmp_path / "pollster-user"
+    get_shard_io = lambda username: shards.get_user_shard_io(file_backend, shards_dir, username)
+    assert shards.split_user_pollster(source_io, get_shard_io) == ["alice", "bob"]
+
+    alice = tm_simple.UserPollster(io_cls=get_shard_io("alice"), username="alice")
+    assert alice.ask_points("one") == estiminput_1
+    assert alice.ask_points("two") == estiminput_2
+    bob = tm_simple.UserPollster(io_cls=get_shard_io("bob"), username="bob")
+    assert bob.ask_points("one") == estiminput_2
+    assert not bob.knows_points("two")
+    assert tm_simple.UserPollster(io_cls=source_io, username="bob").knows_points("one")
@@ -2,8 +2,11 @@ import pytest
 
 import collections
 
+import numpy as np
+
 import estimage.data as data
 import estimage.persistence
+import estimage.persistence.pollster
 import estimage.problems.problem as tm
 
 
@@ -29,7 +32,7 @@ def test_model_picks_no_problem():
     assert len(problems) == 0
 
 
-def get_problems_of_cards(cards, pollster_dict=None):
+def get_problems_of_cards(cards, pollster_dict=None, card_ids=None):
     model = tm.EstiModel()
     comp = cards[0].to_tree(cards)
     model.use_composition(comp)
@@ -37,7 +40,7 @@ def get_problems_of_cards(cards, pollster_dict=None):
         for pollster in pollster_dict.values():
             pollster.supply_valid_estimations_to_tasks(model.get_all_task_models())
     problems = tm.ProblemDetector()
-    problems.detect(model, cards, pollster_dict)
+    problems.detect(model, cards, pollster_dict, card_ids)
     return problems.problems
 
 
@@ -161,3 +164,38 @@ def test_model_finds_estimation_problem(cards_one_two):
     problem = problems[0]
     assert "pollster_disagrees" in problem.tags
     assert "high_prio" in problem.description
+
+
+def test_pollster_estimates_are_indexed_by_card_ids(cards_one_two):
+    memory_pollster_io = estimage.persistence.get_persistence(data.Pollster, "memory")
+    card_one, card_two = cards_one_two
+    pollster = data.Pollster(io_cls=memory_pollster_io)
+    pollster.set_namespace("by-ids")
+    pollster.tell_points(card_two.name, data.EstimInput(card_two.point_cost + 1))
+    invalid_input = data.EstimInput(1)
+    invalid_input.optimistic = 2
+    pollster.tell_points("invalid", invalid_input)
+
+    card_ids = data.SymbolTable(["invalid", "unknown"])
+    problems = get_problems_of_cards([card_two], collections.OrderedDict(shared=pollster), card_ids)
+    assert len(problems) == 1
+    assert "pollster_disagrees" in problems[0].tags
+
+    expected_points = pollster.provide_expected_points_by_id(card_ids, [card_two.name, "invalid", "unknown"])
+    assert len(expected_points) == len(card_ids) == 3
+    assert expected_points[card_ids[card_two.name]] == card_two.point_cost + 1
+    assert all(np.isnan(expected_points[card_ids.ids_of(["invalid", "unknown"])]))
+
+
+def test_pollster_is_asked_only_about_detected_cards(cards_one_two):
+    memory_pollster_io = estimage.persistence.get_persistence(data.Pollster, "memory")
+    card_one, card_two = cards_one_two
+    pollster = data.Pollster(io_cls=memory_pollster_io)
+    pollster.set_namespace("asked")
+    asked_names = []
+    original_provide_info_about = pollster.provide_info_about
+    pollster.provide_info_about = lambda names: original_provide_info_about(asked_names.extend(names) or names)
+
+    card_ids = data.SymbolTable(f"card-{i}" for i in range(100))
+    get_problems_of_cards([card_two], collections.OrderedDict(shared=pollster), card_ids)
+    assert set(asked_names) == {card_two.name}
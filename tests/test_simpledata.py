@@ -1,5 +1,7 @@
 import collections
 import datetime
+import random
+
 import pytest
 
 from estimage import simpledata as tm
@@ -7,6 +9,7 @@ from estimage import data
 import estimage.persistence
 
 from test_card import leaf_card, subtree_card
+from test_inidata import temp_filename
 
 
 def get_independent_memory_io():
@@ -85,6 +88,29 @@ def test_similarity_of_masked_tasks(bunch_of_tasks):
     assert len(net_twos) == 3
 
 
+def test_similarity_index_matches_exhaustive_search():
+    rng = random.Random(0)
+    tasks = []
+    for i in range(200):
+        task = data.TaskModel(f"task-{i}")
+        expected = rng.choice([0, 1, 2, 3, 5, 8]) + rng.choice([0, 0, 0.5])
+        task.point_estimate = data.Estimate(expected, rng.choice([0, 0, 0.3, 1, 2]))
+        tasks.append(task)
+    index = tm.SimilarityIndex(tasks)
+
+    for reference in rng.sample(tasks, 20):
+        for distance_threshold, rank_threshold in ((0, 0), (0.5, 2), (1, 0.5), (3, 0)):
+            reference_estimate = reference.nominal_point_estimate
+            matching = []
+            for t in tasks:
+                distance = abs(t.nominal_point_estimate.expected - reference_estimate.expected)
+                rank = t.nominal_point_estimate.rank_distance(reference_estimate)
+                if t.name != reference.name and (distance <= distance_threshold or rank <= rank_threshold):
+                    matching.append((distance, t))
+            expected = [t for distance, t in sorted(matching, key=lambda x: x[0])]
+            assert index.get_nearby_tasks(reference, distance_threshold, rank_threshold) == expected
+
+
 def test_context():
     empty_pollster = data.Pollster(io_cls=get_independent_memory_io())
 
@@ -196,3 +222,48 @@ def test_default_appdata():
     assert (period[1] - today).days > 25
     assert period[0].day == 1
     assert period[1].day > 25
+
+
+def test_config_is_saved_only_when_incomplete(temp_filename, monkeypatch):
+    from estimage.webapp import config
+
+    class TmpAppData(tm.AppData):
+        CONFIG_FILENAME = temp_filename
+
+    config.read_or_create_config(TmpAppData)
+    assert TmpAppData.load().is_stored_completely()
+
+    with open(temp_filename) as f:
+        contents = f.read()
+    with open(temp_filename, "w") as f:
+        f.write(contents.replace("[META]", "[OTHER]"))
+    assert not TmpAppData.load().is_stored_completely()
+    config.read_or_create_config(TmpAppData)
+    assert TmpAppData.load().is_stored_completely()
+
+    def fail_to_save(self):
+        raise AssertionError("Complete config shouldn't be saved")
+    monkeypatch.setattr(TmpAppData, "save", fail_to_save)
+    config.read_or_create_config(TmpAppData)
+
+
+def test_similarity_index_with_replaced_tasks():
+    tasks = []
+    for i in range(20):
+        task = data.TaskModel(f"task-{i}")
+        task.point_estimate = data.Estimate(i % 7, i % 3)
+        tasks.append(task)
+    index = tm.SimilarityIndex(tasks)
+
+    replaced = data.TaskModel("task-3")
+    replaced.point_estimate = data.Estimate(5, 0)
+    stranger = data.TaskModel("stranger")
+    replacing = index.with_tasks_replaced([replaced, stranger])
+    reference = tm.SimilarityIndex([replaced if t.name == "task-3" else t for t in tasks])
+    assert replacing.tasks_by_name["task-3"] is replaced
+    assert "stranger" not in replacing.tasks_by_name
+    for task in tasks[:6] + [replaced]:
+        assert replacing.get_nearby_tasks(task, 0.5, 2) == reference.get_nearby_tasks(task, 0.5, 2)
+    # The shared index is left as it was
+    assert index.tasks_by_name["task-3"] is tasks[3]
+    assert index.with_tasks_replaced([stranger]) is index
@@ -3,7 +3,7 @@ import scipy as sp
 import pytest
 
 from estimage import statops as tm
-from estimage.statops import func
+from estimage.statops import func, simulation
 from estimage import data
 
 
@@ -148,3 +148,54 @@ def test_nonzero_velocity():
     np.testing.assert_array_equal(
         tm.func.get_nonzero_velocity(velocity),
         np.array([1, 2, 4, 8]))
+
+
+@pytest.fixture
+def simulated_tree():
+    root = data.Composition("root")
+    epic = data.Composition("epic")
+    masked_epic = data.Composition("masked")
+    masked_epic.mask()
+    root.add_composition(epic)
+    root.add_composition(masked_epic)
+    for name, triple, composition in (
+            ("a", (3, 1, 8), epic), ("b", (2, 2, 2), epic), ("c", (5, 4, 9), masked_epic), ("d", (1, 0, 3), root)):
+        task = data.TaskModel(name)
+        task.set_point_estimate(* triple)
+        composition.add_element(task)
+    done = data.TaskModel("done")
+    done.set_point_estimate(5, 4, 9)
+    done.mask()
+    epic.add_element(done)
+    return root
+
+
+def test_simulation_of_remaining_work(simulated_tree):
+    sim = simulation.RemainingWorkSimulation(simulated_tree)
+    assert sim.names == ["root", "epic", "masked"]
+    assert sim.aggregation_matrix.shape == (3, 4)
+
+    result = sim.simulate(40_000, seed=1, chunk_size=15_000)
+    assert result.samples.shape == (3, 40_000)
+    for name in ("root", "epic", "masked"):
+        composition = simulated_tree if name == "root" else [
+            c for c in simulated_tree.compositions if c.name == name][0]
+        samples = result.get_samples_of(name)
+        assert samples.mean() == pytest.approx(composition.remaining_point_estimate.expected, abs=0.05)
+        assert samples.std() == pytest.approx(composition.remaining_point_estimate.sigma, abs=0.05)
+
+    quantiles = result.get_quantiles([0.1, 0.5, 0.9])
+    assert quantiles["masked"].tolist() == [0, 0, 0]
+    assert quantiles["epic"][0] < quantiles["epic"][1] < quantiles["epic"][2]
+
+
+def test_simulation_is_reproducible(simulated_tree):
+    sim = simulation.RemainingWorkSimulation(simulated_tree)
+    result = sim.simulate(1000, seed=4, chunk_size=300)
+    same_result = sim.simulate(1000, seed=4, chunk_size=300)
+    np.testing.assert_array_equal(result.samples, same_result.samples)
+    other_result = sim.simulate(1000, seed=5, chunk_size=300)
+    assert not np.array_equal(result.samples, other_result.samples)
+
+    pooled_result = sim.simulate(1000, seed=4, chunk_size=300, processes=2)
+    np.testing.assert_array_equal(result.samples, pooled_result.samples)
@@ -1,3 +1,7 @@
+import pickle
+
+import pytest
+
 import estimage.entities.status as tm
 
 
@@ -6,3 +10,42 @@ def test_status_extraction():
     assert tm.get_canonical_status("0") == "irrelevant"
     assert tm.get_canonical_status("2") == "todo"
     assert tm.get_canonical_status("10") == "irrelevant"
+
+
+def test_property_lut():
+    statuses = tm.Statuses()
+    lut = statuses.get_property_lut(relevant=True, wip=True)
+    assert list(lut) == [False, False, True, False]
+    assert statuses.get_property_lut(relevant=True, wip=True) is lut
+    assert list(statuses.get_property_lut(done=True)) == [False, False, False, True]
+
+    statuses.statuses.append(tm.Status.create("coding", wip=True))
+    assert list(statuses.get_property_lut(wip=True, relevant=True)) == [False, False, True, False, True]
+
+
+def test_status_index_follows_mutations():
+    statuses = tm.Statuses()
+    assert statuses.int("done") == 3
+    with pytest.raises(ValueError):
+        statuses.int("review")
+
+    statuses.statuses.extend([tm.Status.create("review", started=True)])
+    assert statuses.int("review") == 4
+    assert statuses.get("review").started
+
+    statuses.statuses.insert(0, tm.Status.create("backlog", relevant=False))
+    assert statuses.int("review") == 5
+    assert statuses.int("irrelevant") == 1
+
+    del statuses.statuses[0]
+    assert statuses.int("irrelevant") == 0
+    with pytest.raises(ValueError):
+        statuses.int("backlog")
+
+    statuses.statuses = statuses.statuses[:2]
+    assert statuses.int("todo") == 1
+    with pytest.raises(ValueError):
+        statuses.int("done")
+
+    restored = pickle.loads(pickle.dumps(statuses))
+    assert restored.int("todo") == 1
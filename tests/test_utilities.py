@@ -1,3 +1,6 @@
+import dataclasses
+import pickle
+
 import pytest
 
 import numpy as np
@@ -97,3 +100,62 @@ def test_find_extent_index():
     arr[5:] = np.arange(5)
     assert tm.extent_index(arr, 100) == len(arr) - 1
     assert tm.extent_index(arr, 25) == 6
+
+
+@dataclasses.dataclass(init=False)
+class Pair:
+    name: str
+    other: str
+
+    def __init__(self, name, other):
+        super().__init__()
+        self.name = name
+        self.other = other
+
+    @property
+    def both(self):
+        return (self.name, self.other)
+
+
+SlottedPair = tm.create_slotted_copy(Pair, "SlottedPair")
+
+
+def test_slotted_copy():
+    pair = SlottedPair("a", "b")
+    assert pair.both == ("a", "b")
+    assert pair == SlottedPair("a", "b")
+    assert pair != Pair("a", "b")
+    assert not hasattr(pair, "__dict__")
+    with pytest.raises(AttributeError):
+        pair.third = "c"
+    assert pickle.loads(pickle.dumps(pair)) == pair
+    assert Pair("a", "b").both == ("a", "b")
+
+
+def test_lru_cache_of_arrays():
+    calls = []
+
+    @tm.lru_cache_of_arrays(max_bytes=200)
+    def make_arrays(size):
+        calls.append(size)
+        return (np.zeros(size), np.ones(size))
+
+    first = make_arrays(5)
+    assert make_arrays(5) is first
+    assert make_arrays.cache_bytes() == 80
+    make_arrays(6)
+    assert make_arrays.cache_bytes() == 176
+    # The least recently used result is discarded to make room
+    make_arrays(4)
+    assert make_arrays.cache_bytes() == 160
+    make_arrays(6)
+    assert calls == [5, 6, 4]
+    make_arrays(5)
+    assert calls == [5, 6, 4, 5]
+
+    # Results that are too large are not kept
+    make_arrays(100)
+    assert make_arrays.cache_bytes() == 0
+    make_arrays.cache_clear()
+    make_arrays(4)
+    assert calls[-1] == 4
@@ -1,9 +1,17 @@
 import datetime
+import json
+import xml.etree.ElementTree
 
+import pytest
 import numpy as np
 
+from estimage import history
+from estimage.entities import card
 import estimage.visualize as tm
 import estimage.visualize.utils
+import estimage.visualize.svg
+import estimage.visualize.burndown
+import estimage.visualize.completion
 
 
 def test_element_insertion():
@@ -97,3 +105,98 @@ def test_week_index():
     _assert_index_consistent(APRIL_MON, MAY_MON, JUNE_MON, 14)
     _assert_index_consistent(APRIL_TUE, MAY_TUE, JUNE_MON, 20)
     _assert_index_consistent(APRIL_MON, MAY_TUE, JUNE_MON, 21)
+
+
+def test_svg_colors():
+    assert tm.svg.rgba_to_svg_attributes("grey") == 'fill="grey"'
+    assert tm.svg.rgba_to_svg_attributes((1, 0, 0, 1)) == 'fill="rgb(255,0,0)"'
+    assert tm.svg.rgba_to_svg_attributes((0, 0, 1, 0.5), "stroke") == 'stroke="rgb(0,0,255)" stroke-opacity="0.5"'
+
+
+def test_svg_sparkline_is_valid_svg():
+    sparkline = tm.svg.SVGSparkline((2, 1), (0, 9), (0, 5))
+    assert sparkline.width == 144
+    days = np.arange(10)
+    sparkline.add_area(days, np.ones(10) * 5, np.zeros(10), (0.1, 0.1, 0.5, 1))
+    sparkline.add_line(days, np.linspace(5, 0, 10), "orange")
+    sparkline.add_vline(4, "grey", 2)
+
+    root = xml.etree.ElementTree.fromstring(sparkline.render())
+    children = [c.tag.split("}")[-1] for c in root]
+    assert children == ["polygon", "polyline", "line"]
+
+    line_x = float(root[2].get("x1"))
+    assert 0 < line_x < sparkline.width / 2
+
+    polygon_points = [p.split(",") for p in root[0].get("points").split()]
+    assert len(polygon_points) == 20
+    for x, y in polygon_points:
+        assert 0 < float(x) < sparkline.width
+        assert 0 < float(y) < sparkline.height
+
+
+def test_small_burndown_svg():
+    start = datetime.datetime(2023, 4, 1)
+    end = datetime.datetime(2023, 4, 30)
+    c = card.BaseCard("task")
+    c.point_cost = 3
+    c.status = "todo"
+    aggregation = history.Aggregation.from_card(c, start, end)
+
+    plot = tm.burndown.MPLPointPlot(aggregation)
+    root = xml.etree.ElementTree.fromstring(plot.get_small_svg((2.2, 1.6)))
+    tags = [child.tag.split("}")[-1] for child in root]
+    assert tags.count("polygon") == 1
+    assert tags.count("polyline") == 1
+
+
+def test_array_encoding():
+    floats = np.array([0, 1.5, -2.25, 1e3])
+    encoded = tm.utils.encode_float_array(floats)
+    assert encoded["encoding"] == "float32-base64"
+    np.testing.assert_array_equal(tm.utils.decode_array(encoded), floats)
+
+    ints = np.arange(5, 12)
+    encoded = tm.utils.encode_int_array(ints)
+    assert encoded["data"] == [5, 1, 1, 1, 1, 1, 1]
+    np.testing.assert_array_equal(tm.utils.decode_array(encoded), ints)
+
+    with pytest.raises(ValueError):
+        tm.utils.decode_array(dict(encoding="morse", data=""))
+
+
+def test_burndown_chart_data():
+    start = datetime.datetime(2023, 4, 1)
+    end = datetime.datetime(2023, 4, 30)
+    c = card.BaseCard("task")
+    c.point_cost = 3
+    c.status = "todo"
+    aggregation = history.Aggregation.from_card(c, start, end)
+
+    chart = tm.burndown.MPLPointPlot(aggregation).get_chart_data()
+    json.dumps(chart)
+    np.testing.assert_array_equal(tm.utils.decode_array(chart["x"]), np.arange(30))
+    assert [s["label"] for s in chart["stacked"]] == ["To Do", "In Progress"]
+    todo = tm.utils.decode_array(chart["stacked"][0]["values"])
+    assert todo[-1] == 3
+    plan = tm.utils.decode_array(chart["lines"][0]["values"])
+    np.testing.assert_array_almost_equal(plan, aggregation.get_plan_array())
+    assert chart["stacked_until"] is None
+    assert chart["markers"] == []
+
+
+def test_completion_chart_data_has_markers_of_figure():
+    today = datetime.datetime.today()
+    period = (today - datetime.timedelta(days=5), today + datetime.timedelta(days=10))
+    dom = np.arange(20)
+    plot = tm.completion.MPLCompletionPlot(period, dom, np.linspace(0, 1, 20), lambda q: q * 19)
+
+    chart = plot.get_chart_data()
+    json.dumps(chart)
+    assert [m["label"] for m in chart["markers"]] == ["confidence 95 %", plot.DDAY_LABEL, "period end"]
+
+    figure_lines = plot.get_figure().axes[0].get_lines()[1:]
+    for marker, line in zip(chart["markers"], figure_lines, strict=True):
+        assert line.get_label() == marker["label"]
+        assert line.get_color() == marker["color"]
+        assert line.get_xdata()[0] == marker["x"]
@@ -0,0 +1,62 @@
+import pytest
+
+from estimage import PluginResolver, plugins, simpledata, webapp
+from estimage.webapp import config
+
+
+NUM_HEADS = 5
+
+
+@pytest.fixture
+def head_dirs(tmp_path):
+    ret = []
+    for i in range(NUM_HEADS):
+        directory = tmp_path / f"head{i}"
+        directory.mkdir()
+        ret.append(directory)
+    (ret[0] / simpledata.AppData.CONFIG_BASENAME).write_text("[META]\ndescription = First\nplugins = wsjf\n")
+    return ret
+
+
+def create_app(head_dirs):
+    class HeadsConfig(config.MultiheadConfig):
+        DATA_DIRS = [str(d) for d in head_dirs]
+        SECRET_KEY = "secret"
+        TESTING = True
+        LOGIN_DISABLED = True
+    return webapp.create_app_multihead(HeadsConfig)
+
+
+def test_heads_are_configured_on_first_request(head_dirs, monkeypatch):
+    config_mtime = (head_dirs[0] / simpledata.AppData.CONFIG_BASENAME).stat().st_mtime_ns
+    imported_plugins = []
+    original_get_plugin = plugins.get_plugin
+    monkeypatch.setattr(plugins, "get_plugin", lambda name: imported_plugins.append(name) or original_get_plugin(name))
+    monkeypatch.setattr(config, "read_or_create_config", lambda cls: pytest.fail("Config was read"))
+
+    app = create_app(head_dirs)
+    assert not imported_plugins
+    assert (head_dirs[0] / simpledata.AppData.CONFIG_BASENAME).stat().st_mtime_ns == config_mtime
+    assert all(list(d.iterdir()) == [] for d in head_dirs[1:])
+
+    monkeypatch.undo()
+    monkeypatch.setattr(plugins, "get_plugin", lambda name: imported_plugins.append(name) or original_get_plugin(name))
+    client = app.test_client()
+    assert client.get("/head0/plugins/prioritize/nothing").status_code != 404
+    assert imported_plugins == ["wsjf"]
+    assert app.config["head"]["head0"]["description"] == "First"
+    assert app.config["head"]["head0"]["classes"]["BaseCard"].__name__.startswith("head0__wsjf")
+    assert all(list(d.iterdir()) == [] for d in head_dirs[1:])
+
+
+def test_workers_reuse_resolution_of_plugins(head_dirs, monkeypatch):
+    create_app(head_dirs).resolve_head("head0")
+    assert config.load_resolution(simpledata.AppData)["plugins"] == ["wsjf"]
+
+    monkeypatch.setattr(PluginResolver, "resolve_extension", lambda *args: pytest.fail("Plugins were resolved"))
+    app = create_app(head_dirs)
+    app.resolve_head("head0")
+    assert app.config["head"]["head0"]["classes"]["BaseCard"].__name__.startswith("head0__wsjf")
+
+    (head_dirs[0] / simpledata.AppData.CONFIG_BASENAME).write_text("[META]\nplugins = \n")
+    assert config.load_resolution(simpledata.AppData) is None